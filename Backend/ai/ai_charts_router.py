@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+from services.chart_renderer import ChartRenderError, build_chart_spec, get_chart_renderer
+
+
+router = APIRouter(prefix="/charts", tags=["charts"])
+
+# A chart id is the hash of everything that went into the image, so the
+# bytes behind one id never change and can be cached by clients for good.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ChartRequest(BaseModel):
+    chart_type: str = Field(description="bar, horizontal_bar, pie or line")
+    labels: list[str] = Field(min_length=1, max_length=200)
+    values: list[float] = Field(min_length=1, max_length=200)
+    title: str = Field(default="Chart", max_length=200)
+    x_label: str = Field(default="", max_length=100)
+    y_label: str = Field(default="", max_length=100)
+    color_scheme: str = Field(default="viridis", max_length=40)
+    image_format: str | None = Field(default=None, description="svg (default) or png")
+
+
+class ChartResponse(BaseModel):
+    chart_id: str
+    url: str
+    mime_type: str
+    size_bytes: int
+
+
+@router.post("", response_model=ChartResponse)
+async def create_chart_endpoint(payload: ChartRequest) -> ChartResponse:
+    try:
+        spec = build_chart_spec(
+            payload.chart_type,
+            payload.labels,
+            payload.values,
+            title=payload.title,
+            x_label=payload.x_label,
+            y_label=payload.y_label,
+            color_scheme=payload.color_scheme,
+            image_format=payload.image_format,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    try:
+        image = await get_chart_renderer().render_async(spec)
+    except ChartRenderError as exc:
+        raise HTTPException(status_code=503, detail=f"Chart rendering failed: {exc}") from exc
+
+    return ChartResponse(
+        chart_id=image.chart_id,
+        url=f"/charts/{image.chart_id}",
+        mime_type=image.mime_type,
+        size_bytes=len(image.content),
+    )
+
+
+@router.get("/{chart_id}")
+async def get_chart_endpoint(chart_id: str, request: Request) -> Response:
+    etag = f'"{chart_id}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+    image = get_chart_renderer().get(chart_id)
+    if image is None:
+        raise HTTPException(status_code=404, detail="Chart not found or evicted; render it again.")
+
+    return Response(
+        content=image.content,
+        media_type=image.mime_type,
+        headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
@@ -3,6 +3,8 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 
+from services.env import env_float, env_int
+
 
 SYSTEM_INSTRUCTION = (
     "You are SkillPulse, a career AI assistant inside a mobile product.\n\n"
@@ -24,28 +26,6 @@ SYSTEM_INSTRUCTION = (
 )
 
 
-def _env_int(name: str, default: int) -> int:
-    raw = os.getenv(name)
-    if raw is None or str(raw).strip() == "":
-        return default
-
-    try:
-        return int(raw)
-    except (TypeError, ValueError):
-        return default
-
-
-def _env_float(name: str, default: float) -> float:
-    raw = os.getenv(name)
-    if raw is None or str(raw).strip() == "":
-        return default
-
-    try:
-        return float(raw)
-    except (TypeError, ValueError):
-        return default
-
-
 def normalize_ollama_url(raw_url: str) -> str:
     cleaned = (raw_url or "http://localhost:11434").strip().rstrip("/")
     if not cleaned.endswith("/v1"):
@@ -59,19 +39,23 @@ class AIChatSettings:
     ollama_url: str
     ollama_model: str
     ollama_api_key: str
+    ollama_api_mode: str
+    ollama_keep_alive: str
+    ollama_num_ctx: int
     system_instruction: str
     request_timeout_seconds: float
     connect_timeout_seconds: float
     max_recent_messages: int
     market_trends_limit: int
+    market_token_budget: int
     max_message_chars: int
     db_pool_min_size: int
     db_pool_max_size: int
 
 
 def load_ai_chat_settings() -> AIChatSettings:
-    db_pool_min_size = max(1, _env_int("AI_DB_POOL_MIN_SIZE", 1))
-    db_pool_max_size = max(db_pool_min_size, _env_int("AI_DB_POOL_MAX_SIZE", 10))
+    db_pool_min_size = max(1, env_int("AI_DB_POOL_MIN_SIZE", 1))
+    db_pool_max_size = max(db_pool_min_size, env_int("AI_DB_POOL_MAX_SIZE", 10))
 
     return AIChatSettings(
         database_url=os.getenv(
@@ -81,12 +65,16 @@ def load_ai_chat_settings() -> AIChatSettings:
         ollama_url=normalize_ollama_url(os.getenv("OLLAMA_URL", "http://localhost:11434/v1")),
         ollama_model=(os.getenv("OLLAMA_MODEL_CHAT") or os.getenv("OLLAMA_MODEL") or "qwen2.5:3b"),
         ollama_api_key=os.getenv("OLLAMA_API_KEY", "ollama"),
+        ollama_api_mode="native" if (os.getenv("OLLAMA_API_MODE") or "").strip().lower() == "native" else "openai",
+        ollama_keep_alive=(os.getenv("OLLAMA_KEEP_ALIVE") or "30m").strip(),
+        ollama_num_ctx=max(512, env_int("AI_NUM_CTX_CHAT", 4096)),
         system_instruction=SYSTEM_INSTRUCTION,
-        request_timeout_seconds=max(5.0, _env_float("AI_TIMEOUT_SECONDS", 60.0)),
-        connect_timeout_seconds=max(1.0, _env_float("AI_CONNECT_TIMEOUT_SECONDS", 10.0)),
-        max_recent_messages=max(1, _env_int("AI_CHAT_MAX_RECENT_MESSAGES", 10)),
-        market_trends_limit=max(1, _env_int("AI_CHAT_TRENDS_LIMIT", 5)),
-        max_message_chars=max(100, _env_int("AI_CHAT_MESSAGE_MAX_CHARS", 4000)),
+        request_timeout_seconds=max(5.0, env_float("AI_TIMEOUT_SECONDS", 60.0)),
+        connect_timeout_seconds=max(1.0, env_float("AI_CONNECT_TIMEOUT_SECONDS", 10.0)),
+        max_recent_messages=max(1, env_int("AI_CHAT_MAX_RECENT_MESSAGES", 10)),
+        market_trends_limit=max(1, env_int("AI_CHAT_TRENDS_LIMIT", 5)),
+        market_token_budget=max(0, env_int("AI_CHAT_MARKET_TOKEN_BUDGET", 300)),
+        max_message_chars=max(100, env_int("AI_CHAT_MESSAGE_MAX_CHARS", 4000)),
         db_pool_min_size=db_pool_min_size,
         db_pool_max_size=db_pool_max_size,
     )
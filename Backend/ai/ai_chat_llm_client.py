@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
 
 import httpx
 
 from ai_chat_config import AIChatSettings
+from services.llm_router import ModelRouter
+from services.llm_service import build_completion_request, extract_completion_text
+from services.metrics import record_llm_request, record_ollama_timings
+from services.tracing import span
 
 
 logger = logging.getLogger(__name__)
@@ -20,23 +24,54 @@ class LLMRequestError(RuntimeError):
 
 
 class OllamaChatClient:
-    def __init__(self, http_client: httpx.AsyncClient, settings: AIChatSettings) -> None:
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        settings: AIChatSettings,
+        router: ModelRouter | None = None,
+    ) -> None:
         self._http_client = http_client
         self._settings = settings
+        self._router = router
 
     async def create_chat_completion(self, messages: list[dict[str, str]]) -> str:
-        payload = {
-            "model": self._settings.ollama_model,
-            "messages": messages,
-            "temperature": 0.3,
-        }
+        if self._router is None:
+            return await self._complete(messages, self._settings.ollama_model)
+
+        async with self._router.aslot("chat") as model:
+            return await self._complete(messages, model)
+
+    async def _complete(self, messages: list[dict[str, str]], model: str) -> str:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with span("llm.request", **{"llm.task": "chat", "llm.model": model}):
+                content = await self._request(messages, model)
+            outcome = "ok"
+            return content
+        except LLMTimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            record_llm_request("chat", model, time.perf_counter() - started, outcome)
+
+    async def _request(self, messages: list[dict[str, str]], model: str) -> str:
+        url, payload = build_completion_request(
+            model=model,
+            messages=messages,
+            temperature=0.3,
+            api_mode=self._settings.ollama_api_mode,
+            ollama_url=self._settings.ollama_url,
+            keep_alive=self._settings.ollama_keep_alive,
+            num_ctx=self._settings.ollama_num_ctx,
+        )
         headers = {}
         if self._settings.ollama_api_key:
             headers["Authorization"] = f"Bearer {self._settings.ollama_api_key}"
 
         try:
             response = await self._http_client.post(
-                "/chat/completions",
+                url,
                 json=payload,
                 headers=headers,
             )
@@ -58,30 +93,9 @@ class OllamaChatClient:
         except ValueError as exc:
             raise LLMRequestError("The LLM service returned invalid JSON.") from exc
 
-        content = self._extract_response_content(payload)
+        record_ollama_timings("chat", model, payload)
+        content = extract_completion_text(payload)
         if not content:
             raise LLMRequestError("The LLM service returned an empty response.")
 
         return content.strip()
-
-    @staticmethod
-    def _extract_response_content(payload: dict[str, Any]) -> str:
-        choices = payload.get("choices")
-        if not isinstance(choices, list) or not choices:
-            return ""
-
-        message = choices[0].get("message") or {}
-        content = message.get("content")
-        if isinstance(content, str):
-            return content
-
-        if isinstance(content, list):
-            parts: list[str] = []
-            for item in content:
-                if isinstance(item, dict) and item.get("type") == "text":
-                    text = str(item.get("text") or "").strip()
-                    if text:
-                        parts.append(text)
-            return "\n".join(parts)
-
-        return ""
@@ -12,6 +12,7 @@ class AIChatRequest(BaseModel):
     recent_messages: list[dict[str, Any]] = Field(default_factory=list)
     profile: dict[str, Any] = Field(default_factory=dict) 
     skill_catalog: list[str] = Field(default_factory=list)
+    extract_profile: bool = False
 
     @field_validator("user_id", "message")
     @classmethod
@@ -41,3 +42,4 @@ class AIChatResponse(BaseModel):
     message_id: str | None = None
     conversation_summary: ConversationSummary = Field(default_factory=ConversationSummary)
     degraded: bool = False
+    profile_extraction_queued: bool = False
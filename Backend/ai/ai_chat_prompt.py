@@ -1,8 +1,22 @@
 from __future__ import annotations
 
-import json
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Sequence
+
+import orjson
+
+
+# Static guidance that follows the system instruction. Nothing user-specific
+# may be interpolated here: the system message must stay byte-identical across
+# users and turns so the model server can reuse its cached prompt prefix.
+CHAT_CONTEXT_GUIDANCE = (
+    "Use the structured profile supplied before the latest user message together with the recent conversation.\n"
+    "If profile details are missing, acknowledge the gap and ask a focused follow-up question.\n"
+    "If skill gaps or a learning roadmap exist, anchor the answer to them instead of giving generic advice.\n"
+    "When market signals are supplied, use them for demand claims and do not cite numbers they do not contain.\n"
+    "Prefer a short answer with one concrete next step and one useful follow-up question when needed.\n"
+    "Never claim the user has a skill unless it appears in the stored profile or conversation."
+)
 
 
 def _json_default(value: Any) -> str:
@@ -10,25 +24,36 @@ def _json_default(value: Any) -> str:
         return value.isoformat()
     return str(value)
 
+
+def build_system_prompt(system_instruction: str) -> str:
+    return f"{system_instruction}\n\n{CHAT_CONTEXT_GUIDANCE}"
+
+
+def build_profile_context(profile: dict[str, Any]) -> str:
+    # compact, key-sorted JSON: indentation only costs prompt tokens
+    profile_block = orjson.dumps(
+        profile or {},
+        default=_json_default,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    ).decode()
+    return f"User profile:\n{profile_block}"
+
+
+def build_market_context(snippets: Sequence[str]) -> str:
+    lines = "\n".join(f"- {snippet}" for snippet in snippets)
+    return f"Market signals from recent job postings (most relevant first):\n{lines}"
+
+
 def build_chat_messages(
     system_instruction: str,
     recent_messages: list[dict[str, Any]],
     profile: dict[str, Any],
     user_message: str,
+    market_snippets: Sequence[str] = (),
 ) -> list[dict[str, str]]:
-    profile_block = json.dumps(profile or {}, indent=2, ensure_ascii=False, default=_json_default)
-
-    system_prompt = (
-        f"{system_instruction}\n\n"
-        "Use the structured profile below together with the recent conversation.\n"
-        "If profile details are missing, acknowledge the gap and ask a focused follow-up question.\n"
-        "If skill gaps or a learning roadmap exist, anchor the answer to them instead of giving generic advice.\n"
-        "Prefer a short answer with one concrete next step and one useful follow-up question when needed.\n"
-        "Never claim the user has a skill unless it appears in the stored profile or conversation.\n\n"
-        f"User profile:\n{profile_block}"
-    )
-
-    messages: list[dict[str, str]] = [{"role": "system", "content": system_prompt}]
+    messages: list[dict[str, str]] = [
+        {"role": "system", "content": build_system_prompt(system_instruction)}
+    ]
     for item in recent_messages:
         role = str(item.get("role") or "user").strip().lower()
         if role not in {"system", "user", "assistant"}:
@@ -40,5 +65,10 @@ def build_chat_messages(
 
         messages.append({"role": role, "content": content})
 
+    # Volatile context goes last so profile edits only invalidate the tail of
+    # the prompt instead of the whole prefix.
+    messages.append({"role": "system", "content": build_profile_context(profile)})
+    if market_snippets:
+        messages.append({"role": "system", "content": build_market_context(market_snippets)})
     messages.append({"role": "user", "content": user_message.strip()})
     return messages
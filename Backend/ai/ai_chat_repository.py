@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 
 import asyncpg
 
+from services.metrics import timed_db
 
+
+@timed_db
 async def ensure_user_ai_profile_table(connection: asyncpg.Connection) -> None:
     await connection.execute(
         """
@@ -17,6 +19,7 @@ async def ensure_user_ai_profile_table(connection: asyncpg.Connection) -> None:
     )
 
 
+@timed_db
 async def user_exists(connection: asyncpg.Connection, user_id: str) -> bool:
     return bool(
         await connection.fetchval(
@@ -26,6 +29,7 @@ async def user_exists(connection: asyncpg.Connection, user_id: str) -> bool:
     )
 
 
+@timed_db
 async def insert_chat_message(
     connection: asyncpg.Connection,
     session_id: str,
@@ -45,6 +49,7 @@ async def insert_chat_message(
     return dict(row) if row else {}
 
 
+@timed_db
 async def fetch_recent_messages(
     connection: asyncpg.Connection,
     session_id: str,
@@ -65,6 +70,7 @@ async def fetch_recent_messages(
     return [dict(row) for row in ordered_rows]
 
 
+@timed_db
 async def fetch_skill_catalog(
     connection: asyncpg.Connection,
 ) -> list[str]:
@@ -78,6 +84,7 @@ async def fetch_skill_catalog(
     return [str(row["name"]).strip() for row in rows if row["name"]]
 
 
+@timed_db
 async def fetch_user_ai_profile(
     connection: asyncpg.Connection,
     user_id: str,
@@ -94,19 +101,14 @@ async def fetch_user_ai_profile(
     except asyncpg.UndefinedTableError:
         return await fetch_profile_fallback(connection, user_id)
 
-    if row and row["profile_json"]:
-        profile_json = row["profile_json"]
-        if isinstance(profile_json, str):
-            try:
-                return json.loads(profile_json)
-            except json.JSONDecodeError:
-                return {}
-        if isinstance(profile_json, dict):
-            return profile_json
+    # the pool's jsonb codec already decoded the column
+    if row and isinstance(row["profile_json"], dict) and row["profile_json"]:
+        return row["profile_json"]
 
     return await fetch_profile_fallback(connection, user_id)
 
 
+@timed_db
 async def fetch_stored_user_ai_profile(
     connection: asyncpg.Connection,
     user_id: str,
@@ -123,23 +125,12 @@ async def fetch_stored_user_ai_profile(
     except asyncpg.UndefinedTableError:
         return {}
 
-    if not row:
+    if not row or not isinstance(row["profile_json"], dict):
         return {}
-
-    profile_json = row["profile_json"]
-    if isinstance(profile_json, dict):
-        return profile_json
-
-    if isinstance(profile_json, str):
-        try:
-            parsed = json.loads(profile_json)
-        except json.JSONDecodeError:
-            return {}
-        return parsed if isinstance(parsed, dict) else {}
-
-    return {}
+    return row["profile_json"]
 
 
+@timed_db
 async def upsert_user_ai_profile(
     connection: asyncpg.Connection,
     user_id: str,
@@ -155,7 +146,7 @@ async def upsert_user_ai_profile(
             RETURNING user_id, profile_json
             """,
             user_id,
-            json.dumps(profile_json),
+            profile_json,
         )
     except asyncpg.UndefinedTableError:
         await ensure_user_ai_profile_table(connection)
@@ -168,11 +159,33 @@ async def upsert_user_ai_profile(
             RETURNING user_id, profile_json
             """,
             user_id,
-            json.dumps(profile_json),
+            profile_json,
         )
     return dict(row) if row else {"user_id": user_id, "profile_json": profile_json}
 
 
+@timed_db
+async def merge_user_ai_profile_fields(
+    connection: asyncpg.Connection,
+    user_id: str,
+    fields: dict[str, Any],
+) -> None:
+    """Overwrite only the given top-level keys of ``profile_json``."""
+
+    query = """
+        INSERT INTO user_ai_profile (user_id, profile_json)
+        VALUES ($1, $2::jsonb)
+        ON CONFLICT (user_id)
+        DO UPDATE SET profile_json = user_ai_profile.profile_json || EXCLUDED.profile_json
+        """
+    try:
+        await connection.execute(query, user_id, fields)
+    except asyncpg.UndefinedTableError:
+        await ensure_user_ai_profile_table(connection)
+        await connection.execute(query, user_id, fields)
+
+
+@timed_db
 async def fetch_profile_fallback(
     connection: asyncpg.Connection,
     user_id: str,
@@ -241,6 +254,7 @@ async def fetch_profile_fallback(
     }
 
 
+@timed_db
 async def fetch_recent_trends(
     connection: asyncpg.Connection,
     limit: int,
@@ -4,19 +4,51 @@ import logging
 
 import asyncpg
 import httpx
+import orjson
 from fastapi import FastAPI
 
 from ai_chat_config import AIChatSettings, load_ai_chat_settings
 from ai_chat_llm_client import OllamaChatClient
 from ai_roadmap_service import AIRoadmapService
 from ai_chat_service import AIChatService
-from ai_profile_extract_service import AIProfileExtractService
+from ai_profile_extract_batcher import ProfileExtractBatcher
+from ai_profile_extract_worker import BackgroundProfileExtractor
+from ai_profile_extract_service import (
+    EXTRACT_RESPONSE_SCHEMA,
+    SYSTEM_PROMPT as PROFILE_EXTRACT_SYSTEM_PROMPT,
+    AIProfileExtractService,
+)
+from ai_profile_update_queue import ProfileUpdateQueue
 from ai_skill_gap_service import AISkillGapService
+from services.admission import AdmissionController
+from services.llm_router import get_model_router
+from services.metrics import register_asyncpg_pool, register_httpx_client
 
 
 logger = logging.getLogger(__name__)
 
 
+def _encode_json(value: object) -> str:
+    return orjson.dumps(value, default=str).decode()
+
+
+async def init_db_connection(connection: asyncpg.Connection) -> None:
+    """Decode json/jsonb columns to Python values and encode parameters, both with orjson.
+
+    Repositories pass dicts straight into ``$n::jsonb`` parameters and get
+    dicts back, instead of round-tripping through ``json.dumps``/``json.loads``.
+    """
+
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(
+            type_name,
+            schema="pg_catalog",
+            encoder=_encode_json,
+            decoder=orjson.loads,
+            format="text",
+        )
+
+
 async def ensure_ai_chat_schema(db_pool: asyncpg.Pool) -> None:
     async with db_pool.acquire() as connection:
         await connection.execute(
@@ -77,31 +109,54 @@ async def initialize_ai_chat_runtime(app: FastAPI) -> None:
             ),
             limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
         )
+        register_httpx_client("ai_chat", http_client)
 
         try:
             db_pool = await asyncpg.create_pool(
                 dsn=settings.database_url,
                 min_size=settings.db_pool_min_size,
                 max_size=settings.db_pool_max_size,
+                init=init_db_connection,
             )
             await ensure_ai_chat_schema(db_pool)
+            register_asyncpg_pool("ai_chat", db_pool)
         except Exception:
             logger.exception("AI chat runtime could not connect to Postgres. Continuing in no-db mode.")
             if db_pool is not None:
                 await db_pool.close()
             db_pool = None
 
+        admission = get_llm_admission(app)
+
         app.state.ai_chat_settings = settings
         app.state.ai_chat_db_pool = db_pool
         app.state.ai_chat_http_client = http_client
-        app.state.ai_chat_service = AIChatService(
+        extract_service = AIProfileExtractService(
             pool=db_pool,
-            llm_client=OllamaChatClient(http_client=http_client, settings=settings),
             settings=settings,
+            admission=admission,
+            batcher=ProfileExtractBatcher(
+                system_prompt=PROFILE_EXTRACT_SYSTEM_PROMPT,
+                response_schema=EXTRACT_RESPONSE_SCHEMA,
+                admission=admission,
+            ),
+            updates=ProfileUpdateQueue(db_pool) if db_pool is not None else None,
         )
-        app.state.ai_profile_extract_service = AIProfileExtractService(
+        background_extractor = BackgroundProfileExtractor(extract_service)
+        await background_extractor.start()
+
+        app.state.ai_profile_extract_service = extract_service
+        app.state.ai_background_extractor = background_extractor
+        app.state.ai_chat_service = AIChatService(
             pool=db_pool,
+            llm_client=OllamaChatClient(
+                http_client=http_client,
+                settings=settings,
+                router=get_model_router(),
+            ),
             settings=settings,
+            admission=admission,
+            background_extractor=background_extractor,
         )
         app.state.ai_skill_gap_service = AISkillGapService()
         app.state.ai_roadmap_service = AIRoadmapService()
@@ -113,6 +168,7 @@ async def initialize_ai_chat_runtime(app: FastAPI) -> None:
         app.state.ai_chat_http_client = None
         app.state.ai_chat_service = None
         app.state.ai_profile_extract_service = None
+        app.state.ai_background_extractor = None
         app.state.ai_skill_gap_service = None
         app.state.ai_roadmap_service = None
 
@@ -125,6 +181,15 @@ async def initialize_ai_chat_runtime(app: FastAPI) -> None:
 async def shutdown_ai_chat_runtime(app: FastAPI) -> None:
     http_client = getattr(app.state, "ai_chat_http_client", None)
     db_pool = getattr(app.state, "ai_chat_db_pool", None)
+    extract_service = getattr(app.state, "ai_profile_extract_service", None)
+    background_extractor = getattr(app.state, "ai_background_extractor", None)
+
+    if background_extractor is not None:
+        await background_extractor.stop()
+        app.state.ai_background_extractor = None
+
+    if extract_service is not None and extract_service.updates is not None:
+        await extract_service.updates.flush_all()
 
     if http_client is not None:
         await http_client.aclose()
@@ -140,5 +205,13 @@ async def shutdown_ai_chat_runtime(app: FastAPI) -> None:
     app.state.ai_roadmap_service = None
 
 
+def get_llm_admission(app: FastAPI) -> AdmissionController:
+    admission = getattr(app.state, "llm_admission", None)
+    if admission is None:
+        admission = AdmissionController.from_env()
+        app.state.llm_admission = admission
+    return admission
+
+
 def get_ai_chat_settings(app: FastAPI) -> AIChatSettings | None:
     return getattr(app.state, "ai_chat_settings", None)
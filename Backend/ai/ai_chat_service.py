@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 
 import asyncpg
 
@@ -17,6 +19,12 @@ from ai_chat_repository import (
     insert_chat_message,
     user_exists,
 )
+from ai_profile_extract_worker import BackgroundProfileExtractor
+from services.admission import AdmissionController, AdmissionRejected
+from services.embeddings import nearest_labels
+from services.market_retrieval import get_market_retriever
+from services.skill_taxonomy import get_skill_taxonomy, normalize_key
+from services.tracing import span, traced
 
 
 logger = logging.getLogger(__name__)
@@ -30,6 +38,23 @@ GOAL_PATTERNS = [
     re.compile(r"\baspire\s+to\s+be(?:come)?\s+([^.,!?;\n]+)", re.IGNORECASE),
 ]
 
+# Candidate phrases for semantic mention matching skip these words.
+MENTION_STOPWORDS = frozenset(
+    """
+    a about also am an and any are as at be been but by can could do does for from get got had has have
+    how i i'm im in into is it its just like me more my need not of on or our really should so some than
+    that the their them then there these they this to too use used using very want was we well were what
+    when which while who why will with would you your
+    """.split()
+)
+# Words found in skill names that on their own say nothing about a skill.
+GENERIC_MENTION_WORDS = frozenset(
+    "career careers experience job jobs learn learning more role roles skill skills team work".split()
+)
+TECHNICAL_WORD = re.compile(r"[0-9+#.]|.[A-Z]")
+MAX_MENTION_PHRASES = 24
+MAX_SKILL_MENTIONS = 5
+
 DEGRADED_RESPONSE_PREFIX = (
     "I cannot reach the live AI model right now, but here is a practical next-step plan you can use immediately."
 )
@@ -61,23 +86,53 @@ def _unique_strings(values: list[str]) -> list[str]:
     return unique
 
 
-def _find_skill_mentions(message: str, skill_catalog: list[str]) -> list[str]:
-    lowered_message = message.casefold()
-    ordered_catalog = sorted(_unique_strings(skill_catalog), key=len, reverse=True)
-
-    matches: list[tuple[int, str]] = []
-    for skill_name in ordered_catalog:
-        lowered_skill = skill_name.casefold()
-        pattern = re.compile(
-            rf"(?<![a-z0-9]){re.escape(lowered_skill)}(?![a-z0-9])",
-            re.IGNORECASE,
-        )
-        found = pattern.search(lowered_message)
-        if found:
-            matches.append((found.start(), skill_name))
+@lru_cache(maxsize=16)
+def _mention_vocabulary(catalog: tuple[str, ...]) -> frozenset[str]:
+    """Words of the catalog labels and of the taxonomy's scanned skill names and aliases."""
 
-    matches.sort(key=lambda item: item[0])
-    return [name for _, name in matches[:5]]
+    names = [*catalog, *(name for skill in get_skill_taxonomy().skills for name in (skill.name, *skill.aliases))]
+    words = {word for name in names for word in normalize_key(name).split()}
+    return frozenset(words - MENTION_STOPWORDS - GENERIC_MENTION_WORDS)
+
+
+def _mention_phrases(message: str, vocabulary: frozenset[str]) -> list[str]:
+    """Skill-like single words and word pairs from ``message`` (stopwords dropped), in order.
+
+    A word is skill-like when it looks technical ("C++", "k8s", "PyTorch") or
+    appears in a skill name (``vocabulary``); a pair needs one such word.
+    """
+
+    words = [
+        word.rstrip(".'-")
+        for word in re.findall(r"[A-Za-z][A-Za-z0-9+#.'-]*", message)
+        if word.casefold() not in MENTION_STOPWORDS and len(word) > 1
+    ]
+    skill_like = [bool(TECHNICAL_WORD.search(word)) or word.casefold() in vocabulary for word in words]
+    phrases = [word for word, keep in zip(words, skill_like) if keep]
+    phrases.extend(
+        f"{left} {right}"
+        for (left, keep_left), (right, keep_right) in zip(zip(words, skill_like), zip(words[1:], skill_like[1:]))
+        if keep_left or keep_right
+    )
+    return _unique_strings(phrases)[:MAX_MENTION_PHRASES]
+
+
+def _find_skill_mentions(message: str, skill_catalog: list[str]) -> list[str]:
+    # the compiled matcher is cached per catalog, and catalog names also
+    # match their taxonomy aliases ("js" -> JavaScript)
+    catalog = _unique_strings(skill_catalog)
+    mentions = get_skill_taxonomy().matcher_for(catalog).find_in_order(message)
+    if len(mentions) >= MAX_SKILL_MENTIONS or not catalog:
+        return mentions[:MAX_SKILL_MENTIONS]
+
+    # then by meaning ("neural nets" -> Deep Learning), one batched lookup
+    seen = {mention.casefold() for mention in mentions}
+    phrases = _mention_phrases(message, _mention_vocabulary(tuple(catalog)))
+    for hit in nearest_labels(phrases, catalog):
+        if hit is not None and hit.label.casefold() not in seen:
+            seen.add(hit.label.casefold())
+            mentions.append(hit.label)
+    return mentions[:MAX_SKILL_MENTIONS]
 
 
 def _extract_goals(message: str) -> list[str]:
@@ -203,7 +258,18 @@ class AIChatService:
     pool: asyncpg.Pool | None
     llm_client: OllamaChatClient
     settings: AIChatSettings
+    admission: AdmissionController | None = None
+    background_extractor: BackgroundProfileExtractor | None = None
+
+    @traced("ai_chat.completion")
+    async def _create_completion(self, messages: list[dict[str, str]]) -> str:
+        if self.admission is None:
+            return await self.llm_client.create_chat_completion(messages)
 
+        async with self.admission.admit("chat"):
+            return await self.llm_client.create_chat_completion(messages)
+
+    @traced("ai_chat.handle_chat")
     async def handle_chat(self, payload: AIChatRequest) -> AIChatResponse:
         if len(payload.message) > self.settings.max_message_chars:
             raise AIChatServiceError(
@@ -213,17 +279,18 @@ class AIChatService:
 
         if self.pool is not None:
             try:
-                async with self.pool.acquire() as connection:
-                    if not await user_exists(connection, payload.user_id):
-                        raise AIChatServiceError(status_code=404, detail="User not found.")
-
-                    recent_messages = await fetch_recent_messages(
-                        connection=connection,
-                        user_id=payload.user_id,
-                        limit=self.settings.max_recent_messages,
-                    )
-                    profile = await fetch_stored_user_ai_profile(connection, payload.user_id)
-                    skill_catalog = await fetch_skill_catalog(connection)
+                with span("ai_chat.load_context"):
+                    async with self.pool.acquire() as connection:
+                        if not await user_exists(connection, payload.user_id):
+                            raise AIChatServiceError(status_code=404, detail="User not found.")
+
+                        recent_messages = await fetch_recent_messages(
+                            connection=connection,
+                            user_id=payload.user_id,
+                            limit=self.settings.max_recent_messages,
+                        )
+                        profile = await fetch_stored_user_ai_profile(connection, payload.user_id)
+                        skill_catalog = await fetch_skill_catalog(connection)
             except AIChatServiceError:
                 raise
             except asyncpg.PostgresError as exc:
@@ -238,17 +305,39 @@ class AIChatService:
             profile = payload.profile if isinstance(payload.profile, dict) else {}
             skill_catalog = [str(skill).strip() for skill in payload.skill_catalog if str(skill).strip()]
 
+        with span("ai_chat.retrieve_market"):
+            market_snippets = get_market_retriever().retrieve(
+                payload.message,
+                role=_extract_target_role_from_profile(profile),
+                k=self.settings.market_trends_limit,
+                token_budget=self.settings.market_token_budget,
+            )
+
         messages = build_chat_messages(
             system_instruction=self.settings.system_instruction,
             recent_messages=recent_messages,
             profile=profile,
             user_message=payload.message,
+            market_snippets=[snippet.text for snippet in market_snippets],
         )
-        conversation_summary = build_conversation_summary(payload.message, skill_catalog)
+        # may embed the message's phrases, so keep it off the event loop
+        conversation_summary = await asyncio.to_thread(build_conversation_summary, payload.message, skill_catalog)
         degraded = False
 
         try:
-            assistant_response = await self.llm_client.create_chat_completion(messages)
+            assistant_response = await self._create_completion(messages)
+        except AdmissionRejected as exc:
+            logger.warning(
+                "LLM admission rejected for user %s (%s); returning degraded response",
+                payload.user_id,
+                exc.reason,
+            )
+            assistant_response = _build_degraded_assistant_response(
+                message=payload.message,
+                profile=profile if isinstance(profile, dict) else {},
+                conversation_summary=conversation_summary,
+            )
+            degraded = True
         except LLMTimeoutError:
             logger.warning("LLM timeout for user %s; returning degraded response", payload.user_id)
             assistant_response = _build_degraded_assistant_response(
@@ -273,24 +362,30 @@ class AIChatService:
         user_message_row: dict[str, str] = {}
         if self.pool is not None:
             try:
-                async with self.pool.acquire() as connection:
-                    async with connection.transaction():
-                        user_message_row = await insert_chat_message(
-                            connection=connection,
-                            user_id=payload.user_id,
-                            role="user",
-                            message=payload.message,
-                        )
-                        await insert_chat_message(
-                            connection=connection,
-                            user_id=payload.user_id,
-                            role="assistant",
-                            message=assistant_response,
-                        )
+                with span("ai_chat.persist"):
+                    async with self.pool.acquire() as connection:
+                        async with connection.transaction():
+                            user_message_row = await insert_chat_message(
+                                connection=connection,
+                                user_id=payload.user_id,
+                                role="user",
+                                message=payload.message,
+                            )
+                            await insert_chat_message(
+                                connection=connection,
+                                user_id=payload.user_id,
+                                role="assistant",
+                                message=assistant_response,
+                            )
             except asyncpg.PostgresError as exc:
                 logger.exception("Database error while persisting assistant reply for user %s", payload.user_id)
                 raise AIChatServiceError(503, "Database unavailable while saving assistant response.") from exc
 
+        extraction_queued = False
+        if payload.extract_profile and self.background_extractor is not None and self.pool is not None:
+            await self.background_extractor.enqueue(payload.user_id, payload.message)
+            extraction_queued = True
+
         logger.info(
             "Stored AI chat exchange for user %s",
             payload.user_id,
@@ -300,4 +395,5 @@ class AIChatService:
             message_id=str(user_message_row.get("id")) if user_message_row.get("id") else None,
             conversation_summary=conversation_summary,
             degraded=degraded,
+            profile_extraction_queued=extraction_queued,
         )
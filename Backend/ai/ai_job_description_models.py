@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+StageState = Literal["pending", "running", "done", "failed"]
+
+
+class JobDescriptionJobRequest(BaseModel):
+    role: str = Field(..., min_length=2, max_length=255)
+    per_source_limit: int = Field(default=5, ge=1, le=10)
+
+    @field_validator("role")
+    @classmethod
+    def strip_role(cls, value: str) -> str:
+        cleaned = " ".join(value.split())
+        if len(cleaned) < 2:
+            raise ValueError("Field 'role' is required and must contain at least 2 characters.")
+        return cleaned
+
+
+class JobDescriptionJobProgress(BaseModel):
+    scraping: StageState = "pending"
+    part1: StageState = "pending"
+    part2: StageState = "pending"
+
+
+class JobDescriptionJobResponse(BaseModel):
+    job_id: str
+    role: str
+    per_source_limit: int
+    status: JobStatus
+    progress: JobDescriptionJobProgress = Field(default_factory=JobDescriptionJobProgress)
+    coalesced: bool = False
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import Any
+
+import asyncpg
+
+from services.metrics import timed_db
+
+
+@timed_db
+async def ensure_job_description_jobs_table(connection: asyncpg.Connection) -> None:
+    await connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_description_jobs (
+            id UUID PRIMARY KEY,
+            role VARCHAR(255) NOT NULL,
+            role_key VARCHAR(255) NOT NULL,
+            per_source_limit INTEGER NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            progress JSONB NOT NULL DEFAULT '{}'::jsonb,
+            result JSONB,
+            error TEXT,
+            version INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+        """
+    )
+    await connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_job_description_jobs_inflight
+            ON job_description_jobs (role_key, per_source_limit, updated_at DESC)
+            WHERE status IN ('queued', 'running')
+        """
+    )
+
+
+def _row_to_job(row: asyncpg.Record | None) -> dict[str, Any] | None:
+    if not row:
+        return None
+
+    job = dict(row)
+    job["id"] = str(job["id"])
+    # progress/result arrive decoded through the pool's jsonb codec
+    job["progress"] = job.get("progress") or {}
+    return job
+
+
+@timed_db
+async def insert_job(connection: asyncpg.Connection, job: dict[str, Any]) -> None:
+    await connection.execute(
+        """
+        INSERT INTO job_description_jobs
+            (id, role, role_key, per_source_limit, status, progress, version)
+        VALUES ($1, $2, $3, $4, $5, $6::jsonb, $7)
+        """,
+        job["id"],
+        job["role"],
+        job["role_key"],
+        job["per_source_limit"],
+        job["status"],
+        job["progress"],
+        job["version"],
+    )
+
+
+@timed_db
+async def update_job(connection: asyncpg.Connection, job: dict[str, Any]) -> None:
+    # Writes are issued from several tasks; the version guard keeps a late,
+    # older snapshot from overwriting a newer one.
+    await connection.execute(
+        """
+        UPDATE job_description_jobs
+        SET status = $2,
+            progress = $3::jsonb,
+            result = $4::jsonb,
+            error = $5,
+            version = $6,
+            updated_at = NOW()
+        WHERE id = $1
+          AND version < $6
+        """,
+        job["id"],
+        job["status"],
+        job["progress"],
+        job.get("result"),
+        job.get("error"),
+        job["version"],
+    )
+
+
+@timed_db
+async def fetch_job(connection: asyncpg.Connection, job_id: str) -> dict[str, Any] | None:
+    row = await connection.fetchrow(
+        """
+        SELECT id, role, role_key, per_source_limit, status, progress, result, error,
+               version, created_at, updated_at
+        FROM job_description_jobs
+        WHERE id = $1
+        """,
+        job_id,
+    )
+    return _row_to_job(row)
+
+
+@timed_db
+async def fetch_inflight_job(
+    connection: asyncpg.Connection,
+    role_key: str,
+    per_source_limit: int,
+    max_age_seconds: int,
+) -> dict[str, Any] | None:
+    row = await connection.fetchrow(
+        """
+        SELECT id, role, role_key, per_source_limit, status, progress, result, error,
+               version, created_at, updated_at
+        FROM job_description_jobs
+        WHERE role_key = $1
+          AND per_source_limit = $2
+          AND status IN ('queued', 'running')
+          AND updated_at > NOW() - make_interval(secs => $3)
+        ORDER BY created_at DESC
+        LIMIT 1
+        """,
+        role_key,
+        per_source_limit,
+        float(max_age_seconds),
+    )
+    return _row_to_job(row)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from ai_job_description_models import JobDescriptionJobRequest, JobDescriptionJobResponse
+from ai_job_description_service import (
+    TERMINAL_STATUSES,
+    JobDescriptionJobService,
+    JobDescriptionJobServiceError,
+    job_to_response,
+)
+
+
+router = APIRouter(prefix="/generate-job-description", tags=["job-description-jobs"])
+
+STREAM_KEEPALIVE_SECONDS = 15.0
+
+
+def get_job_description_job_service(request: Request) -> JobDescriptionJobService:
+    service = getattr(request.app.state, "job_description_job_service", None)
+    if service is None:
+        raise HTTPException(status_code=503, detail="Job description workers are unavailable.")
+    return service
+
+
+def _validate_job_id(job_id: str) -> str:
+    try:
+        return str(UUID(job_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail="Job not found.") from exc
+
+
+@router.post("/jobs", response_model=JobDescriptionJobResponse, status_code=202)
+async def create_job_endpoint(
+    payload: JobDescriptionJobRequest,
+    service: JobDescriptionJobService = Depends(get_job_description_job_service),
+) -> JobDescriptionJobResponse:
+    try:
+        job, coalesced = await service.submit(payload.role, payload.per_source_limit)
+    except JobDescriptionJobServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+    return job_to_response(job, coalesced=coalesced)
+
+
+@router.get("/jobs/{job_id}", response_model=JobDescriptionJobResponse)
+async def get_job_endpoint(
+    job_id: str,
+    service: JobDescriptionJobService = Depends(get_job_description_job_service),
+) -> JobDescriptionJobResponse:
+    clean_job_id = _validate_job_id(job_id)
+    try:
+        job = await service.get(clean_job_id)
+    except JobDescriptionJobServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job_to_response(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_endpoint(
+    job_id: str,
+    service: JobDescriptionJobService = Depends(get_job_description_job_service),
+) -> StreamingResponse:
+    clean_job_id = _validate_job_id(job_id)
+    try:
+        first = await service.get(clean_job_id)
+    except JobDescriptionJobServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+    if first is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    async def event_stream():
+        job = first
+        seen_version = -1
+        while job is not None:
+            if job["version"] > seen_version:
+                seen_version = job["version"]
+                yield f"event: status\ndata: {job_to_response(job).model_dump_json()}\n\n"
+                if job["status"] in TERMINAL_STATUSES:
+                    return
+            else:
+                yield ": keep-alive\n\n"
+
+            try:
+                job = await service.wait_for_update(
+                    clean_job_id,
+                    seen_version,
+                    timeout=STREAM_KEEPALIVE_SECONDS,
+                )
+            except JobDescriptionJobServiceError:
+                return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
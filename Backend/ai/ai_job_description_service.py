@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from copy import deepcopy
+from typing import Any, Callable
+
+import asyncpg
+from fastapi.concurrency import run_in_threadpool
+
+from ai_job_description_models import JobDescriptionJobProgress, JobDescriptionJobResponse
+from ai_job_description_repository import (
+    ensure_job_description_jobs_table,
+    fetch_inflight_job,
+    fetch_job,
+    insert_job,
+    update_job,
+)
+from services.env import env_int
+
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"succeeded", "failed"}
+JOB_STAGES = ("scraping", "part1", "part2")
+GENERATION_FAILED_DETAIL = (
+    "The role is not in the IT domain or the generation failed. "
+    "This endpoint only analyses IT roles."
+)
+
+
+class JobDescriptionJobServiceError(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _role_key(role: str) -> str:
+    return " ".join(role.split()).casefold()
+
+
+def job_to_response(job: dict[str, Any], *, coalesced: bool = False) -> JobDescriptionJobResponse:
+    return JobDescriptionJobResponse(
+        job_id=job["id"],
+        role=job["role"],
+        per_source_limit=job["per_source_limit"],
+        status=job["status"],
+        progress=JobDescriptionJobProgress(**(job.get("progress") or {})),
+        coalesced=coalesced,
+        result=job.get("result"),
+        error=job.get("error"),
+        created_at=job.get("created_at"),
+        updated_at=job.get("updated_at"),
+    )
+
+
+class JobDescriptionJobService:
+    """Runs /generate-job-description work on a background worker pool.
+
+    Jobs live in memory while this process owns them and are mirrored to
+    Postgres so any worker can answer status polls. Requests for a role that
+    already has a queued or running job attach to that job instead of
+    starting a new generation.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool | None,
+        generate: Callable[..., dict[str, Any] | None],
+        *,
+        worker_count: int | None = None,
+        queue_size: int | None = None,
+    ) -> None:
+        self.pool = pool
+        self.generate = generate
+        self.worker_count = max(1, worker_count or env_int("AI_JOB_WORKERS", 2))
+        self.queue_size = max(1, queue_size or env_int("AI_JOB_QUEUE_SIZE", 50))
+        self.inflight_max_age_seconds = max(60, env_int("AI_JOB_INFLIGHT_MAX_AGE_SECONDS", 900))
+        self.retention_seconds = max(60, env_int("AI_JOB_RETENTION_SECONDS", 3600))
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.queue_size)
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._finished_at: dict[str, float] = {}
+        self._inflight: dict[tuple[str, int], str] = {}
+        self._submit_lock = asyncio.Lock()
+        self._changed = asyncio.Condition()
+        self._workers: list[asyncio.Task[None]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.pool is not None:
+            try:
+                async with self.pool.acquire() as connection:
+                    await ensure_job_description_jobs_table(connection)
+            except asyncpg.PostgresError:
+                logger.exception("Could not prepare job_description_jobs; job results stay in memory only.")
+                self.pool = None
+
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"job-description-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+        logger.info("Job description workers started count=%s", self.worker_count)
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, role: str, per_source_limit: int) -> tuple[dict[str, Any], bool]:
+        key = (_role_key(role), per_source_limit)
+
+        async with self._submit_lock:
+            existing_id = self._inflight.get(key)
+            if existing_id is not None:
+                return deepcopy(self._jobs[existing_id]), True
+
+            shared = await self._find_shared_inflight(key)
+            if shared is not None:
+                return shared, True
+
+            if self._queue.full():
+                raise JobDescriptionJobServiceError(429, "Too many job-description requests are queued. Retry later.")
+
+            job = {
+                "id": str(uuid.uuid4()),
+                "role": role,
+                "role_key": key[0],
+                "per_source_limit": per_source_limit,
+                "status": "queued",
+                "progress": {stage: "pending" for stage in JOB_STAGES},
+                "result": None,
+                "error": None,
+                "version": 0,
+                "created_at": None,
+                "updated_at": None,
+            }
+            self._jobs[job["id"]] = job
+            self._inflight[key] = job["id"]
+
+            if self.pool is not None:
+                try:
+                    async with self.pool.acquire() as connection:
+                        await insert_job(connection, job)
+                except asyncpg.PostgresError:
+                    logger.exception("Could not persist job %s; continuing in memory.", job["id"])
+
+            self._queue.put_nowait(job["id"])
+            self._prune_finished()
+            return deepcopy(job), False
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return deepcopy(job)
+
+        if self.pool is None:
+            return None
+
+        try:
+            async with self.pool.acquire() as connection:
+                return await fetch_job(connection, job_id)
+        except asyncpg.PostgresError as exc:
+            logger.exception("Database error while loading job %s", job_id)
+            raise JobDescriptionJobServiceError(503, "Database unavailable while loading the job.") from exc
+
+    async def wait_for_update(
+        self,
+        job_id: str,
+        seen_version: int,
+        *,
+        timeout: float,
+    ) -> dict[str, Any] | None:
+        """Return the job once its version moves past ``seen_version``.
+
+        Returns the current state on timeout so callers can emit keep-alives.
+        Jobs owned by another process are re-read from Postgres instead.
+        """
+
+        if job_id not in self._jobs:
+            await asyncio.sleep(min(timeout, 2.0))
+            return await self.get(job_id)
+
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(
+                        lambda: job_id not in self._jobs or self._jobs[job_id]["version"] > seen_version
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        return await self.get(job_id)
+
+    async def _find_shared_inflight(self, key: tuple[str, int]) -> dict[str, Any] | None:
+        if self.pool is None:
+            return None
+
+        try:
+            async with self.pool.acquire() as connection:
+                return await fetch_inflight_job(connection, key[0], key[1], self.inflight_max_age_seconds)
+        except asyncpg.PostgresError:
+            logger.exception("Could not look up in-flight jobs for role=%s", key[0])
+            return None
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job description worker %s crashed on job %s", index, job_id)
+                await self._update(job_id, status="failed", error="Unexpected job failure.")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        job = self._jobs[job_id]
+        await self._update(job_id, status="running")
+
+        loop = self._loop or asyncio.get_running_loop()
+
+        def on_progress(stage: str, state: str) -> None:
+            # Called from the generation thread.
+            asyncio.run_coroutine_threadsafe(self._update(job_id, stage=stage, stage_state=state), loop)
+
+        result = await run_in_threadpool(
+            self.generate,
+            job["role"],
+            job["per_source_limit"],
+            on_progress=on_progress,
+        )
+
+        if result is None:
+            await self._update(job_id, status="failed", error=GENERATION_FAILED_DETAIL)
+        else:
+            await self._update(job_id, status="succeeded", result=result)
+
+    async def _update(
+        self,
+        job_id: str,
+        *,
+        status: str | None = None,
+        stage: str | None = None,
+        stage_state: str | None = None,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+
+        if stage in JOB_STAGES and stage_state:
+            job["progress"][stage] = stage_state
+        if status is not None:
+            job["status"] = status
+        if result is not None:
+            job["result"] = result
+        if error is not None:
+            job["error"] = error
+        job["version"] += 1
+
+        if job["status"] in TERMINAL_STATUSES:
+            self._inflight.pop((job["role_key"], job["per_source_limit"]), None)
+            self._finished_at[job_id] = time.monotonic()
+
+        snapshot = deepcopy(job)
+        async with self._changed:
+            self._changed.notify_all()
+
+        if self.pool is not None:
+            try:
+                async with self.pool.acquire() as connection:
+                    await update_job(connection, snapshot)
+            except asyncpg.PostgresError:
+                logger.exception("Could not persist progress for job %s", job_id)
+
+    def _prune_finished(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        for job_id, finished_at in list(self._finished_at.items()):
+            if finished_at < cutoff:
+                self._finished_at.pop(job_id, None)
+                self._jobs.pop(job_id, None)
@@ -4,10 +4,13 @@ from datetime import datetime, timezone
 from typing import Any
 
 from pydantic import BaseModel, Field
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 
-from market_intelligence_service.scheduler import refresh_trends_for_role, refresh_trends_for_roles
-from market_intelligence_service.storage import get_global_trends, get_trends
+# Stages load on first use through the package facade, so workers that never
+# serve /trends do not import the scraping and storage stacks.
+import market_intelligence_service as market
 
 
 router = APIRouter(prefix="/trends", tags=["market-trends"])
@@ -67,42 +70,57 @@ def _truthy_flag(value: str | None, default: bool = True) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {item.strip().removeprefix("W/") for item in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/role/{role}")
 async def get_role_trends_endpoint(
     role: str,
+    request: Request,
     limit: int = 100,
     refresh_if_stale: str | None = None,
-):
+) -> Response:
     clean_role = " ".join(role.split()).strip()
     if not clean_role:
         raise HTTPException(status_code=400, detail="Role is required.")
 
     safe_limit = max(1, min(limit, 500))
-    trends = get_trends(clean_role, limit=safe_limit)
-    latest_updated_at = _extract_latest_updated_at(trends)
-    stale = _is_stale(latest_updated_at)
+    # hot roles come straight from the in-process snapshot cache, with no DB round trip
+    snapshot = market.get_cached_role_snapshot(clean_role)
+    if snapshot is None:
+        snapshot = await run_in_threadpool(market.refresh_role_snapshot, clean_role)
+    stale = _is_stale(snapshot.latest_updated_at)
 
     did_trigger_background_refresh = False
     if stale and _truthy_flag(refresh_if_stale, default=True):
         did_trigger_background_refresh = True
-        refresh_trends_for_role(clean_role)
+        await run_in_threadpool(market.refresh_trends_for_role, clean_role)
 
-    return {
-        "success": True,
-        "role": clean_role,
-        "count": len(trends),
-        "stale": stale,
-        "stale_after_hours": STALE_AFTER_HOURS,
-        "latest_updated_at": latest_updated_at.isoformat() if latest_updated_at else None,
-        "background_refresh_triggered": did_trigger_background_refresh,
-        "trends": trends,
-    }
+    etag = snapshot.etag(limit=safe_limit, stale=stale)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if not did_trigger_background_refresh and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=snapshot.render(
+            limit=safe_limit,
+            stale=stale,
+            stale_after_hours=STALE_AFTER_HOURS,
+            background_refresh_triggered=did_trigger_background_refresh,
+        ),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @router.get("/global")
 async def get_global_trends_endpoint(limit: int = 100):
     safe_limit = max(1, min(limit, 500))
-    trends = get_global_trends(limit=safe_limit)
+    trends = market.get_global_trends(limit=safe_limit)
     latest_updated_at = _extract_latest_updated_at(trends)
     stale = _is_stale(latest_updated_at)
 
@@ -122,9 +140,9 @@ async def refresh_role_trends_endpoint(payload: RefreshTrendsRequest):
     requested_roles = [" ".join(str(item).split()).strip() for item in (payload.roles or []) if str(item).strip()]
 
     if requested_roles:
-        result = refresh_trends_for_roles(requested_roles, search_limit=payload.search_limit)
+        result = market.refresh_trends_for_roles(requested_roles, search_limit=payload.search_limit)
     elif requested_role:
-        result = refresh_trends_for_role(requested_role, search_limit=payload.search_limit)
+        result = market.refresh_trends_for_role(requested_role, search_limit=payload.search_limit)
     else:
         raise HTTPException(status_code=400, detail="Provide 'role' or non-empty 'roles'.")
 
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+from services.admission import AdmissionController
+from services.env import env_int
+from services.llm_schemas import array_schema
+from services.llm_service import build_messages, call_llm
+from services.tracing import span
+
+
+logger = logging.getLogger(__name__)
+
+
+def build_batch_user_prompt(messages: list[str]) -> str:
+    sections = [
+        f"Extract a profile from each of the {len(messages)} messages below independently.",
+        (
+            f"Return ONLY a JSON array with exactly {len(messages)} objects, one per message, "
+            "in the same order, each using the JSON FORMAT above."
+        ),
+    ]
+    for index, message in enumerate(messages, start=1):
+        sections.append(f"Message {index}:\n<<<\n{message}\n>>>")
+    return "\n\n".join(sections)
+
+
+@dataclass(slots=True)
+class _PendingExtraction:
+    message: str
+    future: asyncio.Future[Any]
+
+
+@dataclass(slots=True)
+class _PendingBatch:
+    items: list[_PendingExtraction] = field(default_factory=list)
+    chars: int = 0
+    flush_handle: asyncio.TimerHandle | None = None
+
+
+class ProfileExtractBatcher:
+    """Coalesces one user's profile-extraction prompts that arrive within a short window.
+
+    Requests from the same user collected in one window are sent as a single
+    batched prompt that asks for a JSON array. Messages from different users
+    never share a prompt: results are matched back by position, so a
+    reordered or merged entry must not be able to land in someone else's
+    profile, and one user's text must not steer another user's extraction.
+    If the model returns anything other than one object per message, the
+    batch falls back to single-message calls, each admitted on its own, so
+    every caller always receives its own extraction result.
+    """
+
+    def __init__(
+        self,
+        *,
+        system_prompt: str,
+        response_schema: dict[str, Any] | None = None,
+        admission: AdmissionController | None = None,
+        window_seconds: float | None = None,
+        max_batch_size: int | None = None,
+        max_batch_chars: int | None = None,
+    ) -> None:
+        self.system_prompt = system_prompt
+        self.response_schema = response_schema
+        self.admission = admission
+        self.window_seconds = (
+            window_seconds
+            if window_seconds is not None
+            else max(0, env_int("AI_EXTRACT_BATCH_WINDOW_MS", 25)) / 1000.0
+        )
+        self.max_batch_size = max(1, max_batch_size or env_int("AI_EXTRACT_BATCH_SIZE", 8))
+        self.max_batch_chars = max(1, max_batch_chars or env_int("AI_EXTRACT_BATCH_MAX_CHARS", 4000))
+        self._pending: dict[str, _PendingBatch] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def extract(self, message: str, *, user_id: str) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+
+        # Keep each batch inside the extract context window.
+        pending = self._pending.get(user_id)
+        if pending is not None and pending.chars + len(message) > self.max_batch_chars:
+            self._flush(user_id)
+            pending = None
+        if pending is None:
+            pending = self._pending[user_id] = _PendingBatch()
+
+        pending.items.append(_PendingExtraction(message=message, future=future))
+        pending.chars += len(message)
+
+        if len(pending.items) >= self.max_batch_size or self.window_seconds <= 0:
+            self._flush(user_id)
+        elif pending.flush_handle is None:
+            pending.flush_handle = loop.call_later(self.window_seconds, self._flush, user_id)
+
+        return await future
+
+    def _flush(self, user_id: str) -> None:
+        pending = self._pending.pop(user_id, None)
+        if pending is None:
+            return
+        if pending.flush_handle is not None:
+            pending.flush_handle.cancel()
+        if not pending.items:
+            return
+
+        task = asyncio.create_task(self._run_batch(pending.items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[_PendingExtraction]) -> None:
+        # The task inherits the context of the request that opened the batch,
+        # so the batch span lands in that request's trace.
+        try:
+            with span("ai_profile_extract.batch", batch_size=len(batch)):
+                results = await self._extract_batch(batch)
+        except Exception as exc:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+
+        for item, result in zip(batch, results):
+            if not item.future.done():
+                item.future.set_result(result)
+
+    async def _call_extract(self, llm_messages: list[dict[str, str]], response_format: Any) -> Any:
+        """One extract-class LLM call, holding one admission slot for its duration."""
+
+        if self.admission is None:
+            return await run_in_threadpool(call_llm, "extract", llm_messages, response_format=response_format)
+
+        async with self.admission.admit("extract"):
+            return await run_in_threadpool(call_llm, "extract", llm_messages, response_format=response_format)
+
+    async def _extract_single(self, message: str) -> Any:
+        return await self._call_extract(build_messages(self.system_prompt, message), self.response_schema)
+
+    async def _extract_batch(self, batch: list[_PendingExtraction]) -> list[Any]:
+        if len(batch) == 1:
+            return [await self._extract_single(batch[0].message)]
+
+        messages = [item.message for item in batch]
+        raw = await self._call_extract(
+            build_messages(self.system_prompt, build_batch_user_prompt(messages)),
+            array_schema(self.response_schema, len(batch)) if self.response_schema else "json",
+        )
+        if isinstance(raw, list) and len(raw) == len(batch) and all(isinstance(entry, dict) for entry in raw):
+            logger.info("Batched profile extraction size=%s", len(batch))
+            return raw
+
+        logger.warning(
+            "Batched extraction returned an unusable shape size=%s; falling back to single calls",
+            len(batch),
+        )
+        # the batch's slot is released by now; each fallback call takes its own
+        return list(await asyncio.gather(*(self._extract_single(message) for message in messages)))
@@ -45,6 +45,12 @@ class ExtractedProfile(BaseModel):
     interests: list[str] = Field(default_factory=list)
 
 
+class ExtractedProfileLLMOutput(ExtractedProfile):
+    """Shape the extraction prompt asks the model to return."""
+
+    confidence: float = Field(default=0.0, ge=0.0, le=1.0)
+
+
 class AIProfileExtractResponse(BaseModel):
     extracted: ExtractedProfile
     confidence: float
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 from ai_profile_extract_models import AIProfileExtractRequest, AIProfileExtractResponse
+from ai_profile_extract_worker import BackgroundProfileExtractor
 from ai_profile_extract_service import (
     AIProfileExtractService,
     AIProfileExtractServiceError,
@@ -28,3 +31,18 @@ async def extract_profile_endpoint(
         return await service.handle_extract_profile(payload)
     except AIProfileExtractServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+
+
+def get_background_extractor(request: Request) -> BackgroundProfileExtractor:
+    extractor = getattr(request.app.state, "ai_background_extractor", None)
+    if extractor is None:
+        raise HTTPException(status_code=503, detail="Background profile extraction is unavailable.")
+    return extractor
+
+
+@router.get("/extract-profile/lag")
+async def extract_profile_lag_endpoint(
+    user_id: str | None = None,
+    extractor: BackgroundProfileExtractor = Depends(get_background_extractor),
+) -> dict[str, Any]:
+    return extractor.lag_metrics(user_id)
@@ -10,15 +10,21 @@ from fastapi.concurrency import run_in_threadpool
 from ai_chat_config import AIChatSettings
 from ai_chat_repository import (
     fetch_stored_user_ai_profile,
-    upsert_user_ai_profile,
+    merge_user_ai_profile_fields,
     user_exists,
 )
+from ai_profile_extract_batcher import ProfileExtractBatcher
 from ai_profile_extract_models import (
     AIProfileExtractRequest,
     AIProfileExtractResponse,
     ExtractedProfile,
+    ExtractedProfileLLMOutput,
 )
+from ai_profile_update_queue import ProfileUpdateQueue
+from services.admission import AdmissionController, AdmissionRejected
+from services.llm_schemas import schema_from_model
 from services.llm_service import SAFE_EXTRACT_FALLBACK, build_messages, call_llm
+from services.tracing import traced
 
 
 logger = logging.getLogger(__name__)
@@ -44,6 +50,8 @@ JSON FORMAT:
 "confidence": number
 }"""
 
+EXTRACT_RESPONSE_SCHEMA = schema_from_model(ExtractedProfileLLMOutput)
+
 SAFE_PROFILE_FALLBACK = {
     **SAFE_EXTRACT_FALLBACK,
     "confidence": 0.0,
@@ -225,11 +233,65 @@ def merge_profile_data(existing: dict[str, Any], new_data: dict[str, Any]) -> di
     }
 
 
+PROFILE_FIELDS = ("skills", "goals", "experience_years", "education", "interests", "confidence")
+
+
+def compute_profile_delta(existing: dict[str, Any], merged: dict[str, Any]) -> dict[str, Any]:
+    """Return the top-level profile fields whose merged value differs from storage."""
+
+    delta: dict[str, Any] = {}
+    for field in PROFILE_FIELDS:
+        if field not in existing or existing[field] != merged[field]:
+            delta[field] = merged[field]
+
+    # An empty profile has nothing worth persisting yet.
+    if not _has_meaningful_profile_data(merged) and not existing:
+        return {}
+    return delta
+
+
 @dataclass(slots=True)
 class AIProfileExtractService:
     pool: asyncpg.Pool | None
     settings: AIChatSettings
+    admission: AdmissionController | None = None
+    batcher: ProfileExtractBatcher | None = None
+    updates: ProfileUpdateQueue | None = None
+
+    @traced("ai_profile_extract.extract")
+    async def _extract(self, message: str, user_id: str) -> Any:
+        if self.batcher is not None:
+            return await self.batcher.extract(message, user_id=user_id)
+
+        llm_messages = build_messages(SYSTEM_PROMPT, message)
+        if self.admission is None:
+            return await run_in_threadpool(
+                call_llm,
+                "extract",
+                llm_messages,
+                response_format=EXTRACT_RESPONSE_SCHEMA,
+            )
 
+        async with self.admission.admit("extract"):
+            return await run_in_threadpool(
+                call_llm,
+                "extract",
+                llm_messages,
+                response_format=EXTRACT_RESPONSE_SCHEMA,
+            )
+
+    async def _load_profile(self, user_id: str) -> dict[str, Any]:
+        try:
+            async with self.pool.acquire() as connection:
+                return await fetch_stored_user_ai_profile(connection, user_id)
+        except asyncpg.PostgresError as exc:
+            logger.exception("Database error while loading AI profile for user %s", user_id)
+            raise AIProfileExtractServiceError(
+                503,
+                "Database unavailable while loading the profile.",
+            ) from exc
+
+    @traced("ai_profile_extract.handle_extract_profile")
     async def handle_extract_profile(
         self,
         payload: AIProfileExtractRequest,
@@ -245,8 +307,6 @@ class AIProfileExtractService:
                 async with self.pool.acquire() as connection:
                     if not await user_exists(connection, payload.user_id):
                         raise AIProfileExtractServiceError(404, "User not found.")
-
-                    existing_profile = await fetch_stored_user_ai_profile(connection, payload.user_id)
             except AIProfileExtractServiceError:
                 raise
             except asyncpg.PostgresError as exc:
@@ -255,34 +315,55 @@ class AIProfileExtractService:
                     503,
                     "Database unavailable while loading the profile.",
                 ) from exc
-        else:
-            existing_profile = (
-                payload.existing_profile
-                if isinstance(payload.existing_profile, dict)
-                else {}
-            )
 
-        llm_messages = build_messages(SYSTEM_PROMPT, payload.message)
         try:
-            raw_extracted = await run_in_threadpool(call_llm, "extract", llm_messages)
+            raw_extracted = await self._extract(payload.message, payload.user_id)
+        except AdmissionRejected as exc:
+            raise AIProfileExtractServiceError(
+                429,
+                "Profile extraction is busy. Retry later.",
+            ) from exc
         except Exception:
             logger.exception("Unexpected extraction failure for user %s", payload.user_id)
             raw_extracted = dict(SAFE_PROFILE_FALLBACK)
 
         extracted_profile = normalize_extracted_profile(raw_extracted)
-        merged_profile = merge_profile_data(existing_profile, extracted_profile)
 
-        if self.pool is not None:
-            try:
-                async with self.pool.acquire() as connection:
-                    async with connection.transaction():
-                        await upsert_user_ai_profile(connection, payload.user_id, merged_profile)
-            except asyncpg.PostgresError as exc:
-                logger.exception("Database error while saving AI profile for user %s", payload.user_id)
-                raise AIProfileExtractServiceError(
-                    503,
-                    "Database unavailable while saving the extracted profile.",
-                ) from exc
+        if self.pool is None:
+            existing_profile = (
+                payload.existing_profile
+                if isinstance(payload.existing_profile, dict)
+                else {}
+            )
+            merged_profile = merge_profile_data(existing_profile, extracted_profile)
+        elif self.updates is not None:
+            # Load, merge and queue under a per-user lock so concurrent turns
+            # for one user never merge against the same stale snapshot.
+            async with self.updates.user_lock(payload.user_id):
+                existing_profile = await self._load_profile(payload.user_id)
+                pending_profile = self.updates.pending_profile(payload.user_id)
+                if pending_profile is not None:
+                    existing_profile = {**existing_profile, **pending_profile}
+                merged_profile = merge_profile_data(existing_profile, extracted_profile)
+                self.updates.submit(
+                    payload.user_id,
+                    compute_profile_delta(existing_profile, merged_profile),
+                    merged_profile,
+                )
+        else:
+            existing_profile = await self._load_profile(payload.user_id)
+            merged_profile = merge_profile_data(existing_profile, extracted_profile)
+            delta = compute_profile_delta(existing_profile, merged_profile)
+            if delta:
+                try:
+                    async with self.pool.acquire() as connection:
+                        await merge_user_ai_profile_fields(connection, payload.user_id, delta)
+                except asyncpg.PostgresError as exc:
+                    logger.exception("Database error while saving AI profile for user %s", payload.user_id)
+                    raise AIProfileExtractServiceError(
+                        503,
+                        "Database unavailable while saving the extracted profile.",
+                    ) from exc
 
         logger.info(
             "Profile extraction result for user %s: extracted=%s merged=%s confidence=%.4f",
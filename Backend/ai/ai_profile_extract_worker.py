@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any
+
+from ai_profile_extract_models import AIProfileExtractRequest
+from ai_profile_extract_service import AIProfileExtractService, AIProfileExtractServiceError
+from services.env import env_int
+
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED_USERS = 1000
+
+
+@dataclass(slots=True)
+class _QueuedExtraction:
+    user_id: str
+    message: str
+    existing_profile: dict[str, Any]
+    enqueued_at: float
+
+
+class BackgroundProfileExtractor:
+    """Runs profile extraction for chat messages after the reply is sent.
+
+    The queue is bounded; when it is full the oldest queued message is
+    dropped so the newest turns are always extracted. Lag is the time from
+    enqueue to the profile write being queued, tracked per user.
+    """
+
+    def __init__(
+        self,
+        extract_service: AIProfileExtractService,
+        *,
+        worker_count: int | None = None,
+        queue_size: int | None = None,
+    ) -> None:
+        self.extract_service = extract_service
+        self.worker_count = max(1, worker_count or env_int("AI_BACKGROUND_EXTRACT_WORKERS", 2))
+        self.queue_size = max(1, queue_size or env_int("AI_BACKGROUND_EXTRACT_QUEUE_SIZE", 100))
+        self._queue: deque[_QueuedExtraction] = deque()
+        self._available = asyncio.Condition()
+        self._workers: list[asyncio.Task[None]] = []
+        self._user_stats: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.dropped = 0
+
+    async def start(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"profile-extract-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+        logger.info("Background profile extraction started workers=%s", self.worker_count)
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def _stats_for(self, user_id: str) -> dict[str, Any]:
+        stats = self._user_stats.get(user_id)
+        if stats is None:
+            stats = {
+                "pending": 0,
+                "processed": 0,
+                "failed": 0,
+                "dropped": 0,
+                "last_lag_seconds": None,
+                "max_lag_seconds": None,
+                "last_completed_at": None,
+            }
+            self._user_stats[user_id] = stats
+            while len(self._user_stats) > MAX_TRACKED_USERS:
+                self._user_stats.popitem(last=False)
+        else:
+            self._user_stats.move_to_end(user_id)
+        return stats
+
+    async def enqueue(self, user_id: str, message: str, existing_profile: dict[str, Any] | None = None) -> None:
+        async with self._available:
+            if len(self._queue) >= self.queue_size:
+                dropped = self._queue.popleft()
+                self.dropped += 1
+                dropped_stats = self._stats_for(dropped.user_id)
+                dropped_stats["pending"] = max(0, dropped_stats["pending"] - 1)
+                dropped_stats["dropped"] += 1
+                logger.warning("Background extraction queue full; dropped oldest message for user %s", dropped.user_id)
+
+            self._queue.append(
+                _QueuedExtraction(
+                    user_id=user_id,
+                    message=message,
+                    existing_profile=dict(existing_profile or {}),
+                    enqueued_at=time.monotonic(),
+                )
+            )
+            self._stats_for(user_id)["pending"] += 1
+            self._available.notify()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            async with self._available:
+                await self._available.wait_for(lambda: bool(self._queue))
+                item = self._queue.popleft()
+
+            failed = False
+            try:
+                await self.extract_service.handle_extract_profile(
+                    AIProfileExtractRequest(
+                        user_id=item.user_id,
+                        message=item.message,
+                        existing_profile=item.existing_profile,
+                    )
+                )
+            except asyncio.CancelledError:
+                raise
+            except AIProfileExtractServiceError as exc:
+                failed = True
+                logger.warning("Background extraction failed for user %s: %s", item.user_id, exc.detail)
+            except Exception:
+                failed = True
+                logger.exception("Background extraction worker %s crashed for user %s", index, item.user_id)
+
+            lag = round(time.monotonic() - item.enqueued_at, 3)
+            stats = self._stats_for(item.user_id)
+            stats["pending"] = max(0, stats["pending"] - 1)
+            stats["failed" if failed else "processed"] += 1
+            stats["last_lag_seconds"] = lag
+            stats["max_lag_seconds"] = max(lag, stats["max_lag_seconds"] or 0.0)
+            stats["last_completed_at"] = time.time()
+
+    def lag_metrics(self, user_id: str | None = None) -> dict[str, Any]:
+        now = time.monotonic()
+        oldest_pending: dict[str, float] = {}
+        for item in self._queue:
+            oldest_pending.setdefault(item.user_id, round(now - item.enqueued_at, 3))
+
+        def describe(uid: str, stats: dict[str, Any]) -> dict[str, Any]:
+            return {**stats, "oldest_pending_seconds": oldest_pending.get(uid)}
+
+        if user_id is not None:
+            stats = self._user_stats.get(user_id)
+            users = {user_id: describe(user_id, stats)} if stats is not None else {}
+        else:
+            users = {uid: describe(uid, stats) for uid, stats in self._user_stats.items()}
+
+        return {
+            "queue_depth": len(self._queue),
+            "queue_size": self.queue_size,
+            "workers": self.worker_count,
+            "dropped": self.dropped,
+            "users": users,
+        }
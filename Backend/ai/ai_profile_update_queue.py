@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from typing import Any
+
+import asyncpg
+
+from ai_chat_repository import merge_user_ai_profile_fields
+from services.env import env_int
+from services.metrics import record_profile_write_failure
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileUpdateQueue:
+    """Coalesces AI-profile writes per user.
+
+    Callers submit only the top-level fields that changed. Fields for the same
+    user are accumulated for ``debounce_seconds`` and then written in one
+    ``profile_json || delta`` statement. Until the write lands, the merged
+    profile is kept in memory so the next extraction for that user merges
+    against the newest state rather than the stale row.
+
+    Writes happen after the request has returned, so a database failure no
+    longer surfaces as a 503 to the caller. A failed write keeps its fields
+    and is retried with exponential backoff (capped at
+    ``max_retry_seconds``); after ``max_attempts`` consecutive failures the
+    fields are dropped, logged and counted in
+    ``ai_profile_write_failures_total``.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool | None,
+        *,
+        debounce_seconds: float | None = None,
+        max_attempts: int | None = None,
+        max_retry_seconds: float | None = None,
+    ) -> None:
+        self.pool = pool
+        self.debounce_seconds = (
+            debounce_seconds
+            if debounce_seconds is not None
+            else max(0, env_int("AI_PROFILE_WRITE_DEBOUNCE_MS", 250)) / 1000.0
+        )
+        self.max_attempts = (
+            max_attempts
+            if max_attempts is not None
+            else max(1, env_int("AI_PROFILE_WRITE_MAX_ATTEMPTS", 5))
+        )
+        self.max_retry_seconds = (
+            max_retry_seconds
+            if max_retry_seconds is not None
+            else max(1, env_int("AI_PROFILE_WRITE_MAX_RETRY_SECONDS", 60))
+        )
+        self._attempts: dict[str, int] = {}
+        self._dirty: dict[str, dict[str, Any]] = {}
+        self._overlay: dict[str, tuple[int, dict[str, Any]]] = {}
+        self._handles: dict[str, asyncio.TimerHandle] = {}
+        self._versions: dict[str, int] = {}
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.coalesced_writes = 0
+        self.skipped_writes = 0
+
+    def user_lock(self, user_id: str) -> asyncio.Lock:
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[user_id] = lock
+        return lock
+
+    def pending_profile(self, user_id: str) -> dict[str, Any] | None:
+        entry = self._overlay.get(user_id)
+        return dict(entry[1]) if entry else None
+
+    def submit(self, user_id: str, delta: dict[str, Any], merged_profile: dict[str, Any]) -> None:
+        if not delta:
+            self.skipped_writes += 1
+            return
+
+        if user_id in self._dirty:
+            self.coalesced_writes += 1
+        self._dirty.setdefault(user_id, {}).update(delta)
+
+        version = self._versions.get(user_id, 0) + 1
+        self._versions[user_id] = version
+        self._overlay[user_id] = (version, dict(merged_profile))
+
+        if self.debounce_seconds <= 0:
+            self._spawn_flush(user_id)
+        elif user_id not in self._handles:
+            loop = asyncio.get_running_loop()
+            self._handles[user_id] = loop.call_later(self.debounce_seconds, self._spawn_flush, user_id)
+
+    def _spawn_flush(self, user_id: str) -> None:
+        handle = self._handles.pop(user_id, None)
+        if handle is not None:
+            handle.cancel()
+
+        task = asyncio.create_task(self.flush(user_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self, user_id: str) -> None:
+        fields = self._dirty.pop(user_id, None)
+        if not fields or self.pool is None:
+            return
+
+        version = self._versions.get(user_id, 0)
+        try:
+            async with self.pool.acquire() as connection:
+                await merge_user_ai_profile_fields(connection, user_id, fields)
+        except Exception:
+            self._write_failed(user_id, fields)
+            return
+
+        self._attempts.pop(user_id, None)
+        entry = self._overlay.get(user_id)
+        if entry is not None and entry[0] == version and user_id not in self._dirty:
+            self._overlay.pop(user_id, None)
+
+    def _write_failed(self, user_id: str, fields: dict[str, Any]) -> None:
+        attempts = self._attempts.get(user_id, 0) + 1
+        if attempts >= self.max_attempts:
+            logger.exception(
+                "Dropping AI profile delta for user %s after %d failed writes: %s",
+                user_id,
+                attempts,
+                sorted(fields),
+            )
+            record_profile_write_failure(dropped=True)
+            self._attempts.pop(user_id, None)
+            if user_id not in self._dirty:
+                self._overlay.pop(user_id, None)
+            return
+
+        delay = min(self.max_retry_seconds, max(self.debounce_seconds, 1.0) * 2 ** (attempts - 1))
+        logger.exception(
+            "Error while saving AI profile delta for user %s (attempt %d); retrying in %.1fs",
+            user_id,
+            attempts,
+            delay,
+        )
+        record_profile_write_failure(dropped=False)
+        self._attempts[user_id] = attempts
+        # Keep the fields (newer ones win) and retry after the backoff.
+        self._dirty[user_id] = {**fields, **self._dirty.get(user_id, {})}
+        handle = self._handles.pop(user_id, None)
+        if handle is not None:
+            handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._handles[user_id] = loop.call_later(delay, self._spawn_flush, user_id)
+
+    async def flush_all(self) -> None:
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for user_id in list(self._dirty):
+            await self.flush(user_id)
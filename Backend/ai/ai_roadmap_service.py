@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 
 from ai_roadmap_models import (
@@ -10,14 +11,13 @@ from ai_roadmap_models import (
     VisualizationDatum,
     VisualizationPayload,
 )
-from ai_skill_gap_service import (
+from ai_skill_gap_service import _build_current_skill_map, _match_requirements
+from services.role_taxonomy import (
     LEVEL_RANK,
     PRIORITY_RANK,
     RoleDefinition,
     SkillRequirement,
-    _build_current_skill_map,
-    _find_matching_skill,
-    _resolve_role_definition,
+    get_role_taxonomy,
 )
 
 
@@ -52,26 +52,6 @@ BUILD_CATEGORIES = {
     "delivery",
 }
 
-ROLE_TOOLS = {
-    "frontend_engineer": ["HTML", "CSS", "TypeScript", "React", "Next.js", "React Query", "Playwright"],
-    "backend_engineer": ["TypeScript", "Express", "FastAPI", "PostgreSQL", "JWT", "Docker", "Pytest"],
-    "full_stack_engineer": ["TypeScript", "React", "Next.js", "Node.js", "PostgreSQL", "Playwright", "Docker"],
-    "mobile_engineer": ["React Native", "Expo", "TypeScript", "REST APIs", "Zustand", "Detox", "EAS"],
-    "devops_engineer": ["Linux", "Docker", "Kubernetes", "Terraform", "GitHub Actions", "Prometheus", "Grafana"],
-    "cloud_engineer": ["AWS", "Azure", "GCP", "Terraform", "Docker", "IAM", "CloudWatch"],
-    "platform_engineer": ["Kubernetes", "Terraform", "GitHub Actions", "Backstage", "Prometheus", "Grafana"],
-    "data_analyst": ["SQL", "Tableau", "Power BI", "Excel", "A/B Testing", "Python"],
-    "data_engineer": ["SQL", "Python", "dbt", "Airflow", "Spark", "BigQuery", "Snowflake"],
-    "data_scientist": ["Python", "SQL", "Pandas", "NumPy", "scikit-learn", "Matplotlib"],
-    "machine_learning_engineer": ["Python", "PyTorch", "TensorFlow", "scikit-learn", "MLflow", "Docker"],
-    "ai_engineer": ["Python", "FastAPI", "OpenAI", "Ollama", "Vector Database", "Prompt Evaluation", "Docker"],
-    "mlops_engineer": ["Python", "Docker", "Kubernetes", "GitHub Actions", "MLflow", "Prometheus"],
-    "cybersecurity_analyst": ["SIEM", "Splunk", "Sentinel", "IAM", "Network Analysis", "Cloud Security"],
-    "qa_automation_engineer": ["Playwright", "Cypress", "Postman", "GitHub Actions", "TypeScript", "Selenium"],
-    "product_manager": ["Product Discovery", "Roadmapping", "Analytics", "SQL", "Mixpanel", "User Research"],
-    "technical_project_manager": ["Roadmaps", "Risk Registers", "Agile Delivery", "Dashboards", "Status Reporting"],
-}
-
 ROADMAP_STAGE_COLORS = ("#2BE6F6", "#3E8CFF", "#6E7BFF")
 
 
@@ -181,12 +161,12 @@ def _build_visualization(role: RoleDefinition, stages: list[RoadmapStage]) -> Vi
 
 def _group_requirements(
     role: RoleDefinition,
-    current_skill_map: dict[str, dict[str, str]],
+    matches: dict[SkillRequirement, dict[str, str] | None],
 ) -> list[RoadmapStage]:
     grouped: dict[int, list[tuple[SkillRequirement, dict[str, str] | None]]] = {0: [], 1: [], 2: []}
 
     for requirement in sorted(role.requirements, key=_requirement_sort_key):
-        grouped[_stage_index(requirement)].append((requirement, _find_matching_skill(current_skill_map, requirement)))
+        grouped[_stage_index(requirement)].append((requirement, matches.get(requirement)))
 
     stage_titles = ("Foundations", "Build & Ship", "Advanced & Production")
     stages: list[RoadmapStage] = []
@@ -210,7 +190,7 @@ class AIRoadmapService:
         self,
         payload: AIRoadmapGenerateRequest,
     ) -> AIRoadmapGenerateResponse:
-        role = _resolve_role_definition(payload.role)
+        role = get_role_taxonomy().resolve(payload.role)
         if role is None:
             raise AIRoadmapServiceError(
                 422,
@@ -220,12 +200,13 @@ class AIRoadmapService:
         profile = payload.user_profile if isinstance(payload.user_profile, dict) else {}
         current_skill_map, _, _ = _build_current_skill_map(profile)
         sorted_requirements = sorted(role.requirements, key=_requirement_sort_key)
-        stages = _group_requirements(role, current_skill_map)
+        matches = await asyncio.to_thread(_match_requirements, current_skill_map, role.requirements)
+        stages = _group_requirements(role, matches)
 
         return AIRoadmapGenerateResponse(
             role=role.display_name,
             stages=stages,
-            tools=ROLE_TOOLS.get(role.key, [requirement.name for requirement in sorted_requirements[:7]]),
+            tools=list(role.tools) or [requirement.name for requirement in sorted_requirements[:7]],
             final_projects=_build_final_projects(role, sorted_requirements),
             visualization=_build_visualization(role, stages),
         )
@@ -63,6 +63,7 @@ class SkillGapAnalysisMeta(BaseModel):
     explicit_skill_count: int = 0
     ai_skill_count: int = 0
     source: str = "role_taxonomy"
+    taxonomy_version: str | None = None
 
 
 class AISkillGapAnalysisResponse(BaseModel):
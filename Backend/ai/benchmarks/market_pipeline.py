@@ -0,0 +1,304 @@
+"""Offline benchmark for the market-intelligence pipeline.
+
+Runs search -> scrape -> parse -> normalize (-> store) against recorded HTML
+fixtures served by a local stub server, and reports per-stage wall time,
+docs/sec, peak RSS and tracemalloc allocations.
+
+Usage (from Backend/ai):
+
+    python -m benchmarks.market_pipeline
+    python -m benchmarks.market_pipeline --copies 50 --iterations 7 --output bench.json
+    python -m benchmarks.market_pipeline --baseline bench.json --max-regression 0.25
+    python -m benchmarks.market_pipeline --with-storage   # needs DATABASE_URL
+    python -m benchmarks.market_pipeline --record URL=fixture.html ...
+
+Timings come from runs without tracemalloc; allocations are measured in one
+extra traced run so tracing overhead does not skew the timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from benchmarks.stub_server import FixtureServer
+
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "market"
+DEFAULT_ROLE = "Machine Learning Engineer"
+STAGES = ("search", "scrape", "parse", "normalize", "store")
+
+# Search must stay offline; these keys switch on the live Bing/Google lookups.
+SEARCH_API_ENV_VARS = ("BING_SEARCH_API_KEY", "GOOGLE_API_KEY", "GOOGLE_CSE_ID")
+
+
+@dataclass(slots=True)
+class StageResult:
+    name: str
+    items: int = 0
+    wall_seconds: list[float] = field(default_factory=list)
+    peak_rss_mb: float | None = None
+    alloc_peak_kb: float | None = None
+    alloc_blocks: int | None = None
+    skipped: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        median = statistics.median(self.wall_seconds) if self.wall_seconds else None
+        return {
+            "items": self.items,
+            "iterations": len(self.wall_seconds),
+            "median_seconds": round(median, 6) if median is not None else None,
+            "min_seconds": round(min(self.wall_seconds), 6) if self.wall_seconds else None,
+            "docs_per_second": round(self.items / median, 2) if median else None,
+            "peak_rss_mb": self.peak_rss_mb,
+            "alloc_peak_kb": self.alloc_peak_kb,
+            "alloc_blocks": self.alloc_blocks,
+            "skipped": self.skipped,
+        }
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def _build_stages(role: str, server: FixtureServer, copies: int, with_storage: bool) -> list[tuple[str, Callable[[Any], Any]]]:
+    from market_intelligence_service import (
+        SearchDocument,
+        normalize_market_data,
+        parse_market_documents,
+        save_trends,
+        scrape_urls,
+        search_market_sources,
+    )
+
+    fixtures = sorted(path.name for path in FIXTURE_DIR.glob("*.html"))
+
+    def search(_: Any) -> list[Any]:
+        results = list(search_market_sources(role, limit=20))
+        # Point every hit at a recorded page so scraping never leaves the host.
+        return [
+            SearchDocument(
+                title=result.title,
+                url=server.url_for(fixtures[index % len(fixtures)], copy=copy),
+                source=result.source,
+            )
+            for copy in range(copies)
+            for index, result in enumerate(results)
+        ]
+
+    def scrape(search_results: list[Any]) -> list[Any]:
+        return list(scrape_urls(search_results))
+
+    def parse(documents: list[Any]) -> list[Any]:
+        return list(parse_market_documents(documents))
+
+    def normalize(signals: list[Any]) -> list[Any]:
+        return list(normalize_market_data(signals))
+
+    def store(records: list[Any]) -> int:
+        return save_trends(f"benchmark {role}", records)
+
+    stages: list[tuple[str, Callable[[Any], Any]]] = [
+        ("search", search),
+        ("scrape", scrape),
+        ("parse", parse),
+        ("normalize", normalize),
+    ]
+    if with_storage:
+        stages.append(("store", store))
+    return stages
+
+
+def _count(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    return len(value) if value is not None else 0
+
+
+def run_benchmark(
+    *,
+    role: str = DEFAULT_ROLE,
+    copies: int = 10,
+    iterations: int = 5,
+    latency_ms: int = 0,
+    with_storage: bool = False,
+    trace_allocations: bool = True,
+) -> dict[str, Any]:
+    for name in SEARCH_API_ENV_VARS:
+        os.environ.pop(name, None)
+    # semantic normalisation with the local embedder: offline and deterministic
+    os.environ.setdefault("AI_EMBEDDING_BACKEND", "hashing")
+    os.environ.setdefault("AI_EMBEDDING_CACHE_PATH", "")
+
+    results = {name: StageResult(name=name) for name in STAGES}
+    if not with_storage:
+        results["store"].skipped = True
+
+    with FixtureServer(FIXTURE_DIR, latency_ms=latency_ms) as server:
+        stages = _build_stages(role, server, copies, with_storage)
+
+        for _ in range(iterations):
+            value: Any = None
+            for name, stage in stages:
+                input_items = _count(value)
+                started = time.perf_counter()
+                value = stage(value)
+                results[name].wall_seconds.append(time.perf_counter() - started)
+                # Throughput is measured on what the stage consumed, except
+                # search which has no input.
+                results[name].items = _count(value) if name == "search" else input_items
+                results[name].peak_rss_mb = _peak_rss_mb()
+
+        if trace_allocations:
+            tracemalloc.start()
+            try:
+                value = None
+                for name, stage in stages:
+                    before = tracemalloc.take_snapshot()
+                    tracemalloc.reset_peak()
+                    baseline_current, _ = tracemalloc.get_traced_memory()
+                    value = stage(value)
+                    _, peak = tracemalloc.get_traced_memory()
+                    after = tracemalloc.take_snapshot()
+                    results[name].alloc_peak_kb = round((peak - baseline_current) / 1024, 1)
+                    results[name].alloc_blocks = sum(
+                        max(0, stat.count_diff) for stat in after.compare_to(before, "filename")
+                    )
+            finally:
+                tracemalloc.stop()
+
+        requests_served = server.requests_served
+
+    return {
+        "role": role,
+        "copies": copies,
+        "iterations": iterations,
+        "latency_ms": latency_ms,
+        "fixtures": sorted(path.name for path in FIXTURE_DIR.glob("*.html")),
+        "requests_served": requests_served,
+        "python": sys.version.split()[0],
+        "stages": {name: result.to_dict() for name, result in results.items()},
+    }
+
+
+def compare_with_baseline(report: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    regressions: list[str] = []
+    for name, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(name, {})
+        current_seconds = current.get("median_seconds")
+        previous_seconds = previous.get("median_seconds")
+        if not current_seconds or not previous_seconds:
+            current["baseline_delta"] = None
+            continue
+
+        # Compare per-document cost so runs with different --copies stay comparable.
+        current_cost = current_seconds / max(1, current["items"])
+        previous_cost = previous_seconds / max(1, previous.get("items") or 1)
+        delta = (current_cost - previous_cost) / previous_cost
+        current["baseline_delta"] = round(delta, 4)
+        if delta > max_regression:
+            regressions.append(f"{name}: {delta:+.1%} per document (limit {max_regression:+.0%})")
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    header = f"{'stage':<10} {'items':>7} {'median s':>10} {'docs/s':>10} {'rss MB':>8} {'alloc KB':>10} {'blocks':>8} {'vs base':>8}"
+    lines = [
+        f"market pipeline benchmark role={report['role']!r} copies={report['copies']} iterations={report['iterations']}",
+        header,
+        "-" * len(header),
+    ]
+    for name, stage in report["stages"].items():
+        if stage["skipped"]:
+            lines.append(f"{name:<10} {'skipped (use --with-storage)':>40}")
+            continue
+        delta = stage.get("baseline_delta")
+        lines.append(
+            f"{name:<10} {stage['items']:>7} {stage['median_seconds'] or 0:>10.4f} "
+            f"{stage['docs_per_second'] or 0:>10.1f} {stage['peak_rss_mb'] or 0:>8.1f} "
+            f"{stage['alloc_peak_kb'] or 0:>10.1f} {stage['alloc_blocks'] or 0:>8} "
+            f"{'' if delta is None else f'{delta:+.1%}':>8}"
+        )
+    return "\n".join(lines)
+
+
+def record_fixtures(pairs: list[str]) -> None:
+    """Fetch live pages once and store them as fixtures (URL=name.html)."""
+
+    from market_intelligence_service import fetch_page
+
+    for pair in pairs:
+        url, separator, name = pair.partition("=")
+        if not separator or not name.endswith(".html"):
+            raise SystemExit(f"--record expects URL=name.html, got {pair!r}")
+        html = fetch_page(url)
+        if not html:
+            raise SystemExit(f"Could not fetch {url}")
+        (FIXTURE_DIR / name).write_text(html, encoding="utf-8")
+        print(f"recorded {url} -> {name} ({len(html)} chars)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--role", default=DEFAULT_ROLE)
+    parser.add_argument("--copies", type=int, default=10, help="times each search hit is repeated")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency-ms", type=int, default=0, help="artificial per-request stub latency")
+    parser.add_argument("--with-storage", action="store_true", help="include save_trends (needs Postgres)")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed per-document slowdown")
+    parser.add_argument("--record", nargs="+", metavar="URL=NAME.html", help="refresh fixtures from live pages")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures(args.record)
+        return 0
+
+    report = run_benchmark(
+        role=args.role,
+        copies=max(1, args.copies),
+        iterations=max(1, args.iterations),
+        latency_ms=args.latency_ms,
+        with_storage=args.with_storage,
+        trace_allocations=not args.no_alloc,
+    )
+
+    regressions: list[str] = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(report, baseline, args.max_regression)
+
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
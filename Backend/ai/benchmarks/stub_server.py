@@ -0,0 +1,79 @@
+"""Local HTTP server that replays recorded HTML fixtures.
+
+Any path whose last segment matches a file in the fixture directory is served
+from disk, so query strings and prefixes can be used to make URLs unique.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+
+class FixtureServer:
+    def __init__(self, fixture_dir: Path, *, latency_ms: int = 0) -> None:
+        self.fixture_dir = fixture_dir
+        self.latency_seconds = max(0, latency_ms) / 1000.0
+        self.requests_served = 0
+        self._pages = {path.name: path.read_bytes() for path in fixture_dir.glob("*.html")}
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("FixtureServer is not running.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, fixture_name: str, *, copy: int = 0) -> str:
+        return f"{self.base_url}/{fixture_name}?copy={copy}"
+
+    def start(self) -> "FixtureServer":
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                name = urlparse(self.path).path.rsplit("/", 1)[-1]
+                body = owner._pages.get(name)
+                if owner.latency_seconds:
+                    time.sleep(owner.latency_seconds)
+
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                owner.requests_served += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
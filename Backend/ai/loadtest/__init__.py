@@ -0,0 +1 @@
+"""Load-testing kit: a fake Ollama server and a scenario runner for the AI app."""
@@ -0,0 +1,322 @@
+"""Fake Ollama server for load tests.
+
+Speaks both the OpenAI-compatible API (``/v1/chat/completions``,
+``/v1/models``) and the native API (``/api/chat``, ``/api/generate``), with
+streaming and non-streaming replies. Replies are canned but shaped like what
+each caller parses: profile JSON for extraction, the two job-description
+sections for ``/generate-job-description``, plain text for chat.
+
+It also serves static stand-ins for the three pages ``scraper.py`` reads
+(``/scrape/bls``, ``/scrape/hiring-lab``, ``/scrape/nace``). Point
+``AI_SCRAPER_BLS_URL``, ``AI_SCRAPER_HIRING_LAB_URL`` and
+``AI_SCRAPER_NACE_URL`` at them so job-description runs never reach the
+live web.
+
+Model behaviour is configurable:
+
+* ``--first-token-ms`` / ``--token-ms``: prompt-processing delay and per-token latency
+* ``--tokens``: reply length used for plain-text replies
+* ``--parallel``: generations served at once (like ``OLLAMA_NUM_PARALLEL``);
+  extra requests queue, which caps throughput
+* ``--error-rate`` / ``--timeout-rate``: share of requests answered with 500,
+  or held until the client gives up
+
+Run from Backend/ai:
+
+    python -m loadtest.fake_ollama --port 11500 --token-ms 15 --parallel 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+
+
+@dataclass(slots=True)
+class FakeModelConfig:
+    first_token_ms: float = 150.0
+    token_ms: float = 20.0
+    tokens: int = 120
+    parallel: int = 2
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang_seconds: float = 600.0
+    seed: int | None = None
+
+
+PROFILE_REPLY = {
+    "skills": [
+        {"name": "Python", "level": "intermediate"},
+        {"name": "SQL", "level": "beginner"},
+    ],
+    "goals": ["become a data engineer"],
+    "experience_years": 2,
+    "education": ["BSc Computer Science"],
+    "interests": ["data pipelines"],
+    "confidence": 0.82,
+}
+
+JOB_BLOCKS_REPLY = {
+    "job_without_ai": {
+        "title": "Software Engineer",
+        "description": "Designs, builds and maintains backend services.",
+        "tasks": [
+            {"task": "Write and review application code", "time_estimate": "16 h/week"},
+            {"task": "Investigate and fix production issues", "time_estimate": "8 h/week"},
+            {"task": "Write technical documentation", "time_estimate": "4 h/week"},
+            {"task": "Plan work with product and design", "time_estimate": "4 h/week"},
+        ],
+    },
+    "job_with_ai": {
+        "title": "Software Engineer - AI-Augmented",
+        "description": "Uses AI assistants to accelerate delivery while owning quality.",
+        "tasks": [
+            {"task": "Write and review code with an AI pair programmer", "time_estimate": "11 h/week"},
+            {"task": "Triage incidents with AI log summarisation", "time_estimate": "5 h/week"},
+            {"task": "Draft documentation with AI and edit for accuracy", "time_estimate": "2 h/week"},
+            {"task": "Plan work with product and design", "time_estimate": "4 h/week"},
+        ],
+    },
+}
+
+JOB_ANALYSIS_REPLY = {
+    "skill_gaps": ["Prompt engineering", "AI code review", "Evaluation design", "Data privacy"],
+    "work_responsibility_transformations": ["Less boilerplate", "More review", "More system design", "More testing"],
+    "ai_integration_recommendations": ["Adopt an AI pair programmer", "Add AI log triage", "Automate docs", "Set review rules"],
+    "workforce_development_strategies": ["Internal workshops", "Pairing rotations", "Guild meetings", "Certification budget"],
+    "workforce_sustainability_impact": ["Lower toil", "Faster onboarding", "Better focus", "Reduced burnout"],
+    "practical_advice_for_teams": ["Start small", "Measure outcomes", "Keep humans in review", "Share prompts"],
+}
+
+SCRAPE_PAGES = {
+    # Same markup each scraper.py parser looks for: the first <table> for BLS,
+    # <article> blocks with a link and a paragraph for Hiring Lab and NACE.
+    "bls": """<html><body><table>
+<tr><th>Occupation</th><th>Entry-level education</th><th>Median pay</th><th>Outlook</th></tr>
+<tr><td><a href="/ooh/software-developers.htm">Software Developers</a></td><td>Bachelor's degree</td><td>$132,270 per year</td><td>17%</td></tr>
+<tr><td><a href="/ooh/data-scientists.htm">Data Scientists</a></td><td>Bachelor's degree</td><td>$108,020 per year</td><td>36%</td></tr>
+<tr><td><a href="/ooh/database-administrators.htm">Database Administrators and Architects</a></td><td>Bachelor's degree</td><td>$117,450 per year</td><td>9%</td></tr>
+</table></body></html>""",
+    "hiring-lab": """<html><body>
+<article><a href="/fr/2024/demand-for-ai-skills/">Demand for AI skills keeps rising</a><p>Postings that mention Python, SQL and cloud skills grew again this quarter.</p></article>
+<article><a href="/fr/2024/tech-hiring/">Tech hiring stabilises</a><p>Backend and data engineering roles recovered fastest.</p></article>
+<article><a href="/fr/2024/remote-work/">Remote work in tech</a><p>DevOps and security roles remain the most remote-friendly.</p></article>
+</body></html>""",
+    "nace": """<html><body>
+<article><a href="/job-market/trends-and-predictions/skills-employers-want/">Skills employers want</a><p>Problem solving, teamwork and communication lead the list.</p><span class="date">2024-03-01</span></article>
+<article><a href="/job-market/trends-and-predictions/hiring-projections/">Hiring projections</a><p>Employers plan to hire more computer science graduates.</p><span class="date">2024-02-12</span></article>
+<article><a href="/job-market/trends-and-predictions/internships/">Internship trends</a><p>Paid internships convert to offers more often.</p><span class="date">2024-01-20</span></article>
+</body></html>""",
+}
+
+FILLER_WORDS = (
+    "Focus on one portfolio project this week, ship it, then write a short summary of what you learned "
+    "and which skills it demonstrates for your target role."
+).split()
+
+
+def _system_text(messages: list[dict[str, Any]]) -> str:
+    return "\n".join(str(message.get("content") or "") for message in messages if message.get("role") == "system")
+
+
+def _all_text(messages: list[dict[str, Any]]) -> str:
+    return "\n".join(str(message.get("content") or "") for message in messages)
+
+
+def build_reply(messages: list[dict[str, Any]], *, tokens: int) -> str:
+    system = _system_text(messages)
+    text = _all_text(messages)
+
+    batch = re.search(r"JSON array with exactly (\d+) objects", text)
+    if batch:
+        return json.dumps([PROFILE_REPLY] * int(batch.group(1)))
+    if '"confidence"' in system or "extract structured career information" in system:
+        return json.dumps(PROFILE_REPLY)
+    if "job_without_ai" in system:
+        return json.dumps(JOB_BLOCKS_REPLY)
+    if "job_with_ai" in system:
+        return json.dumps({"job_with_ai": JOB_BLOCKS_REPLY["job_with_ai"]})
+    if "skill_gaps" in system:
+        return json.dumps(JOB_ANALYSIS_REPLY)
+
+    return " ".join(FILLER_WORDS[index % len(FILLER_WORDS)] for index in range(max(1, tokens)))
+
+
+def _split_tokens(reply: str) -> list[str]:
+    # Rough word-piece split; each piece is streamed as one token.
+    return re.findall(r"\S+\s*|\s+", reply) or [reply]
+
+
+def create_app(config: FakeModelConfig) -> FastAPI:
+    app = FastAPI(title="Fake Ollama")
+    slots = asyncio.Semaphore(max(1, config.parallel))
+    rng = random.Random(config.seed)
+    stats = {"requests": 0, "errors": 0, "timeouts": 0, "in_flight": 0, "queued": 0}
+
+    async def generate(messages: list[dict[str, Any]]) -> AsyncIterator[str]:
+        reply = build_reply(messages, tokens=config.tokens)
+        await asyncio.sleep(config.first_token_ms / 1000.0)
+        for piece in _split_tokens(reply):
+            await asyncio.sleep(config.token_ms / 1000.0)
+            yield piece
+
+    async def admit() -> JSONResponse | None:
+        stats["requests"] += 1
+        roll = rng.random()
+        if roll < config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=500, content={"error": "injected failure"})
+        if roll < config.error_rate + config.timeout_rate:
+            stats["timeouts"] += 1
+            await asyncio.sleep(config.hang_seconds)
+            return JSONResponse(status_code=504, content={"error": "injected timeout"})
+        return None
+
+    async def run_locked(
+        messages: list[dict[str, Any]],
+        stream: bool,
+        render,
+        media_type: str = "application/x-ndjson",
+    ) -> Any:
+        stats["queued"] += 1
+        await slots.acquire()
+        stats["queued"] -= 1
+        stats["in_flight"] += 1
+
+        async def release() -> None:
+            stats["in_flight"] -= 1
+            slots.release()
+
+        if not stream:
+            try:
+                pieces = [piece async for piece in generate(messages)]
+            finally:
+                await release()
+            return JSONResponse(render("".join(pieces), done=True, full=True))
+
+        async def body() -> AsyncIterator[str]:
+            try:
+                async for piece in generate(messages):
+                    yield render(piece, done=False, full=False)
+                yield render("", done=True, full=False)
+            finally:
+                await release()
+
+        return StreamingResponse(body(), media_type=media_type)
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        payload = await request.json()
+        failure = await admit()
+        if failure is not None:
+            return failure
+
+        model = payload.get("model", "fake")
+        created = int(time.time())
+
+        def render(text: str, *, done: bool, full: bool):
+            if full:
+                return {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                }
+            if done:
+                return "data: [DONE]\n\n"
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        return await run_locked(
+            payload.get("messages") or [],
+            bool(payload.get("stream")),
+            render,
+            media_type="text/event-stream",
+        )
+
+    @app.post("/api/chat")
+    async def native_chat(request: Request):
+        payload = await request.json()
+        failure = await admit()
+        if failure is not None:
+            return failure
+
+        model = payload.get("model", "fake")
+        stream = payload.get("stream", True)
+
+        def render(text: str, *, done: bool, full: bool):
+            body = {"model": model, "message": {"role": "assistant", "content": text}, "done": done}
+            return body if full else json.dumps(body) + "\n"
+
+        return await run_locked(payload.get("messages") or [], bool(stream), render)
+
+    @app.post("/api/generate")
+    async def native_generate(request: Request):
+        payload = await request.json()
+        # Keep-alive pings send no prompt; answer them immediately.
+        return {"model": payload.get("model", "fake"), "response": "", "done": True}
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model"}]}
+
+    @app.get("/scrape/{source}")
+    async def scrape_page(source: str):
+        page = SCRAPE_PAGES.get(source)
+        if page is None:
+            return JSONResponse(status_code=404, content={"error": f"no stub page for {source}"})
+        return HTMLResponse(page)
+
+    @app.get("/stats")
+    async def get_stats():
+        return dict(stats)
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--first-token-ms", type=float, default=150.0)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--tokens", type=int, default=120)
+    parser.add_argument("--parallel", type=int, default=2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=600.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    config = FakeModelConfig(
+        first_token_ms=args.first_token_ms,
+        token_ms=args.token_ms,
+        tokens=args.tokens,
+        parallel=args.parallel,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Closed-loop load runner for the AI FastAPI app.
+
+Each of ``--concurrency`` virtual users sends one request at a time, chosen
+by the scenario, until ``--duration`` seconds or ``--requests`` requests have
+been issued. Latency percentiles, requests/sec and status counts are
+reported per endpoint.
+
+Against an already running app:
+
+    python -m loadtest.run --base-url http://127.0.0.1:8000 --scenario mixed --concurrency 16 --duration 60
+
+Or let the runner start the fake Ollama server and the app itself:
+
+    python -m loadtest.run --spawn --scenario chat --concurrency 8 --duration 30 --token-ms 15 --parallel 2
+
+``--spawn`` starts ``loadtest.fake_ollama`` and ``backend:app`` with
+``AI_REQUIRE_AUTH=false``, ``OLLAMA_URL`` pointed at the fake and the
+``AI_SCRAPER_*_URL`` variables pointed at its stub pages, so the job scenario
+never scrapes the live web. Any flag after ``--`` is forwarded to the fake
+server unchanged.
+
+``/ai/chat`` and ``/ai/extract-profile`` answer 404 for users missing from the
+database, before any model work. When the app has a database, pass ids of
+existing users with ``--user-ids`` or ``--user-ids-file``; the generated ids
+only suit an app running without one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import httpx
+
+from loadtest.scenarios import SCENARIOS, make_user_ids
+
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(sorted_values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter[str]] = defaultdict(Counter)
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def record(self, endpoint: str, status: str, seconds: float) -> None:
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+    def summary(self) -> dict[str, Any]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints: dict[str, Any] = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            ok = sum(count for status, count in self.statuses[endpoint].items() if status.startswith("2"))
+            endpoints[endpoint] = {
+                "requests": len(ordered),
+                "ok": ok,
+                "rps": round(len(ordered) / elapsed, 2) if elapsed else None,
+                "p50_ms": _ms(percentile(ordered, 50)),
+                "p95_ms": _ms(percentile(ordered, 95)),
+                "p99_ms": _ms(percentile(ordered, 99)),
+                "max_ms": _ms(ordered[-1] if ordered else None),
+                "statuses": dict(self.statuses[endpoint]),
+            }
+
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "total_requests": total,
+            "total_rps": round(total / elapsed, 2) if elapsed else None,
+            "endpoints": endpoints,
+        }
+
+
+def _ms(value: float | None) -> float | None:
+    return round(value * 1000.0, 1) if value is not None else None
+
+
+async def run_load(
+    *,
+    base_url: str,
+    scenario_name: str,
+    concurrency: int,
+    duration: float | None,
+    max_requests: int | None,
+    timeout: float,
+    token: str | None,
+    users: int,
+    seed: int | None,
+    user_ids: list[str] | None = None,
+) -> dict[str, Any]:
+    scenario = SCENARIOS[scenario_name]
+    user_ids = user_ids or make_user_ids(users, seed)
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration if duration else None
+    issued = 0
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    def should_continue() -> bool:
+        nonlocal issued
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if max_requests is not None and issued >= max_requests:
+            return False
+        issued += 1
+        return True
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        headers=headers,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    ) as client:
+
+        async def virtual_user(index: int) -> None:
+            rng = random.Random(None if seed is None else seed + index)
+            while should_continue():
+                spec = scenario.build(rng, user_ids)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(spec.method, spec.path, json=spec.json, params=spec.params)
+                    status = str(response.status_code)
+                except httpx.TimeoutException:
+                    status = "timeout"
+                except httpx.HTTPError as exc:
+                    status = type(exc).__name__
+                recorder.record(spec.endpoint, status, time.perf_counter() - started)
+
+        await asyncio.gather(*(virtual_user(index) for index in range(max(1, concurrency))))
+
+    recorder.finished = time.perf_counter()
+    report = recorder.summary()
+    report.update({"scenario": scenario_name, "concurrency": concurrency, "base_url": base_url})
+    return report
+
+
+def format_report(report: dict[str, Any]) -> str:
+    header = f"{'endpoint':<28} {'reqs':>6} {'ok':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses"
+    lines = [
+        f"scenario={report['scenario']} concurrency={report['concurrency']} "
+        f"elapsed={report['elapsed_seconds']}s total_rps={report['total_rps']}",
+        header,
+        "-" * len(header),
+    ]
+    for endpoint, stats in report["endpoints"].items():
+        lines.append(
+            f"{endpoint:<28} {stats['requests']:>6} {stats['ok']:>6} {stats['rps'] or 0:>8.2f} "
+            f"{stats['p50_ms'] or 0:>9.1f} {stats['p95_ms'] or 0:>9.1f} {stats['p99_ms'] or 0:>9.1f}  "
+            f"{json.dumps(stats['statuses'])}"
+        )
+    return "\n".join(lines)
+
+
+def read_user_ids(values: list[str], path: Path | None) -> list[str]:
+    """Collect ids from comma-separated ``--user-ids`` values and a one-per-line file."""
+
+    user_ids = [item.strip() for value in values for item in value.split(",") if item.strip()]
+    if path is not None:
+        for line in path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                user_ids.append(line)
+    return list(dict.fromkeys(user_ids))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+@contextmanager
+def spawn_stack(fake_args: list[str], app_env: dict[str, str]) -> Iterator[str]:
+    fake_port = _free_port()
+    app_port = _free_port()
+    processes: list[subprocess.Popen[bytes]] = []
+    try:
+        processes.append(
+            subprocess.Popen(
+                [sys.executable, "-m", "loadtest.fake_ollama", "--port", str(fake_port), *fake_args],
+                cwd=APP_DIR,
+            )
+        )
+        _wait_until_up(f"http://127.0.0.1:{fake_port}/v1/models")
+
+        fake_url = f"http://127.0.0.1:{fake_port}"
+        env = {
+            **os.environ,
+            "AI_REQUIRE_AUTH": "false",
+            "AI_RELOAD": "false",
+            "OLLAMA_URL": f"{fake_url}/v1",
+            "AI_SCRAPER_BLS_URL": f"{fake_url}/scrape/bls",
+            "AI_SCRAPER_HIRING_LAB_URL": f"{fake_url}/scrape/hiring-lab",
+            "AI_SCRAPER_NACE_URL": f"{fake_url}/scrape/nace",
+            "AI_MODEL_KEEPALIVE_INTERVAL_SECONDS": "0",
+            **app_env,
+        }
+        processes.append(
+            subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend:app", "--port", str(app_port), "--log-level", "warning"],
+                cwd=APP_DIR,
+                env=env,
+            )
+        )
+        _wait_until_up(f"http://127.0.0.1:{app_port}/health")
+        yield f"http://127.0.0.1:{app_port}"
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    fake_args: list[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, fake_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds; 0 means use --requests only")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--token", default=os.getenv("AI_SERVICE_TOKEN"))
+    parser.add_argument("--users", type=int, default=50, help="distinct user ids to generate when none are given")
+    parser.add_argument(
+        "--user-ids",
+        action="append",
+        default=[],
+        help="comma-separated ids of existing users; repeatable",
+    )
+    parser.add_argument("--user-ids-file", type=Path, help="file with one existing user id per line")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--spawn", action="store_true", help="start the fake Ollama server and the app")
+    parser.add_argument("--token-ms", type=float, help="shortcut for the fake server's --token-ms")
+    parser.add_argument("--parallel", type=int, help="shortcut for the fake server's --parallel")
+    parser.add_argument("--error-rate", type=float, help="shortcut for the fake server's --error-rate")
+    args = parser.parse_args(argv)
+
+    for flag, value in (("--token-ms", args.token_ms), ("--parallel", args.parallel), ("--error-rate", args.error_rate)):
+        if value is not None:
+            fake_args += [flag, str(value)]
+
+    load_kwargs = {
+        "scenario_name": args.scenario,
+        "concurrency": max(1, args.concurrency),
+        "duration": args.duration or None,
+        "max_requests": args.requests,
+        "timeout": args.timeout,
+        "token": args.token,
+        "users": args.users,
+        "seed": args.seed,
+        "user_ids": read_user_ids(args.user_ids, args.user_ids_file),
+    }
+    if args.duration <= 0 and args.requests is None:
+        parser.error("set --duration or --requests")
+    if (args.user_ids or args.user_ids_file) and not load_kwargs["user_ids"]:
+        parser.error("--user-ids/--user-ids-file gave no ids")
+    if not load_kwargs["user_ids"] and args.scenario in {"chat", "extract", "mixed"}:
+        print(
+            "note: using generated user ids; a database-backed app answers 404 for them, "
+            "pass --user-ids or --user-ids-file",
+            file=sys.stderr,
+        )
+    if not args.spawn and args.scenario in {"job", "mixed"}:
+        print(
+            "note: job-description requests scrape whatever AI_SCRAPER_*_URL the app was started with; "
+            "point them at loadtest.fake_ollama's /scrape/* pages to keep the live web out of the run",
+            file=sys.stderr,
+        )
+
+    if args.spawn:
+        with spawn_stack(fake_args, {}) as base_url:
+            report = asyncio.run(run_load(base_url=base_url, **load_kwargs))
+    else:
+        report = asyncio.run(run_load(base_url=args.base_url, **load_kwargs))
+
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
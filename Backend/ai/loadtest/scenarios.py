@@ -0,0 +1,112 @@
+"""Scripted request mixes for the load runner."""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import quote
+
+
+ROLES = (
+    "Data Engineer",
+    "Backend Developer",
+    "Machine Learning Engineer",
+    "DevOps Engineer",
+    "Frontend Developer",
+)
+
+CHAT_MESSAGES = (
+    "I know Python and some SQL. What should I learn next to become a data engineer?",
+    "How do I prepare for a backend developer interview in three weeks?",
+    "I want to become a machine learning engineer, where do I start?",
+    "Which cloud certification is most useful for a DevOps role?",
+    "Can you review my plan: learn Docker, then Kubernetes, then Terraform?",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RequestSpec:
+    endpoint: str
+    method: str
+    path: str
+    json: dict[str, Any] | None = None
+    params: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    description: str
+    build: Callable[[random.Random, list[str]], RequestSpec]
+
+
+def _chat(rng: random.Random, user_ids: list[str]) -> RequestSpec:
+    return RequestSpec(
+        endpoint="/ai/chat",
+        method="POST",
+        path="/ai/chat",
+        json={
+            "user_id": rng.choice(user_ids),
+            "message": rng.choice(CHAT_MESSAGES),
+            "profile": {"skills": [{"name": "Python", "level": "intermediate"}]},
+        },
+    )
+
+
+def _extract(rng: random.Random, user_ids: list[str]) -> RequestSpec:
+    return RequestSpec(
+        endpoint="/ai/extract-profile",
+        method="POST",
+        path="/ai/extract-profile",
+        json={"user_id": rng.choice(user_ids), "message": rng.choice(CHAT_MESSAGES)},
+    )
+
+
+def _trends(rng: random.Random, user_ids: list[str]) -> RequestSpec:
+    # refresh_if_stale=false keeps the endpoint from scraping the live web.
+    return RequestSpec(
+        endpoint="/trends/role/{role}",
+        method="GET",
+        path=f"/trends/role/{quote(rng.choice(ROLES))}",
+        params={"limit": 50, "refresh_if_stale": "false"},
+    )
+
+
+def _job_description(rng: random.Random, user_ids: list[str]) -> RequestSpec:
+    return RequestSpec(
+        endpoint="/generate-job-description",
+        method="POST",
+        path="/generate-job-description",
+        json={"role": rng.choice(ROLES), "per_source_limit": 3},
+    )
+
+
+def _mixed(rng: random.Random, user_ids: list[str]) -> RequestSpec:
+    # Roughly the production shape: mostly chat, some extraction, few generations.
+    roll = rng.random()
+    if roll < 0.55:
+        return _chat(rng, user_ids)
+    if roll < 0.80:
+        return _extract(rng, user_ids)
+    if roll < 0.95:
+        return _trends(rng, user_ids)
+    return _job_description(rng, user_ids)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("chat", "POST /ai/chat only", _chat),
+        Scenario("extract", "POST /ai/extract-profile only", _extract),
+        Scenario("trends", "GET /trends/role/{role} only", _trends),
+        Scenario("job", "POST /generate-job-description only", _job_description),
+        Scenario("mixed", "55% chat, 25% extract, 15% trends, 5% job description", _mixed),
+    )
+}
+
+
+def make_user_ids(count: int, seed: int | None = None) -> list[str]:
+    rng = random.Random(seed)
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(max(1, count))]
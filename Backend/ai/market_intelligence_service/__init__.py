@@ -8,32 +8,103 @@ team can add provider-specific logic incrementally without changing the public
 interfaces.
 """
 
-from .normalizer import NormalizedMarketRecord, normalize_market_data
-from .parser import ParsedMarketSignal, parse_market_documents
-from .scheduler import (
-    MarketIntelligenceScheduler,
-    SchedulerConfig,
-    refresh_trends_for_role,
-    refresh_trends_for_roles,
-)
-from .scraper import ScrapedDocument, fetch_page, scrape_urls
-from .search import SearchDocument, search_market_sources, search_role_sources
-from .storage import get_global_trends, get_trends, persist_market_records, save_source, save_trends
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Stages are imported on first attribute access (PEP 562) so importing the
+# package does not pull in BeautifulSoup, requests or psycopg2 until a stage
+# is actually used.
+_LAZY_EXPORTS = {
+    "NormalizedMarketRecord": "normalizer",
+    "normalize_market_data": "normalizer",
+    "ParsedMarketSignal": "parser",
+    "parse_market_documents": "parser",
+    "MarketIntelligenceScheduler": "scheduler",
+    "SchedulerConfig": "scheduler",
+    "refresh_trends_for_role": "scheduler",
+    "refresh_trends_for_roles": "scheduler",
+    "ScrapedDocument": "scraper",
+    "fetch_page": "scraper",
+    "scrape_urls": "scraper",
+    "SearchDocument": "search",
+    "search_market_sources": "search",
+    "search_role_sources": "search",
+    "RoleTrendSnapshot": "snapshots",
+    "get_cached_role_snapshot": "snapshots",
+    "refresh_role_snapshot": "snapshots",
+    "get_global_trends": "storage",
+    "get_market_context": "storage",
+    "get_role_trends_since": "storage",
+    "get_sources_since": "storage",
+    "get_trends": "storage",
+    "persist_market_records": "storage",
+    "save_market_context": "storage",
+    "save_source": "storage",
+    "save_trends": "storage",
+}
+
+if TYPE_CHECKING:
+    from .normalizer import NormalizedMarketRecord, normalize_market_data
+    from .parser import ParsedMarketSignal, parse_market_documents
+    from .scheduler import (
+        MarketIntelligenceScheduler,
+        SchedulerConfig,
+        refresh_trends_for_role,
+        refresh_trends_for_roles,
+    )
+    from .scraper import ScrapedDocument, fetch_page, scrape_urls
+    from .search import SearchDocument, search_market_sources, search_role_sources
+    from .snapshots import RoleTrendSnapshot, get_cached_role_snapshot, refresh_role_snapshot
+    from .storage import (
+        get_global_trends,
+        get_market_context,
+        get_role_trends_since,
+        get_sources_since,
+        get_trends,
+        persist_market_records,
+        save_market_context,
+        save_source,
+        save_trends,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "MarketIntelligenceScheduler",
     "NormalizedMarketRecord",
     "ParsedMarketSignal",
+    "RoleTrendSnapshot",
     "SchedulerConfig",
     "ScrapedDocument",
     "SearchDocument",
+    "get_cached_role_snapshot",
     "get_global_trends",
+    "get_market_context",
+    "get_role_trends_since",
+    "get_sources_since",
     "get_trends",
     "normalize_market_data",
     "parse_market_documents",
     "persist_market_records",
+    "refresh_role_snapshot",
     "refresh_trends_for_role",
     "refresh_trends_for_roles",
+    "save_market_context",
     "save_source",
     "save_trends",
     "fetch_page",
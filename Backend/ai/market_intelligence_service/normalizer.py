@@ -2,6 +2,9 @@
 
 Responsibility:
 - normalize role/skill names, remove duplicates, and apply taxonomy mapping
+  (aliases and categories come from ``services.skill_taxonomy``)
+- map names the taxonomy does not know onto their nearest taxonomy skill by
+  embedding similarity (``services.embeddings``), in one batch per run
 - transform parsed signals into app-ready records with stable shape
 """
 
@@ -10,6 +13,9 @@ from dataclasses import dataclass
 import re
 from typing import Sequence
 
+from services.embeddings import nearest_labels
+from services.skill_taxonomy import get_skill_taxonomy
+
 from .parser import ParsedMarketSignal
 
 
@@ -31,89 +37,6 @@ class NormalizedMarketRecord:
         }
 
 
-SKILL_NORMALIZATION_RULES: dict[str, tuple[str, ...]] = {
-    "Python": ("python", "python3", "python 3", "py"),
-    "JavaScript": ("javascript", "js"),
-    "TypeScript": ("typescript", "ts"),
-    "SQL": ("sql", "postgres sql", "mysql sql"),
-    "REST APIs": ("rest api", "restful api", "rest apis", "restful apis"),
-    "Machine Learning": ("machine learning", "ml"),
-    "Deep Learning": ("deep learning", "dl"),
-    "Data Analysis": ("data analysis", "analytics"),
-    "Data Science": ("data science"),
-    "Natural Language Processing": ("nlp", "natural language processing"),
-    "Computer Vision": ("computer vision", "cv"),
-    "FastAPI": ("fastapi",),
-    "Django": ("django",),
-    "Flask": ("flask",),
-    "Node.js": ("node", "nodejs", "node.js"),
-    "React": ("react", "react.js", "reactjs"),
-    "AWS": ("aws", "amazon web services"),
-    "Azure": ("azure",),
-    "GCP": ("gcp", "google cloud", "google cloud platform"),
-    "Docker": ("docker",),
-    "Kubernetes": ("kubernetes", "k8s"),
-    "CI/CD": ("ci/cd", "cicd", "continuous integration", "continuous delivery"),
-    "Git": ("git",),
-    "GitHub": ("github",),
-    "PostgreSQL": ("postgresql", "postgres"),
-    "MongoDB": ("mongodb", "mongo"),
-    "Pandas": ("pandas",),
-    "NumPy": ("numpy",),
-    "PyTorch": ("pytorch",),
-    "TensorFlow": ("tensorflow",),
-    "Scikit-learn": ("scikit-learn", "sklearn"),
-    "Airflow": ("airflow",),
-    "Spark": ("spark", "apache spark"),
-    "System Design": ("system design",),
-    "Microservices": ("microservices", "microservice"),
-}
-
-SKILL_CATEGORIES: dict[str, str] = {
-    "Python": "programming",
-    "JavaScript": "programming",
-    "TypeScript": "programming",
-    "SQL": "programming",
-    "Machine Learning": "AI / data",
-    "Deep Learning": "AI / data",
-    "Data Analysis": "AI / data",
-    "Data Science": "AI / data",
-    "Natural Language Processing": "AI / data",
-    "Computer Vision": "AI / data",
-    "Pandas": "AI / data",
-    "NumPy": "AI / data",
-    "PyTorch": "AI / data",
-    "TensorFlow": "AI / data",
-    "Scikit-learn": "AI / data",
-    "Spark": "AI / data",
-    "AWS": "cloud / devops",
-    "Azure": "cloud / devops",
-    "GCP": "cloud / devops",
-    "Docker": "cloud / devops",
-    "Kubernetes": "cloud / devops",
-    "CI/CD": "cloud / devops",
-    "FastAPI": "backend",
-    "Django": "backend",
-    "Flask": "backend",
-    "Node.js": "backend",
-    "REST APIs": "backend",
-    "Microservices": "backend",
-    "PostgreSQL": "backend",
-    "MongoDB": "backend",
-    "React": "frontend",
-    "Git": "tooling",
-    "GitHub": "tooling",
-    "Airflow": "tooling",
-    "System Design": "tooling",
-}
-
-_ALIAS_TO_CANONICAL: dict[str, str] = {}
-for canonical, aliases in SKILL_NORMALIZATION_RULES.items():
-    _ALIAS_TO_CANONICAL[_normalize_key := " ".join(canonical.lower().split())] = canonical
-    for alias in aliases:
-        _ALIAS_TO_CANONICAL[" ".join(alias.lower().split())] = canonical
-
-
 def normalize_market_data(signals: Sequence[ParsedMarketSignal]) -> Sequence[NormalizedMarketRecord]:
     """Normalize parsed market signals into canonical records.
 
@@ -126,10 +49,11 @@ def normalize_market_data(signals: Sequence[ParsedMarketSignal]) -> Sequence[Nor
 
     frequencies: Counter[str] = Counter()
 
-    for signal in signals:
-        per_signal_skills = _collect_signal_skills(signal)
-        for skill in per_signal_skills:
-            frequencies[skill] += 1
+    per_signal_skills = [_collect_signal_skills(signal) for signal in signals]
+    semantic_names = _semantic_canonical_names({skill for skills in per_signal_skills for skill in skills})
+    for skills in per_signal_skills:
+        # a set again, so a signal naming both "PyTorch" and a near-synonym counts once
+        frequencies.update({semantic_names.get(skill, skill) for skill in skills})
 
     ranked_records = [
         NormalizedMarketRecord(
@@ -154,18 +78,33 @@ def _collect_signal_skills(signal: ParsedMarketSignal) -> set[str]:
         if canonical:
             normalized.add(canonical)
 
-    searchable_text = _prepare_searchable_text(
-        [signal.title, signal.raw_text, *signal.requirements, *signal.sections]
+    taxonomy = get_skill_taxonomy()
+    searchable_text = "\n".join(
+        part for part in [signal.title, signal.raw_text, *signal.requirements, *signal.sections] if part
     )
     if searchable_text:
-        padded = f" {searchable_text} "
-        for alias, canonical in _ALIAS_TO_CANONICAL.items():
-            if f" {alias} " in padded:
-                normalized.add(canonical)
+        for skill_id in taxonomy.find_ids(searchable_text):
+            normalized.add(taxonomy.by_id[skill_id].name)
 
     return normalized
 
 
+def _semantic_canonical_names(names: set[str]) -> dict[str, str]:
+    """Map names outside the taxonomy to the closest taxonomy skill name, when close enough."""
+
+    taxonomy = get_skill_taxonomy()
+    unknown = sorted(name for name in names if taxonomy.canonical_id(name) is None)
+    if not unknown:
+        return {}
+
+    labels = [skill.name for skill in taxonomy.skills]
+    return {
+        name: hit.label
+        for name, hit in zip(unknown, nearest_labels(unknown, labels))
+        if hit is not None
+    }
+
+
 def _normalize_skill_name(value: str) -> str | None:
     """Normalize one raw extracted value into a canonical skill name."""
 
@@ -173,7 +112,7 @@ def _normalize_skill_name(value: str) -> str | None:
     if not normalized:
         return None
 
-    direct = _ALIAS_TO_CANONICAL.get(normalized)
+    direct = get_skill_taxonomy().canonical_name(normalized)
     if direct:
         return direct
 
@@ -181,12 +120,6 @@ def _normalize_skill_name(value: str) -> str | None:
     if re.fullmatch(r"python\d+", squashed):
         return "Python"
 
-    if normalized in {"rest api", "restful api", "rest apis", "restful apis"}:
-        return "REST APIs"
-
-    if normalized in {"ml", "machine learning"}:
-        return "Machine Learning"
-
     fallback = _format_display_name(normalized)
     if not fallback:
         return None
@@ -194,7 +127,7 @@ def _normalize_skill_name(value: str) -> str | None:
 
 
 def _categorize_skill(skill: str) -> str:
-    direct = SKILL_CATEGORIES.get(skill)
+    direct = get_skill_taxonomy().category(skill)
     if direct:
         return direct
 
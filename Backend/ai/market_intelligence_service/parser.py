@@ -6,12 +6,15 @@ Responsibility:
 """
 
 import logging
-import re
 from dataclasses import dataclass, field
 from typing import Sequence
 
 from bs4 import BeautifulSoup
 
+from services.metrics import PARSER_DOCUMENT_SECONDS, observe_seconds
+from services.skill_taxonomy import get_skill_taxonomy
+from services.tracing import traced
+
 from .scraper import ScrapedDocument
 
 
@@ -60,56 +63,6 @@ REQUIREMENT_LINE_TERMS = (
     "qualification",
 )
 
-SKILL_KEYWORDS = (
-    "machine learning",
-    "deep learning",
-    "data analysis",
-    "data modeling",
-    "software engineering",
-    "system design",
-    "cloud computing",
-    "api development",
-    "backend development",
-    "frontend development",
-    "testing",
-    "debugging",
-    "communication",
-    "problem solving",
-    "critical thinking",
-    "leadership",
-)
-
-TOOL_KEYWORDS = (
-    "python",
-    "java",
-    "javascript",
-    "typescript",
-    "sql",
-    "postgresql",
-    "mysql",
-    "mongodb",
-    "fastapi",
-    "flask",
-    "django",
-    "react",
-    "node.js",
-    "nodejs",
-    "docker",
-    "kubernetes",
-    "aws",
-    "azure",
-    "gcp",
-    "pandas",
-    "numpy",
-    "pytorch",
-    "tensorflow",
-    "scikit-learn",
-    "spark",
-    "airflow",
-    "git",
-    "github",
-)
-
 BOILERPLATE_PATTERNS = (
     "privacy",
     "terms",
@@ -156,6 +109,7 @@ class ParsedMarketSignal:
         }
 
 
+@traced("market.parse")
 def parse_market_documents(documents: Sequence[ScrapedDocument]) -> Sequence[ParsedMarketSignal]:
     """Extract job- and skill-related entities from scraped documents.
 
@@ -170,7 +124,8 @@ def parse_market_documents(documents: Sequence[ScrapedDocument]) -> Sequence[Par
 
     for document in documents:
         try:
-            parsed_results.append(_parse_document(document))
+            with observe_seconds(PARSER_DOCUMENT_SECONDS):
+                parsed_results.append(_parse_document(document))
         except Exception as exc:  # noqa: BLE001
             logger.exception("Failed to parse document %s: %s", document.url, exc)
             parsed_results.append(
@@ -200,8 +155,10 @@ def _parse_document(document: ScrapedDocument) -> ParsedMarketSignal:
     requirements = _extract_requirement_lines(visible_lines + bullets + sections)
 
     full_text = "\n".join([raw_text] + sections)
-    skills = _extract_keyword_mentions(full_text, SKILL_KEYWORDS)
-    tools = _extract_keyword_mentions(full_text, TOOL_KEYWORDS)
+    # one taxonomy pass; practices go to "skills", concrete technologies to "tools"
+    mentioned = get_skill_taxonomy().find_skills(full_text)
+    skills = [skill.name for skill in mentioned if skill.kind == "skill"]
+    tools = [skill.name for skill in mentioned if skill.kind == "tool"]
 
     return ParsedMarketSignal(
         source_url=document.url,
@@ -289,18 +246,6 @@ def _extract_requirement_lines(lines: Sequence[str]) -> list[str]:
     return _dedupe_preserve_order(requirements)[:120]
 
 
-def _extract_keyword_mentions(text: str, keywords: Sequence[str]) -> list[str]:
-    lowered = text.lower()
-    found: list[str] = []
-
-    for keyword in keywords:
-        pattern = rf"\b{re.escape(keyword.lower())}\b"
-        if re.search(pattern, lowered):
-            found.append(keyword)
-
-    return found
-
-
 def _is_relevant_line(line: str) -> bool:
     normalized = " ".join(line.split()).strip().lower()
     if not normalized:
@@ -3,6 +3,7 @@
 Responsibility:
 - run search -> scrape -> parse -> normalize -> store pipeline on schedule
 - provide entry points for app startup hooks and on-demand refreshes
+- publish the refreshed role's trend snapshot and retrieval documents
 """
 
 from __future__ import annotations
@@ -12,10 +13,14 @@ from dataclasses import dataclass
 import logging
 from typing import Any
 
+from services.market_retrieval import index_market_refresh
+from services.tracing import current_span, span, traced
+
 from .normalizer import normalize_market_data
 from .parser import parse_market_documents
 from .scraper import scrape_urls
 from .search import search_market_sources
+from .snapshots import refresh_role_snapshot
 from .storage import save_source, save_trends
 
 
@@ -59,6 +64,7 @@ class MarketIntelligenceScheduler:
         return refresh_trends_for_role(role)
 
 
+@traced("market.refresh")
 def refresh_trends_for_role(role: str, *, search_limit: int = 20) -> dict[str, Any]:
     """Run market-intelligence pipeline and persist trends for one role.
 
@@ -75,6 +81,7 @@ def refresh_trends_for_role(role: str, *, search_limit: int = 20) -> dict[str, A
         }
 
     logger.info("Market refresh started for role=%s", clean_role)
+    current_span().set_attribute("role", clean_role)
 
     try:
         search_results = list(search_market_sources(clean_role, limit=search_limit))
@@ -89,13 +96,14 @@ def refresh_trends_for_role(role: str, *, search_limit: int = 20) -> dict[str, A
         parsed_signals = list(parse_market_documents(scraped_documents))
         logger.info("Market refresh stage=parse role=%s count=%s", clean_role, len(parsed_signals))
 
-        normalized = list(normalize_market_data(parsed_signals))
-        logger.info("Market refresh stage=normalize role=%s count=%s", clean_role, len(normalized))
+        with span("market.normalize"):
+            normalized = list(normalize_market_data(parsed_signals))
+            logger.info("Market refresh stage=normalize role=%s count=%s", clean_role, len(normalized))
 
-        source_counter: Counter[str] = Counter()
-        for signal in parsed_signals:
-            for record in normalize_market_data([signal]):
-                source_counter[record.skill] += 1
+            source_counter: Counter[str] = Counter()
+            for signal in parsed_signals:
+                for record in normalize_market_data([signal]):
+                    source_counter[record.skill] += 1
 
         trend_rows = [
             {
@@ -109,6 +117,8 @@ def refresh_trends_for_role(role: str, *, search_limit: int = 20) -> dict[str, A
 
         saved_count = save_trends(clean_role, trend_rows)
         logger.info("Market refresh stage=store role=%s saved=%s", clean_role, saved_count)
+        index_market_refresh(clean_role, trend_rows, sources=search_results, signals=parsed_signals)
+        refresh_role_snapshot(clean_role)
 
         return {
             "success": True,
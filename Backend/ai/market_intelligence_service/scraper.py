@@ -13,6 +13,9 @@ from typing import Sequence
 
 import requests
 
+from services.metrics import SCRAPER_FETCH_SECONDS, scraper_host
+from services.tracing import span, traced
+
 from .search import SearchDocument
 
 
@@ -59,6 +62,18 @@ def fetch_page(url: str) -> str:
         logger.warning("Skipping invalid URL in fetch_page: %s", url)
         return ""
 
+    started = time.perf_counter()
+    host = scraper_host(url)
+    with span("market.fetch_page", host=host) as current:
+        html = _fetch_with_retries(url)
+        current.set_attribute("bytes", len(html))
+    SCRAPER_FETCH_SECONDS.labels(host=host, outcome="ok" if html else "error").observe(
+        time.perf_counter() - started
+    )
+    return html
+
+
+def _fetch_with_retries(url: str) -> str:
     for attempt in range(DEFAULT_MAX_RETRIES + 1):
         try:
             response = requests.get(
@@ -112,6 +127,7 @@ def fetch_page(url: str) -> str:
     return ""
 
 
+@traced("market.scrape")
 def scrape_urls(search_results: Sequence[SearchDocument]) -> Sequence[ScrapedDocument]:
     """Fetch raw HTML for each search result URL.
 
@@ -13,6 +13,8 @@ from urllib.parse import quote_plus, urlparse
 
 import requests
 
+from services.tracing import traced
+
 
 logger = logging.getLogger(__name__)
 
@@ -256,6 +258,7 @@ def _dedupe_by_url(results: Sequence[dict[str, str]]) -> list[dict[str, str]]:
     return deduped
 
 
+@traced("market.search")
 def search_market_sources(query: str, *, limit: int = 10) -> Sequence[SearchDocument]:
     """Search external sources for market intelligence material.
 
@@ -0,0 +1,145 @@
+"""Precomputed per-role trend snapshots served by ``GET /trends/role/{role}``.
+
+Responsibility:
+- turn a role's stored trend rows into an immutable snapshot: rows already
+  serialized to JSON, the latest ``updated_at`` and a content version stamp
+- keep recent snapshots in a bounded in-process cache shared by every request
+- rebuild a role's snapshot right after ``refresh_trends_for_role`` stores it
+
+Hot roles are served from memory without touching Postgres. Entries expire
+after ``AI_MARKET_SNAPSHOT_TTL_SECONDS`` so refreshes run by another worker
+show up here too.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import threading
+import time
+from typing import Any, Sequence
+
+import orjson
+
+from services.env import env_float, env_int
+
+from .storage import get_trends
+
+
+MAX_SNAPSHOT_ROWS = 500
+
+
+def _dumps(value: Any) -> bytes:
+    # the app's ORJSONResponse encoding, so spliced bodies match every other response
+    return orjson.dumps(value, default=str)
+
+
+def _as_utc(value: Any) -> datetime | None:
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class RoleTrendSnapshot:
+    """One role's trends as of one refresh; never mutated after it is built."""
+
+    role: str
+    version: str
+    latest_updated_at: datetime | None
+    rows: tuple[bytes, ...]
+    built_at: float
+
+    @classmethod
+    def build(cls, role: str, trends: Sequence[dict[str, Any]]) -> RoleTrendSnapshot:
+        rows = tuple(_dumps(row) for row in trends[:MAX_SNAPSHOT_ROWS])
+        latest = max(
+            (stamp for stamp in (_as_utc(row.get("updated_at")) for row in trends) if stamp is not None),
+            default=None,
+        )
+        digest = hashlib.sha1(b"\n".join(rows)).hexdigest()[:16]
+        return cls(role=role, version=digest, latest_updated_at=latest, rows=rows, built_at=time.monotonic())
+
+    def etag(self, *, limit: int, stale: bool) -> str:
+        """Strong validator for the body ``render`` returns with the same arguments."""
+
+        return f'"{self.version}-{limit}-{int(stale)}"'
+
+    def render(self, *, limit: int, stale: bool, stale_after_hours: int, background_refresh_triggered: bool) -> bytes:
+        """The ``/trends/role/{role}`` response body, splicing in the pre-serialized rows."""
+
+        rows = self.rows[:limit]
+        head = _dumps(
+            {
+                "success": True,
+                "role": self.role,
+                "count": len(rows),
+                "stale": stale,
+                "stale_after_hours": stale_after_hours,
+                "latest_updated_at": self.latest_updated_at.isoformat() if self.latest_updated_at else None,
+                "background_refresh_triggered": background_refresh_triggered,
+            }
+        )
+        return b"".join((head[:-1], b',"trends":[', b",".join(rows), b"]}"))
+
+
+@dataclass(slots=True)
+class RoleSnapshotCache:
+    """LRU of the latest snapshot per role, expiring entries after ``ttl_seconds``."""
+
+    max_entries: int = 256
+    ttl_seconds: float = 60.0
+    _entries: OrderedDict[str, RoleTrendSnapshot] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self, role: str) -> RoleTrendSnapshot | None:
+        with self._lock:
+            snapshot = self._entries.get(role)
+            if snapshot is None:
+                return None
+            if time.monotonic() - snapshot.built_at > self.ttl_seconds:
+                del self._entries[role]
+                return None
+            self._entries.move_to_end(role)
+            return snapshot
+
+    def put(self, snapshot: RoleTrendSnapshot) -> None:
+        with self._lock:
+            self._entries[snapshot.role] = snapshot
+            self._entries.move_to_end(snapshot.role)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_cache: RoleSnapshotCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_role_snapshot_cache() -> RoleSnapshotCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RoleSnapshotCache(
+                    max_entries=max(1, env_int("AI_MARKET_SNAPSHOT_CACHE_SIZE", 256)),
+                    ttl_seconds=max(0.0, env_float("AI_MARKET_SNAPSHOT_TTL_SECONDS", 60.0)),
+                )
+    return _cache
+
+
+def get_cached_role_snapshot(role: str) -> RoleTrendSnapshot | None:
+    """The cached snapshot for ``role``, without touching the database."""
+
+    return get_role_snapshot_cache().get(role)
+
+
+def refresh_role_snapshot(role: str) -> RoleTrendSnapshot:
+    """Rebuild ``role``'s snapshot from the stored trends and publish it (one DB query)."""
+
+    snapshot = RoleTrendSnapshot.build(role, get_trends(role, limit=MAX_SNAPSHOT_ROWS))
+    get_role_snapshot_cache().put(snapshot)
+    return snapshot
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal
+
+from services.env import env_float, env_int
+
+
+logger = logging.getLogger(__name__)
+
+AdmissionClass = Literal["chat", "extract", "generate"]
+
+# Lower value is served first.
+ADMISSION_PRIORITIES: dict[str, int] = {
+    "chat": 0,
+    "extract": 1,
+    "generate": 2,
+}
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, admission_class: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"{admission_class} request rejected: {reason}")
+        self.admission_class = admission_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Priority-aware gate in front of every LLM-backed request.
+
+    At most ``max_concurrent`` requests run at once. Waiting requests are
+    served by priority (chat, then extract, then generate) and FIFO within a
+    priority. A request that cannot start within its class deadline, or that
+    arrives when the queue is full and nothing of lower priority can be
+    evicted, is rejected immediately so callers can shed load.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrent: int,
+        max_queue: int,
+        max_wait_seconds: dict[str, float],
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait_seconds = dict(max_wait_seconds)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None], str]] = []
+        self._sequence = itertools.count()
+        self._rejected: dict[str, int] = {name: 0 for name in ADMISSION_PRIORITIES}
+        self._admitted: dict[str, int] = {name: 0 for name in ADMISSION_PRIORITIES}
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            max_concurrent=env_int("AI_ADMISSION_MAX_CONCURRENT", 4),
+            max_queue=env_int("AI_ADMISSION_QUEUE_SIZE", 32),
+            max_wait_seconds={
+                "chat": max(0.0, env_float("AI_ADMISSION_MAX_WAIT_CHAT", 15.0)),
+                "extract": max(0.0, env_float("AI_ADMISSION_MAX_WAIT_EXTRACT", 30.0)),
+                "generate": max(0.0, env_float("AI_ADMISSION_MAX_WAIT_GENERATE", 60.0)),
+            },
+        )
+
+    def _queued(self) -> int:
+        return sum(1 for *_, future, _ in self._waiters if not future.done())
+
+    def _retry_after(self, admission_class: str) -> int:
+        return max(1, int(self.max_wait_seconds.get(admission_class, 30.0) // 2))
+
+    def _reject(self, admission_class: str, reason: str) -> AdmissionRejected:
+        self._rejected[admission_class] = self._rejected.get(admission_class, 0) + 1
+        logger.warning("Admission rejected class=%s reason=%s active=%s", admission_class, reason, self._active)
+        return AdmissionRejected(admission_class, reason, self._retry_after(admission_class))
+
+    def _evict_lowest_priority(self, priority: int) -> bool:
+        candidates = [entry for entry in self._waiters if not entry[2].done() and entry[0] > priority]
+        if not candidates:
+            return False
+
+        victim = max(candidates, key=lambda entry: (entry[0], entry[1]))
+        victim[2].set_exception(self._reject(victim[3], "evicted"))
+        return True
+
+    async def acquire(self, admission_class: AdmissionClass) -> None:
+        priority = ADMISSION_PRIORITIES[admission_class]
+
+        if self._active < self.max_concurrent and self._queued() == 0:
+            self._active += 1
+            self._admitted[admission_class] += 1
+            return
+
+        if self._queued() >= self.max_queue and not self._evict_lowest_priority(priority):
+            raise self._reject(admission_class, "queue_full")
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future, admission_class))
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait_seconds.get(admission_class))
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Granted right as the deadline hit; hand the slot on.
+                self.release()
+            else:
+                future.cancel()
+            raise self._reject(admission_class, "deadline") from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+        self._admitted[admission_class] += 1
+
+    def release(self) -> None:
+        self._active = max(0, self._active - 1)
+        while self._waiters and self._active < self.max_concurrent:
+            _, _, future, _ = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._active += 1
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def admit(self, admission_class: AdmissionClass) -> AsyncIterator[None]:
+        await self.acquire(admission_class)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def snapshot(self) -> dict[str, object]:
+        queued: dict[str, int] = {name: 0 for name in ADMISSION_PRIORITIES}
+        for *_, future, admission_class in self._waiters:
+            if not future.done():
+                queued[admission_class] += 1
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queued": queued,
+            "admitted": dict(self._admitted),
+            "rejected": dict(self._rejected),
+            "max_wait_seconds": dict(self.max_wait_seconds),
+        }
@@ -0,0 +1,433 @@
+"""Chart rendering for ``tools.tool_generate_chart`` and ``GET /charts/{id}``.
+
+A chart is identified by the SHA-256 of its canonical spec (type, labels,
+values, titles, colour scheme, format), so identical requests render once
+and share one URL. Rendered images sit in an in-memory LRU bounded by entry
+count and total bytes.
+
+matplotlib runs in a process pool: its figure state is not thread-safe and a
+render holds the GIL for tens of milliseconds, which would stall the API
+event loop. Only the worker processes import matplotlib. Concurrent
+requests for the same chart wait on one render instead of starting their own.
+
+Configuration:
+
+* ``AI_CHART_WORKERS``: render processes (default 2)
+* ``AI_CHART_CACHE_SIZE``: cached charts (default 256)
+* ``AI_CHART_CACHE_MAX_BYTES``: cached bytes across all charts (default 64 MiB)
+* ``AI_CHART_RENDER_TIMEOUT_SECONDS``: wait for one render (default 30)
+* ``AI_CHART_FORMAT``: default format, ``svg`` (default) or ``png``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any
+
+from services.env import env_float, env_int
+
+
+logger = logging.getLogger(__name__)
+
+CHART_TYPES = ("bar", "horizontal_bar", "pie", "line")
+MIME_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+
+BG_DARK = "#0f172a"
+PANEL_DARK = "#1e293b"
+BORDER_DARK = "#334155"
+TEXT_MUTED = "#94a3b8"
+TEXT_WHITE = "#f8fafc"
+ACCENT = "#38bdf8"
+
+
+class ChartRenderError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class ChartSpec:
+    chart_type: str
+    labels: tuple[str, ...]
+    values: tuple[float, ...]
+    title: str = "Chart"
+    x_label: str = ""
+    y_label: str = ""
+    color_scheme: str = "viridis"
+    image_format: str = "svg"
+
+    @property
+    def chart_id(self) -> str:
+        canonical = json.dumps(
+            [
+                self.chart_type,
+                self.labels,
+                self.values,
+                self.title,
+                self.x_label,
+                self.y_label,
+                self.color_scheme,
+                self.image_format,
+            ],
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ChartImage:
+    chart_id: str
+    content: bytes
+    mime_type: str
+
+
+def build_chart_spec(
+    chart_type: str,
+    labels: list[Any],
+    values: list[Any],
+    *,
+    title: str = "Chart",
+    x_label: str = "",
+    y_label: str = "",
+    color_scheme: str = "viridis",
+    image_format: str | None = None,
+) -> ChartSpec:
+    """Validate tool/API input into a hashable spec; raises ``ValueError``."""
+
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unsupported chart_type: '{chart_type}'. Use bar, horizontal_bar, pie, or line.")
+    if len(labels) == 0 or len(values) == 0:
+        raise ValueError("Both labels and values must be non-empty lists.")
+    if len(labels) != len(values):
+        raise ValueError(f"labels ({len(labels)}) and values ({len(values)}) must be the same length.")
+
+    resolved_format = (image_format or os.getenv("AI_CHART_FORMAT") or "svg").strip().lower()
+    if resolved_format not in MIME_TYPES:
+        raise ValueError(f"Unsupported image_format: '{resolved_format}'. Use svg or png.")
+
+    try:
+        numeric_values = tuple(float(value) for value in values)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("values must all be numbers.") from exc
+
+    return ChartSpec(
+        chart_type=chart_type,
+        labels=tuple(str(label) for label in labels),
+        values=numeric_values,
+        title=str(title or ""),
+        x_label=str(x_label or ""),
+        y_label=str(y_label or ""),
+        color_scheme=str(color_scheme or "viridis"),
+        image_format=resolved_format,
+    )
+
+
+_plt = None
+
+
+def _pyplot():
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use("Agg")  # no display on servers
+        import matplotlib.pyplot as plt
+
+        # SVG text stays text instead of one path per glyph, which keeps files small
+        plt.rcParams["svg.fonttype"] = "none"
+        _plt = plt
+    return _plt
+
+
+def _set_category_ticks(ax: Any, labels: tuple[str, ...]) -> None:
+    positions = list(range(len(labels)))
+    ax.set_xticks(positions)
+    rotation_angle = 30 if len(labels) > 5 else 0
+    ax.set_xticklabels(labels, rotation=rotation_angle, ha="right", color=TEXT_MUTED, fontsize=9)
+
+
+def render_chart_bytes(spec: ChartSpec) -> bytes:
+    """Draw ``spec`` with the dark dashboard theme. Runs inside a pool worker."""
+
+    plt = _pyplot()
+    labels = list(spec.labels)
+    values = list(spec.values)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    try:
+        cmap = getattr(plt.cm, spec.color_scheme, plt.cm.viridis)
+        steps = max(1, len(labels) - 1)
+        colors = [cmap(index / steps) for index in range(len(labels))]
+
+        fig.patch.set_facecolor(BG_DARK)
+        ax.set_facecolor(PANEL_DARK)
+
+        if spec.chart_type == "bar":
+            bars = ax.bar(labels, values, color=colors, edgecolor=BORDER_DARK, linewidth=0.8)
+            ax.bar_label(bars, fmt="%.1f", padding=4, color=TEXT_WHITE, fontsize=9)
+        elif spec.chart_type == "horizontal_bar":
+            bars = ax.barh(labels, values, color=colors, edgecolor=BORDER_DARK, linewidth=0.8)
+            ax.bar_label(bars, fmt="%.1f", padding=4, color=TEXT_WHITE, fontsize=9)
+        elif spec.chart_type == "pie":
+            _, texts, autotexts = ax.pie(
+                values,
+                labels=labels,
+                colors=colors,
+                autopct="%1.1f%%",
+                pctdistance=0.8,
+                startangle=90,
+            )
+            for text in texts:
+                text.set_color(TEXT_MUTED)
+            for autotext in autotexts:
+                autotext.set_color(TEXT_WHITE)
+                autotext.set_fontsize(9)
+        elif spec.chart_type == "line":
+            x_positions = list(range(len(labels)))
+            ax.plot(
+                x_positions,
+                values,
+                color=ACCENT,
+                linewidth=2.5,
+                marker="o",
+                markersize=6,
+                markerfacecolor="#0ea5e9",
+                markeredgecolor=BG_DARK,
+                markeredgewidth=1.5,
+            )
+            ax.fill_between(x_positions, values, alpha=0.12, color=ACCENT)
+            _set_category_ticks(ax, spec.labels)
+
+        ax.set_title(spec.title, color=TEXT_WHITE, fontsize=14, fontweight="bold", pad=16)
+        if spec.x_label:
+            ax.set_xlabel(spec.x_label, color=TEXT_MUTED, fontsize=11)
+        if spec.y_label:
+            ax.set_ylabel(spec.y_label, color=TEXT_MUTED, fontsize=11)
+
+        ax.tick_params(axis="both", colors=TEXT_MUTED, labelsize=9)
+        for spine in ax.spines.values():
+            spine.set_edgecolor(BORDER_DARK)
+
+        if spec.chart_type == "bar":
+            _set_category_ticks(ax, spec.labels)
+
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        if spec.image_format == "png":
+            fig.savefig(buffer, format="png", dpi=120, facecolor=fig.get_facecolor())
+        else:
+            fig.savefig(buffer, format="svg", facecolor=fig.get_facecolor(), metadata={"Date": None})
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def _warm_worker() -> bool:
+    _pyplot()
+    return True
+
+
+class ChartCache:
+    """LRU of rendered charts, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self._entries: OrderedDict[str, ChartImage] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chart_id: str) -> ChartImage | None:
+        with self._lock:
+            image = self._entries.get(chart_id)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(chart_id)
+            self.hits += 1
+            return image
+
+    def put(self, image: ChartImage) -> None:
+        if len(image.content) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(image.chart_id, None)
+            if previous is not None:
+                self._bytes -= len(previous.content)
+            self._entries[image.chart_id] = image
+            self._bytes += len(image.content)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.content)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+@dataclass(slots=True)
+class ChartRenderer:
+    cache: ChartCache
+    max_workers: int = 2
+    render_timeout_seconds: float = 30.0
+    _executor: ProcessPoolExecutor | None = field(default=None, init=False)
+    _in_flight: dict[str, Future[bytes]] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @classmethod
+    def from_env(cls) -> ChartRenderer:
+        return cls(
+            cache=ChartCache(
+                max_entries=env_int("AI_CHART_CACHE_SIZE", 256),
+                max_bytes=env_int("AI_CHART_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+            ),
+            max_workers=max(1, env_int("AI_CHART_WORKERS", 2)),
+            render_timeout_seconds=max(1.0, env_float("AI_CHART_RENDER_TIMEOUT_SECONDS", 30.0)),
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the API process runs threads (exporters, pools)
+            # that must not be cloned mid-operation into the workers.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _discard_executor(self) -> None:
+        # callers hold self._lock
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, spec: ChartSpec, chart_id: str) -> Future[bytes]:
+        """Return the render future for ``chart_id``, joining one already in flight."""
+
+        with self._lock:
+            future = self._in_flight.get(chart_id)
+            if future is not None:
+                return future
+            try:
+                future = self._get_executor().submit(render_chart_bytes, spec)
+            except BrokenProcessPool:
+                # a worker died (OOM kill, segfault) and took the pool with it;
+                # start a fresh pool and try once more
+                logger.warning("Chart worker pool is broken; starting a new one")
+                self._discard_executor()
+                try:
+                    future = self._get_executor().submit(render_chart_bytes, spec)
+                except BrokenProcessPool as exc:
+                    self._discard_executor()
+                    raise ChartRenderError("Chart workers are unavailable.") from exc
+            self._in_flight[chart_id] = future
+
+        def _finish(done: Future[bytes]) -> None:
+            with self._lock:
+                self._in_flight.pop(chart_id, None)
+            if not done.cancelled() and done.exception() is None:
+                self._store(chart_id, done.result(), spec)
+
+        future.add_done_callback(_finish)
+        return future
+
+    def _store(self, chart_id: str, content: bytes, spec: ChartSpec) -> ChartImage:
+        # The done-callback also caches, but may run after the waiter wakes up.
+        image = ChartImage(chart_id, content, MIME_TYPES[spec.image_format])
+        self.cache.put(image)
+        return image
+
+    def get(self, chart_id: str) -> ChartImage | None:
+        return self.cache.get(chart_id)
+
+    def render(self, spec: ChartSpec) -> ChartImage:
+        """Blocking render for synchronous callers (the tool functions)."""
+
+        chart_id = spec.chart_id
+        cached = self.cache.get(chart_id)
+        if cached is not None:
+            return cached
+
+        try:
+            future = self._submit(spec, chart_id)
+            content = future.result(timeout=self.render_timeout_seconds)
+        except FutureTimeoutError as exc:
+            raise ChartRenderError(f"Chart render exceeded {self.render_timeout_seconds:g}s.") from exc
+        except Exception as exc:
+            raise ChartRenderError(str(exc)) from exc
+        return self._store(chart_id, content, spec)
+
+    async def render_async(self, spec: ChartSpec) -> ChartImage:
+        chart_id = spec.chart_id
+        cached = self.cache.get(chart_id)
+        if cached is not None:
+            return cached
+
+        try:
+            future = self._submit(spec, chart_id)
+            content = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=self.render_timeout_seconds,
+            )
+        except asyncio.TimeoutError as exc:
+            raise ChartRenderError(f"Chart render exceeded {self.render_timeout_seconds:g}s.") from exc
+        except Exception as exc:
+            raise ChartRenderError(str(exc)) from exc
+        return self._store(chart_id, content, spec)
+
+    def prewarm(self) -> None:
+        """Start every worker process and import matplotlib in it."""
+
+        executor = self._get_executor()
+        futures = [executor.submit(_warm_worker) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result(timeout=self.render_timeout_seconds * 2)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_renderer: ChartRenderer | None = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = ChartRenderer.from_env()
+    return _renderer
+
+
+def prewarm_chart_workers() -> None:
+    get_chart_renderer().prewarm()
+
+
+def shutdown_chart_renderer() -> None:
+    global _renderer
+    with _renderer_lock:
+        renderer, _renderer = _renderer, None
+    if renderer is not None:
+        renderer.shutdown()
@@ -0,0 +1,396 @@
+"""Text embeddings and vectorised nearest-label lookup for semantic matching.
+
+Lexical matching (``services.skill_taxonomy``) cannot tell that "PyTorch"
+is deep-learning experience or that "neural nets" means "Deep Learning".
+This module embeds short texts and compares them by cosine similarity, so
+callers can fall back to meaning when no alias matched.
+
+* ``OllamaEmbedder`` calls the model server's embeddings endpoint
+  (``/v1/embeddings``, or ``/api/embed`` with ``OLLAMA_API_MODE=native``),
+  many texts per request.
+* ``HashingEmbedder`` is a deterministic local stand-in (feature-hashed
+  words and character trigrams). It needs no model server, so tests,
+  benchmarks and offline runs can use it.
+
+Vectors are L2-normalised ``float32``. They are kept in an in-process LRU
+and in a SQLite file shared by all workers (``AI_EMBEDDING_CACHE_PATH``),
+keyed by model and text, so each distinct skill name is embedded once.
+A label set is stacked into one NumPy matrix (``EmbeddingIndex``), and a
+whole batch of queries is scored with one matrix product.
+
+``nearest_labels`` is what callers use. It never raises: if the backend is
+``none`` (the default) or the model server fails, it returns no matches
+and stops calling the server for ``AI_EMBEDDING_RETRY_SECONDS``, and
+lexical matching carries on alone.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol, Sequence
+
+import numpy as np
+
+from services.env import env_float, env_int
+from services.llm_service import get_ollama_config, get_shared_httpx_client, ollama_native_url
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "embeddings.sqlite3"
+
+
+class EmbeddingError(RuntimeError):
+    """The embedding backend could not produce vectors."""
+
+
+def _clean(text: str) -> str:
+    return " ".join(str(text or "").split())
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class Embedder(Protocol):
+    @property
+    def model(self) -> str: ...
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """One row per text, in order."""
+        ...
+
+
+@dataclass(slots=True)
+class OllamaEmbedder:
+    model: str
+    batch_size: int = 64
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: list[list[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            rows.extend(self._request(list(texts[start:start + self.batch_size])))
+        if len(rows) != len(texts):
+            raise EmbeddingError(f"expected {len(texts)} embeddings, got {len(rows)}")
+        return np.asarray(rows, dtype=np.float32)
+
+    def _request(self, batch: list[str]) -> list[list[float]]:
+        config = get_ollama_config()
+        headers = {}
+        if config["ollama_api_key"]:
+            headers["Authorization"] = f"Bearer {config['ollama_api_key']}"
+
+        native = config["api_mode"] == "native"
+        url = f"{ollama_native_url(config['ollama_url'])}/api/embed" if native else "/embeddings"
+        try:
+            response = get_shared_httpx_client(config).post(
+                url,
+                json={"model": self.model, "input": batch},
+                headers=headers,
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except Exception as exc:
+            raise EmbeddingError(f"embedding request failed for model {self.model}: {exc}") from exc
+
+        if native:
+            vectors = payload.get("embeddings") if isinstance(payload, dict) else None
+        else:
+            data = payload.get("data") if isinstance(payload, dict) else None
+            vectors = (
+                [item.get("embedding") for item in sorted(data, key=lambda item: item.get("index", 0))]
+                if isinstance(data, list)
+                else None
+            )
+        if not isinstance(vectors, list) or not all(isinstance(vector, list) and vector for vector in vectors):
+            raise EmbeddingError(f"embedding response from model {self.model} has no vectors")
+        return vectors
+
+
+@dataclass(slots=True)
+class HashingEmbedder:
+    """Deterministic, dependency-free embedder: hashed words and character trigrams."""
+
+    dimensions: int = 256
+
+    @property
+    def model(self) -> str:
+        return f"hashing-{self.dimensions}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            lowered = _clean(text).casefold()
+            features = lowered.split()
+            padded = f" {lowered} "
+            features.extend(padded[index:index + 3] for index in range(len(padded) - 2))
+            for feature in features:
+                digest = zlib.crc32(feature.encode("utf-8"))
+                matrix[row, digest % self.dimensions] += 1.0 if digest & 0x80000000 else -1.0
+        return matrix
+
+
+class EmbeddingStore:
+    """SQLite-backed vector cache, shared by every worker on the host."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, timeout=5.0)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " model TEXT NOT NULL, text_key TEXT NOT NULL, vector BLOB NOT NULL,"
+                " PRIMARY KEY (model, text_key))"
+            )
+            self._connection.commit()
+
+    def get_many(self, model: str, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            # stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT text_key, vector FROM embeddings WHERE model = ? AND text_key IN ({placeholders})",
+                    (model, *chunk),
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, vectors: dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_key, vector) VALUES (?, ?, ?)",
+                [(model, key, vector.astype(np.float32).tobytes()) for key, vector in vectors.items()],
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+@dataclass(frozen=True, slots=True)
+class EmbeddingIndex:
+    labels: tuple[str, ...]
+    matrix: np.ndarray  # (len(labels), dims), rows L2-normalised
+
+    def top_k(self, queries: np.ndarray, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """Indices and cosine scores of the ``k`` closest labels for every query row."""
+
+        scores = queries @ self.matrix.T
+        k = min(k, len(self.labels))
+        if k < len(self.labels):
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(len(self.labels)), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+@dataclass(frozen=True, slots=True)
+class SemanticMatch:
+    label: str
+    index: int
+    score: float
+
+
+@dataclass(slots=True)
+class EmbeddingService:
+    embedder: Embedder
+    store: EmbeddingStore | None = None
+    threshold: float = 0.75
+    memory_cache_size: int = 20000
+    index_cache_size: int = 64
+    retry_seconds: float = 300.0
+    _vectors: OrderedDict[str, np.ndarray] = field(default_factory=OrderedDict)
+    _indexes: OrderedDict[tuple[str, ...], EmbeddingIndex] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _disabled_until: float = 0.0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Normalised vectors for ``texts``; only texts never seen before reach the embedder."""
+
+        keys = [_clean(text) for text in texts]
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._vectors.get(key)
+                if vector is not None:
+                    self._vectors.move_to_end(key)
+                    found[key] = vector
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        model = self.embedder.model
+        if missing and self.store is not None:
+            try:
+                stored = self.store.get_many(model, [_store_key(key) for key in missing])
+            except sqlite3.Error:
+                logger.exception("Embedding cache read failed")
+                stored = {}
+            for key in missing:
+                vector = stored.get(_store_key(key))
+                if vector is not None:
+                    found[key] = vector
+            missing = [key for key in missing if key not in found]
+
+        if missing:
+            fresh = _normalize_rows(self.embedder.embed(missing))
+            computed = dict(zip(missing, fresh))
+            found.update(computed)
+            if self.store is not None:
+                try:
+                    self.store.put_many(model, {_store_key(key): vector for key, vector in computed.items()})
+                except sqlite3.Error:
+                    logger.exception("Embedding cache write failed")
+
+        with self._lock:
+            for key, vector in found.items():
+                self._vectors[key] = vector
+                self._vectors.move_to_end(key)
+            while len(self._vectors) > self.memory_cache_size:
+                self._vectors.popitem(last=False)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([found[key] for key in keys])
+
+    def index(self, labels: Sequence[str]) -> EmbeddingIndex:
+        cache_key = tuple(labels)
+        with self._lock:
+            cached = self._indexes.get(cache_key)
+            if cached is not None:
+                self._indexes.move_to_end(cache_key)
+                return cached
+
+        built = EmbeddingIndex(labels=cache_key, matrix=self.embed(cache_key))
+        with self._lock:
+            self._indexes[cache_key] = built
+            while len(self._indexes) > self.index_cache_size:
+                self._indexes.popitem(last=False)
+        return built
+
+    def nearest(
+        self,
+        queries: Sequence[str],
+        labels: Sequence[str],
+        *,
+        threshold: float | None = None,
+    ) -> list[SemanticMatch | None]:
+        """The closest label for every query, or None below ``threshold``.
+
+        Returns all-None (and logs once) while the backend is failing.
+        """
+
+        if not queries or not labels or time.monotonic() < self._disabled_until:
+            return [None] * len(queries)
+
+        minimum = self.threshold if threshold is None else threshold
+        try:
+            index = self.index(labels)
+            positions, scores = index.top_k(self.embed(queries), k=1)
+        except (EmbeddingError, ValueError) as exc:
+            self._disabled_until = time.monotonic() + self.retry_seconds
+            logger.warning("Semantic matching paused for %.0fs: %s", self.retry_seconds, exc)
+            return [None] * len(queries)
+
+        matches: list[SemanticMatch | None] = []
+        for position, score in zip(positions[:, 0].tolist(), scores[:, 0].tolist()):
+            matches.append(
+                SemanticMatch(label=index.labels[position], index=position, score=round(score, 4))
+                if score >= minimum
+                else None
+            )
+        return matches
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+
+def _store_key(text: str) -> str:
+    # fixed-width keys keep the SQLite index small for long texts
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def build_embedder(backend: str) -> Embedder | None:
+    backend = backend.strip().lower()
+    if backend == "ollama":
+        return OllamaEmbedder(
+            model=(os.getenv("AI_EMBEDDING_MODEL") or "nomic-embed-text").strip(),
+            batch_size=max(1, env_int("AI_EMBEDDING_BATCH_SIZE", 64)),
+        )
+    if backend == "hashing":
+        return HashingEmbedder()
+    return None
+
+
+_service: EmbeddingService | None = None
+_service_built = False
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService | None:
+    """The process-wide service, or None when ``AI_EMBEDDING_BACKEND=none``."""
+
+    global _service, _service_built
+    if not _service_built:
+        with _service_lock:
+            if not _service_built:
+                embedder = build_embedder(os.getenv("AI_EMBEDDING_BACKEND") or "none")
+                if embedder is not None:
+                    cache_path = os.getenv("AI_EMBEDDING_CACHE_PATH", str(DEFAULT_CACHE_PATH)).strip()
+                    store = None
+                    if cache_path:
+                        try:
+                            store = EmbeddingStore(Path(cache_path))
+                        except (OSError, sqlite3.Error):
+                            logger.exception("Embedding cache at %s unavailable; caching in memory only", cache_path)
+                    _service = EmbeddingService(
+                        embedder=embedder,
+                        store=store,
+                        threshold=env_float("AI_SEMANTIC_MATCH_THRESHOLD", 0.75),
+                        memory_cache_size=max(100, env_int("AI_EMBEDDING_MEMORY_CACHE_SIZE", 20000)),
+                        retry_seconds=max(1.0, env_float("AI_EMBEDDING_RETRY_SECONDS", 300.0)),
+                    )
+                _service_built = True
+    return _service
+
+
+def nearest_labels(
+    queries: Sequence[str],
+    labels: Sequence[str],
+    *,
+    threshold: float | None = None,
+) -> list[SemanticMatch | None]:
+    """Semantic fallback for callers: the closest label per query, None when disabled."""
+
+    service = get_embedding_service()
+    if service is None:
+        return [None] * len(queries)
+    return service.nearest(queries, labels, threshold=threshold)
+
+
+def shutdown_embedding_service() -> None:
+    global _service, _service_built
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+        _service = None
+        _service_built = False
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class IncrementalJsonParser:
+    """Tracks a streamed LLM reply until its first top-level JSON value closes.
+
+    Text before the first ``{`` or ``[`` is ignored. Brackets inside strings
+    are skipped, including escaped quotes. Once the value closes and parses,
+    :meth:`feed` returns ``True`` and the caller can stop reading the stream.
+    If the closed value does not parse, the parser gives up so the caller
+    falls back to collecting the full reply.
+    """
+
+    def __init__(self) -> None:
+        self._chars: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._complete = False
+        self._failed = False
+        self._value: Any = None
+
+    @property
+    def complete(self) -> bool:
+        return self._complete
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chars)
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    def feed(self, chunk: str) -> bool:
+        if self._complete or self._failed:
+            return self._complete
+
+        for char in chunk:
+            if not self._started:
+                if char in "{[":
+                    self._started = True
+                    self._depth = 1
+                    self._chars.append(char)
+                continue
+
+            self._chars.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._finish()
+
+        return False
+
+    def _finish(self) -> bool:
+        try:
+            self._value = json.loads(self.text)
+        except json.JSONDecodeError:
+            self._failed = True
+            return False
+
+        self._complete = True
+        return True
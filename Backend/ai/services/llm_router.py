@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+import httpx
+
+from services.env import env_int
+from services.llm_service import LLMTask, get_ollama_config, ollama_native_url
+
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_concurrency_overrides(raw: str | None) -> dict[str, int]:
+    """Parse ``model=limit`` pairs, e.g. ``qwen2.5:7b=1,gemma3:1b=4``."""
+
+    overrides: dict[str, int] = {}
+    for item in (raw or "").split(","):
+        model, separator, limit = item.strip().rpartition("=")
+        if not separator or not model.strip():
+            continue
+        try:
+            overrides[model.strip()] = max(1, int(limit))
+        except ValueError:
+            continue
+    return overrides
+
+
+class _Waiter:
+    """One queued caller: a thread (``loop`` is None) or an event-loop future."""
+
+    __slots__ = ("loop", "future", "granted")
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop | None = None,
+        future: asyncio.Future[None] | None = None,
+    ) -> None:
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+
+class _ModelSlots:
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.waiting = 0
+        self.served = 0
+        self.condition = threading.Condition()
+        self.waiters: deque[_Waiter] = deque()
+
+
+class ModelRouter:
+    """Picks an Ollama model per task and bounds concurrent calls per model.
+
+    Each task maps to a primary model. When more than
+    ``fallback_queue_depth`` callers are already waiting on that model and a
+    fallback model is configured, new callers are routed to the fallback
+    instead of joining the queue. Threads and event-loop callers share one
+    FIFO per model; async callers wait on a future rather than occupying an
+    executor thread. A background thread pings every routed model through
+    the native API so Ollama keeps them resident.
+    """
+
+    def __init__(self, config: dict[str, Any] | None = None) -> None:
+        self.config = config or get_ollama_config()
+        self.task_models: dict[str, str] = {
+            "chat": self.config["chat_model"],
+            "extract": self.config["extract_model"],
+            "generate": self.config["generate_model"],
+        }
+        self.fallback_model: str = self.config["fallback_model"]
+        self.default_concurrency = max(1, env_int("AI_MODEL_CONCURRENCY", 2))
+        self.concurrency_overrides = _parse_concurrency_overrides(os.getenv("AI_MODEL_CONCURRENCY_OVERRIDES"))
+        self.fallback_queue_depth = max(0, env_int("AI_MODEL_FALLBACK_QUEUE_DEPTH", 2))
+        self.keepalive_interval_seconds = max(0, env_int("AI_MODEL_KEEPALIVE_INTERVAL_SECONDS", 240))
+        self._slots: dict[str, _ModelSlots] = {}
+        self._slots_lock = threading.Lock()
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread: threading.Thread | None = None
+
+        for model in self.models():
+            self._get_slots(model)
+
+    def models(self) -> list[str]:
+        models = list(dict.fromkeys(self.task_models.values()))
+        if self.fallback_model and self.fallback_model not in models:
+            models.append(self.fallback_model)
+        return models
+
+    def _get_slots(self, model: str) -> _ModelSlots:
+        with self._slots_lock:
+            slots = self._slots.get(model)
+            if slots is None:
+                limit = self.concurrency_overrides.get(model, self.default_concurrency)
+                slots = _ModelSlots(limit)
+                self._slots[model] = slots
+            return slots
+
+    def select_model(self, task: LLMTask) -> str:
+        primary = self.task_models.get(task, self.task_models["chat"])
+        if not self.fallback_model or self.fallback_model == primary:
+            return primary
+
+        slots = self._get_slots(primary)
+        with slots.condition:
+            pressured = slots.in_flight >= slots.limit and slots.waiting >= self.fallback_queue_depth
+        if not pressured:
+            return primary
+
+        fallback_slots = self._get_slots(self.fallback_model)
+        with fallback_slots.condition:
+            fallback_waiting = fallback_slots.waiting
+        if fallback_waiting < slots.waiting:
+            logger.info(
+                "Routing task=%s to fallback model=%s (primary=%s waiting=%s)",
+                task,
+                self.fallback_model,
+                primary,
+                slots.waiting,
+            )
+            return self.fallback_model
+        return primary
+
+    def _acquire(self, model: str) -> None:
+        slots = self._get_slots(model)
+        with slots.condition:
+            if slots.in_flight < slots.limit and not slots.waiters:
+                slots.in_flight += 1
+                return
+            waiter = _Waiter()
+            slots.waiters.append(waiter)
+            slots.waiting += 1
+            slots.condition.wait_for(lambda: waiter.granted)
+
+    async def _acquire_async(self, model: str) -> None:
+        slots = self._get_slots(model)
+        loop = asyncio.get_running_loop()
+        with slots.condition:
+            if slots.in_flight < slots.limit and not slots.waiters:
+                slots.in_flight += 1
+                return
+            waiter = _Waiter(loop, loop.create_future())
+            slots.waiters.append(waiter)
+            slots.waiting += 1
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with slots.condition:
+                queued = waiter in slots.waiters
+                if queued:
+                    slots.waiters.remove(waiter)
+                    slots.waiting -= 1
+            if not queued and waiter.future.done() and not waiter.future.cancelled():
+                # Granted in the same tick as the cancel; pass the slot on.
+                self._release(model, served=False)
+            raise
+
+    def _deliver(self, model: str, future: asyncio.Future[None]) -> None:
+        if future.done():
+            # The waiter was cancelled after its slot was handed over.
+            self._release(model, served=False)
+        else:
+            future.set_result(None)
+
+    def _release(self, model: str, *, served: bool = True) -> None:
+        slots = self._get_slots(model)
+        with slots.condition:
+            if served:
+                slots.served += 1
+            # Hand the slot straight to the oldest waiter so in_flight never dips.
+            while slots.waiters:
+                waiter = slots.waiters.popleft()
+                slots.waiting -= 1
+                if waiter.loop is None:
+                    waiter.granted = True
+                    slots.condition.notify_all()
+                    return
+                try:
+                    waiter.loop.call_soon_threadsafe(self._deliver, model, waiter.future)
+                except RuntimeError:
+                    continue  # its event loop is closed
+                return
+            slots.in_flight = max(0, slots.in_flight - 1)
+
+    @contextmanager
+    def slot(self, task: LLMTask) -> Iterator[str]:
+        """Block until the routed model has capacity and yield its name."""
+
+        model = self.select_model(task)
+        self._acquire(model)
+        try:
+            yield model
+        finally:
+            self._release(model)
+
+    @asynccontextmanager
+    async def aslot(self, task: LLMTask) -> AsyncIterator[str]:
+        """Async variant of :meth:`slot` for callers on the event loop."""
+
+        model = self.select_model(task)
+        await self._acquire_async(model)
+        try:
+            yield model
+        finally:
+            self._release(model)
+
+    def queue_depth(self) -> dict[str, dict[str, int]]:
+        depth: dict[str, dict[str, int]] = {}
+        with self._slots_lock:
+            items = list(self._slots.items())
+        for model, slots in items:
+            with slots.condition:
+                depth[model] = {
+                    "limit": slots.limit,
+                    "in_flight": slots.in_flight,
+                    "waiting": slots.waiting,
+                    "served": slots.served,
+                }
+        return depth
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "tasks": dict(self.task_models),
+            "fallback_model": self.fallback_model or None,
+            "fallback_queue_depth": self.fallback_queue_depth,
+            "keepalive_interval_seconds": self.keepalive_interval_seconds,
+            "queues": self.queue_depth(),
+        }
+
+    def ping_models(self) -> None:
+        """Ask Ollama to load (or keep loaded) every routed model."""
+
+        url = f"{ollama_native_url(self.config['ollama_url'])}/api/generate"
+        headers = {}
+        if self.config["ollama_api_key"]:
+            headers["Authorization"] = f"Bearer {self.config['ollama_api_key']}"
+
+        with httpx.Client(timeout=httpx.Timeout(timeout=60.0, connect=self.config["connect_timeout_seconds"])) as client:
+            for model in self.models():
+                try:
+                    # An empty generate request only loads the model and resets its keep_alive timer.
+                    response = client.post(
+                        url,
+                        json={"model": model, "keep_alive": self.config["keep_alive"]},
+                        headers=headers,
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as exc:
+                    logger.warning("Keep-alive ping failed model=%s error=%s", model, exc)
+
+    def _keepalive_loop(self) -> None:
+        while not self._keepalive_stop.is_set():
+            self.ping_models()
+            self._keepalive_stop.wait(self.keepalive_interval_seconds)
+
+    def start_keepalive(self) -> None:
+        if self.keepalive_interval_seconds <= 0 or self._keepalive_thread is not None:
+            return
+
+        self._keepalive_stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive_loop,
+            name="ollama-keepalive",
+            daemon=True,
+        )
+        self._keepalive_thread.start()
+        logger.info(
+            "Model keep-alive started models=%s interval=%ss",
+            self.models(),
+            self.keepalive_interval_seconds,
+        )
+
+    def stop_keepalive(self) -> None:
+        self._keepalive_stop.set()
+        if self._keepalive_thread is not None:
+            self._keepalive_thread.join(timeout=5.0)
+            self._keepalive_thread = None
+
+
+_router: ModelRouter | None = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter()
+    return _router
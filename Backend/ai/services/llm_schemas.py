@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def _inline_refs(node: Any, definitions: dict[str, Any]) -> Any:
+    if isinstance(node, dict):
+        reference = node.get("$ref")
+        if isinstance(reference, str) and reference.startswith("#/$defs/"):
+            target = definitions.get(reference.rsplit("/", 1)[-1], {})
+            return _inline_refs(deepcopy(target), definitions)
+
+        return {
+            key: _inline_refs(value, definitions)
+            for key, value in node.items()
+            if key != "$defs" and not (key == "title" and isinstance(value, str))
+        }
+
+    if isinstance(node, list):
+        return [_inline_refs(item, definitions) for item in node]
+
+    return node
+
+
+def schema_from_model(model: type[BaseModel]) -> dict[str, Any]:
+    """Build a self-contained JSON schema for constrained LLM decoding.
+
+    Ollama turns the schema into a sampling grammar, so local ``$ref``
+    pointers are inlined and cosmetic ``title`` keys are dropped.
+    """
+
+    schema = model.model_json_schema()
+    return _inline_refs(schema, schema.get("$defs", {}))
+
+
+def array_schema(item_schema: dict[str, Any], length: int | None = None) -> dict[str, Any]:
+    schema: dict[str, Any] = {"type": "array", "items": item_schema}
+    if length is not None:
+        schema["minItems"] = length
+        schema["maxItems"] = length
+    return schema
@@ -3,15 +3,31 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
+import time
 from copy import deepcopy
-from typing import Any, Literal
+from typing import Any, Literal, Union
 
 import httpx
 
+from services.env import env_bool, env_float, env_int
+from services.json_stream import IncrementalJsonParser
+from services.metrics import (
+    record_llm_request,
+    record_ollama_timings,
+    record_time_to_first_token,
+    register_httpx_client,
+)
+from services.tracing import current_span, span, traced
+
 
 logger = logging.getLogger(__name__)
 
-LLMTask = Literal["chat", "extract"]
+LLMTask = Literal["chat", "extract", "generate"]
+LLM_TASKS = ("chat", "extract", "generate")
+OllamaApiMode = Literal["openai", "native"]
+# "json" asks for any valid JSON; a dict is a JSON schema the output must follow.
+ResponseFormat = Union[Literal["json"], dict[str, Any], None]
 
 SAFE_EXTRACT_FALLBACK = {
     "skills": [],
@@ -22,17 +38,6 @@ SAFE_EXTRACT_FALLBACK = {
 }
 
 
-def _env_float(name: str, default: float) -> float:
-    raw = os.getenv(name)
-    if raw is None or str(raw).strip() == "":
-        return default
-
-    try:
-        return float(raw)
-    except (TypeError, ValueError):
-        return default
-
-
 def normalize_ollama_url(raw_url: str | None) -> str:
     cleaned = (raw_url or "http://localhost:11434").strip().rstrip("/")
     if not cleaned.endswith("/v1"):
@@ -40,6 +45,18 @@ def normalize_ollama_url(raw_url: str | None) -> str:
     return cleaned
 
 
+def ollama_native_url(ollama_url: str) -> str:
+    cleaned = (ollama_url or "").strip().rstrip("/")
+    if cleaned.endswith("/v1"):
+        cleaned = cleaned[:-3]
+    return cleaned
+
+
+def normalize_api_mode(raw_mode: str | None) -> OllamaApiMode:
+    mode = (raw_mode or "").strip().lower()
+    return "native" if mode == "native" else "openai"
+
+
 def get_ollama_config() -> dict[str, Any]:
     chat_model = (
         os.getenv("OLLAMA_MODEL_CHAT")
@@ -50,16 +67,30 @@ def get_ollama_config() -> dict[str, Any]:
         os.getenv("OLLAMA_MODEL_EXTRACT")
         or chat_model
     ).strip()
+    generate_model = (
+        os.getenv("OLLAMA_MODEL_GENERATE")
+        or chat_model
+    ).strip()
+    chat_num_ctx = max(512, env_int("AI_NUM_CTX_CHAT", 4096))
 
     return {
         "ollama_url": normalize_ollama_url(os.getenv("OLLAMA_URL", "http://localhost:11434/v1")),
         "ollama_api_key": os.getenv("OLLAMA_API_KEY", "ollama").strip(),
         "chat_model": chat_model,
         "extract_model": extract_model,
-        "timeout_seconds": max(5.0, _env_float("AI_TIMEOUT_SECONDS", 300.0)),
-        "connect_timeout_seconds": max(1.0, _env_float("AI_CONNECT_TIMEOUT_SECONDS", 10.0)),
-        "chat_temperature": _env_float("AI_TEMPERATURE", 0.7),
-        "extract_temperature": _env_float("AI_EXTRACT_TEMPERATURE", 0.0),
+        "generate_model": generate_model,
+        "fallback_model": (os.getenv("OLLAMA_MODEL_FALLBACK") or "").strip(),
+        "timeout_seconds": max(5.0, env_float("AI_TIMEOUT_SECONDS", 300.0)),
+        "connect_timeout_seconds": max(1.0, env_float("AI_CONNECT_TIMEOUT_SECONDS", 10.0)),
+        "chat_temperature": env_float("AI_TEMPERATURE", 0.7),
+        "extract_temperature": env_float("AI_EXTRACT_TEMPERATURE", 0.0),
+        "api_mode": normalize_api_mode(os.getenv("OLLAMA_API_MODE")),
+        "keep_alive": (os.getenv("OLLAMA_KEEP_ALIVE") or "30m").strip(),
+        "chat_num_ctx": chat_num_ctx,
+        "extract_num_ctx": max(512, env_int("AI_NUM_CTX_EXTRACT", 2048)),
+        "generate_num_ctx": max(512, env_int("AI_NUM_CTX_GENERATE", chat_num_ctx)),
+        "structured_output": env_bool("AI_STRUCTURED_OUTPUT", True),
+        "json_early_stop": env_bool("AI_JSON_EARLY_STOP", True),
     }
 
 
@@ -67,9 +98,19 @@ def get_model_for_task(task: LLMTask) -> str:
     config = get_ollama_config()
     if task == "extract":
         return config["extract_model"]
+    if task == "generate":
+        return config["generate_model"]
     return config["chat_model"]
 
 
+def get_task_options(task: LLMTask, config: dict[str, Any] | None = None) -> dict[str, Any]:
+    config = config or get_ollama_config()
+    return {
+        "keep_alive": config["keep_alive"],
+        "num_ctx": config.get(f"{task}_num_ctx", config["chat_num_ctx"]),
+    }
+
+
 def build_messages(system_prompt: str, user_prompt: str) -> list[dict[str, str]]:
     return [
         {"role": "system", "content": system_prompt},
@@ -78,17 +119,133 @@ def build_messages(system_prompt: str, user_prompt: str) -> list[dict[str, str]]
 
 
 def _build_httpx_client(config: dict[str, Any]) -> httpx.Client:
+    max_connections = max(1, env_int("AI_LLM_MAX_CONNECTIONS", 20))
     return httpx.Client(
         base_url=config["ollama_url"],
         timeout=httpx.Timeout(
             timeout=config["timeout_seconds"],
             connect=config["connect_timeout_seconds"],
         ),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
         headers={"Content-Type": "application/json"},
     )
 
 
-def _extract_text_from_payload(payload: dict[str, Any]) -> str:
+_shared_clients: dict[tuple[str, float, float], httpx.Client] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_httpx_client(config: dict[str, Any]) -> httpx.Client:
+    """Return a pooled client for ``config`` so sync calls reuse connections."""
+
+    key = (config["ollama_url"], config["timeout_seconds"], config["connect_timeout_seconds"])
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None or client.is_closed:
+            client = _build_httpx_client(config)
+            _shared_clients[key] = client
+            register_httpx_client("llm_sync", client)
+        return client
+
+
+def close_shared_httpx_clients() -> None:
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        client.close()
+
+
+def build_completion_request(
+    *,
+    model: str,
+    messages: list[dict[str, Any]],
+    temperature: float,
+    api_mode: OllamaApiMode,
+    ollama_url: str,
+    keep_alive: str,
+    num_ctx: int,
+    response_format: ResponseFormat = None,
+    stream: bool = False,
+) -> tuple[str, dict[str, Any]]:
+    # Ollama's OpenAI-compatible layer ignores runtime options, so keep_alive
+    # and num_ctx only take effect through the native /api/chat endpoint.
+    if api_mode == "native":
+        payload: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "keep_alive": keep_alive,
+            "options": {
+                "temperature": temperature,
+                "num_ctx": num_ctx,
+            },
+        }
+        if response_format is not None:
+            payload["format"] = response_format
+        return f"{ollama_native_url(ollama_url)}/api/chat", payload
+
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+    }
+    if stream:
+        payload["stream"] = True
+    if response_format == "json":
+        payload["response_format"] = {"type": "json_object"}
+    elif isinstance(response_format, dict):
+        payload["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "response", "schema": response_format},
+        }
+    return "/chat/completions", payload
+
+
+def extract_stream_chunk_text(line: str, api_mode: OllamaApiMode) -> str | None:
+    """Return the text delta carried by one streamed response line."""
+
+    cleaned = line.strip()
+    if not cleaned:
+        return None
+
+    if api_mode == "openai":
+        if not cleaned.startswith("data:"):
+            return None
+        cleaned = cleaned[5:].strip()
+        if cleaned == "[DONE]":
+            return None
+
+    try:
+        chunk = json.loads(cleaned)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(chunk, dict):
+        return None
+
+    native_message = chunk.get("message")
+    if isinstance(native_message, dict):
+        content = native_message.get("content")
+        return content if isinstance(content, str) else None
+
+    choices = chunk.get("choices")
+    if isinstance(choices, list) and choices:
+        delta = choices[0].get("delta") or {}
+        content = delta.get("content")
+        return content if isinstance(content, str) else None
+
+    return None
+
+
+def extract_completion_text(payload: dict[str, Any]) -> str:
+    native_message = payload.get("message")
+    if isinstance(native_message, dict):
+        content = native_message.get("content")
+        return content if isinstance(content, str) else ""
+
     choices = payload.get("choices")
     if not isinstance(choices, list) or not choices:
         return ""
@@ -116,24 +273,78 @@ def _request_completion(
     messages: list[dict[str, Any]],
     model: str,
     config: dict[str, Any],
+    response_format: ResponseFormat = None,
 ) -> str | None:
-    payload = {
-        "model": model,
-        "messages": messages,
-        "temperature": (
+    task_options = get_task_options(task, config)
+    stream = response_format is not None and config["json_early_stop"]
+    url, payload = build_completion_request(
+        model=model,
+        messages=messages,
+        temperature=(
             config["extract_temperature"] if task == "extract" else config["chat_temperature"]
         ),
-    }
+        api_mode=config["api_mode"],
+        ollama_url=config["ollama_url"],
+        keep_alive=task_options["keep_alive"],
+        num_ctx=task_options["num_ctx"],
+        response_format=response_format,
+        stream=stream,
+    )
     headers = {}
     if config["ollama_api_key"]:
         headers["Authorization"] = f"Bearer {config['ollama_api_key']}"
 
-    with _build_httpx_client(config) as client:
-        response = client.post("/chat/completions", json=payload, headers=headers)
+    client = get_shared_httpx_client(config)
+    if stream:
+        return _stream_json_completion(
+            client,
+            url,
+            payload,
+            headers,
+            config["api_mode"],
+            task=task,
+            model=model,
+        )
+
+    response = client.post(url, json=payload, headers=headers)
+    response.raise_for_status()
+    response_payload = response.json()
+    record_ollama_timings(task, model, response_payload)
+    text = extract_completion_text(response_payload).strip()
+    return text or None
+
+
+def _stream_json_completion(
+    client: httpx.Client,
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str],
+    api_mode: OllamaApiMode,
+    *,
+    task: LLMTask,
+    model: str,
+) -> str | None:
+    parser = IncrementalJsonParser()
+    pieces: list[str] = []
+    started = time.perf_counter()
+
+    with client.stream("POST", url, json=payload, headers=headers) as response:
         response.raise_for_status()
-        response_payload = response.json()
-        text = _extract_text_from_payload(response_payload).strip()
-        return text or None
+        for line in response.iter_lines():
+            piece = extract_stream_chunk_text(line, api_mode)
+            if not piece:
+                continue
+
+            if not pieces:
+                record_time_to_first_token(task, model, time.perf_counter() - started)
+            pieces.append(piece)
+            if parser.feed(piece):
+                # Leaving the block closes the connection, which makes Ollama
+                # abort the rest of the generation.
+                return parser.text
+
+    text = "".join(pieces).strip()
+    return text or None
 
 
 def _try_parse_json(text: str) -> Any | None:
@@ -190,12 +401,51 @@ def _build_extract_retry_messages(messages: list[dict[str, Any]]) -> list[dict[s
     return retry_messages
 
 
-def call_llm(task: LLMTask, messages: list[dict[str, Any]]) -> str | dict[str, Any] | list[Any] | None:
-    if task not in {"chat", "extract"}:
-        raise ValueError("task must be either 'chat' or 'extract'")
+@traced("llm.call_llm")
+def call_llm(
+    task: LLMTask,
+    messages: list[dict[str, Any]],
+    *,
+    response_format: ResponseFormat = None,
+) -> str | dict[str, Any] | list[Any] | None:
+    """Run one completion for ``task``.
+
+    ``extract`` returns parsed JSON and defaults to JSON mode. Other tasks
+    return text; pass ``response_format`` when the caller parses JSON itself.
+    """
+
+    if task not in LLM_TASKS:
+        raise ValueError("task must be one of 'chat', 'extract' or 'generate'")
+
+    from services.llm_router import get_model_router
+
+    router = get_model_router()
+    config = router.config
+    if not config["structured_output"]:
+        response_format = None
+    elif response_format is None and task == "extract":
+        response_format = "json"
+
+    with router.slot(task) as model:
+        current_span().set_attribute("llm.task", task)
+        current_span().set_attribute("llm.model", model)
+        return _call_llm_with_model(
+            task,
+            messages,
+            model=model,
+            config=config,
+            response_format=response_format,
+        )
+
 
-    config = get_ollama_config()
-    model = get_model_for_task(task)
+def _call_llm_with_model(
+    task: LLMTask,
+    messages: list[dict[str, Any]],
+    *,
+    model: str,
+    config: dict[str, Any],
+    response_format: ResponseFormat = None,
+) -> str | dict[str, Any] | list[Any] | None:
     attempt_messages = deepcopy(messages)
 
     for attempt in range(2):
@@ -205,23 +455,36 @@ def call_llm(task: LLMTask, messages: list[dict[str, Any]]) -> str | dict[str, A
             model,
             attempt + 1,
         )
+        started = time.perf_counter()
         try:
-            response_text = _request_completion(
-                task=task,
-                messages=attempt_messages,
-                model=model,
-                config=config,
-            )
+            with span("llm.request", **{"llm.model": model, "llm.attempt": attempt + 1}):
+                response_text = _request_completion(
+                    task=task,
+                    messages=attempt_messages,
+                    model=model,
+                    config=config,
+                    response_format=response_format,
+                )
         except httpx.TimeoutException:
+            record_llm_request(task, model, time.perf_counter() - started, "timeout")
             logger.exception("Timed out calling LLM task=%s model=%s", task, model)
             return deepcopy(SAFE_EXTRACT_FALLBACK) if task == "extract" else None
         except httpx.HTTPError:
+            record_llm_request(task, model, time.perf_counter() - started, "error")
             logger.exception("HTTP failure while calling LLM task=%s model=%s", task, model)
             return deepcopy(SAFE_EXTRACT_FALLBACK) if task == "extract" else None
         except Exception:
+            record_llm_request(task, model, time.perf_counter() - started, "error")
             logger.exception("Unexpected LLM failure task=%s model=%s", task, model)
             return deepcopy(SAFE_EXTRACT_FALLBACK) if task == "extract" else None
 
+        record_llm_request(
+            task,
+            model,
+            time.perf_counter() - started,
+            "ok" if response_text else "empty",
+        )
+
         if not response_text:
             logger.warning(
                 "Empty LLM response task=%s model=%s attempt=%s",
@@ -237,7 +500,7 @@ def call_llm(task: LLMTask, messages: list[dict[str, Any]]) -> str | dict[str, A
 
             return deepcopy(SAFE_EXTRACT_FALLBACK) if task == "extract" else None
 
-        if task == "chat":
+        if task != "extract":
             return response_text
 
         parsed_json = _try_parse_json(response_text)
@@ -261,16 +524,89 @@ def call_llm(task: LLMTask, messages: list[dict[str, Any]]) -> str | dict[str, A
     return deepcopy(SAFE_EXTRACT_FALLBACK) if task == "extract" else None
 
 
+def extract_completion_message(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return the assistant message of a reply, native or OpenAI-compatible."""
+
+    native_message = payload.get("message")
+    if isinstance(native_message, dict):
+        return native_message
+
+    choices = payload.get("choices")
+    if isinstance(choices, list) and choices and isinstance(choices[0], dict):
+        message = choices[0].get("message")
+        if isinstance(message, dict):
+            return message
+    return {}
+
+
+@traced("llm.call_llm_with_tools")
+def call_llm_with_tools(
+    task: LLMTask,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]],
+) -> dict[str, Any] | None:
+    """Run one non-streamed completion that may answer with ``tool_calls``.
+
+    Returns the assistant message as the backend sent it, so it can be
+    appended to the conversation unchanged, or ``None`` on failure.
+    """
+
+    if task not in LLM_TASKS:
+        raise ValueError("task must be one of 'chat', 'extract' or 'generate'")
+
+    from services.llm_router import get_model_router
+
+    router = get_model_router()
+    config = router.config
+    with router.slot(task) as model:
+        current_span().set_attribute("llm.task", task)
+        current_span().set_attribute("llm.model", model)
+        task_options = get_task_options(task, config)
+        url, payload = build_completion_request(
+            model=model,
+            messages=messages,
+            temperature=config["extract_temperature"] if task == "extract" else config["chat_temperature"],
+            api_mode=config["api_mode"],
+            ollama_url=config["ollama_url"],
+            keep_alive=task_options["keep_alive"],
+            num_ctx=task_options["num_ctx"],
+        )
+        payload["tools"] = tools
+        headers = {}
+        if config["ollama_api_key"]:
+            headers["Authorization"] = f"Bearer {config['ollama_api_key']}"
+
+        logger.info("Calling LLM with %s tools task=%s model=%s", len(tools), task, model)
+        started = time.perf_counter()
+        try:
+            with span("llm.request", **{"llm.model": model, "llm.tools": len(tools)}):
+                response = get_shared_httpx_client(config).post(url, json=payload, headers=headers)
+                response.raise_for_status()
+                response_payload = response.json()
+        except httpx.TimeoutException:
+            record_llm_request(task, model, time.perf_counter() - started, "timeout")
+            logger.exception("Timed out calling LLM with tools task=%s model=%s", task, model)
+            return None
+        except Exception:
+            record_llm_request(task, model, time.perf_counter() - started, "error")
+            logger.exception("LLM tool-calling request failed task=%s model=%s", task, model)
+            return None
+
+        message = extract_completion_message(response_payload)
+        record_llm_request(task, model, time.perf_counter() - started, "ok" if message else "empty")
+        record_ollama_timings(task, model, response_payload)
+        return message or None
+
+
 def list_available_models() -> list[str]:
     config = get_ollama_config()
     headers = {}
     if config["ollama_api_key"]:
         headers["Authorization"] = f"Bearer {config['ollama_api_key']}"
 
-    with _build_httpx_client(config) as client:
-        response = client.get("/models", headers=headers)
-        response.raise_for_status()
-        payload = response.json()
+    response = get_shared_httpx_client(config).get("/models", headers=headers)
+    response.raise_for_status()
+    payload = response.json()
 
     models = payload.get("data", [])
     if not isinstance(models, list):
@@ -0,0 +1,401 @@
+"""In-memory BM25 retrieval over stored market signals, for grounding chat answers.
+
+Three kinds of document are indexed:
+
+- ``trends``: one per role, the role's top skills from ``market_role_trends``
+  with how many scraped pages mention each;
+- ``source``: one per row of ``market_trend_sources`` (title, publisher, role);
+- ``signal``: the title and first requirements of each parsed page from the
+  latest refresh of a role. Parsed signals are not persisted, so these only
+  exist in the worker that ran the refresh.
+
+The index is updated incrementally. ``refresh_trends_for_role`` hands its
+rows, search hits and parsed signals to ``index_market_refresh`` right after
+storing them, and a background thread pulls rows changed since its last
+watermark from Postgres every ``AI_MARKET_RETRIEVAL_REFRESH_SECONDS`` so
+refreshes run by other workers show up too. Only the changed documents are
+re-tokenised; nothing is rebuilt.
+
+``retrieve`` scores the question with BM25 (k1=1.2, b=0.75) and boosts
+documents about the user's target role, compared through the role taxonomy so
+"Data Engineer" and "data engineering" group together. That role's demand
+summary always comes first. The best snippets are then kept greedily while
+they fit the token budget (about four characters per token); any that would
+overflow it are skipped, and at most two title-only sources are used.
+Searches only walk the postings of the question's terms, which takes a
+millisecond or two on a few thousand documents.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+
+from services.env import env_float
+from services.role_taxonomy import get_role_taxonomy, normalize_role_text
+from services.skill_taxonomy import tokenize
+
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+ROLE_BOOST = 1.5
+CHARS_PER_TOKEN = 4
+MAX_SNIPPET_CHARS = 320
+MAX_TREND_SKILLS = 12
+MAX_SIGNALS_PER_ROLE = 20
+MAX_SIGNAL_REQUIREMENTS = 6
+TREND_PAGE_ROLES = 200
+# source documents are little more than a page title, so a few are enough
+MAX_PER_KIND = {"trends": 2, "source": 2}
+
+# words that appear in most questions and say nothing about the market
+QUERY_STOPWORDS = frozenset(
+    word.encode()
+    for word in (
+        "a", "an", "and", "are", "as", "at", "be", "can", "do", "does", "for", "from", "how", "i",
+        "in", "is", "it", "me", "my", "of", "on", "or", "should", "so", "that", "the", "this",
+        "to", "what", "when", "which", "who", "why", "will", "with", "you", "your",
+    )
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _clip(text: str, limit: int = MAX_SNIPPET_CHARS) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1].rsplit(" ", 1)[0] + "…"
+
+
+def _role_group(role: str) -> str:
+    """Taxonomy key for ``role`` when it resolves, else its normalised text."""
+
+    found = get_role_taxonomy().match(role)
+    return found.key if found is not None else normalize_role_text(role)
+
+
+@dataclass(frozen=True, slots=True)
+class MarketSnippet:
+    doc_id: str
+    kind: str
+    role: str
+    text: str
+    score: float = 0.0
+
+
+class BM25Index:
+    """Okapi BM25 over documents that can be added, replaced and removed one at a time."""
+
+    __slots__ = ("k1", "b", "_postings", "_lengths", "_terms", "_total_length")
+
+    def __init__(self, *, k1: float = BM25_K1, b: float = BM25_B) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[bytes, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._terms: dict[str, dict[bytes, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def upsert(self, doc_id: str, tokens: Sequence[bytes]) -> None:
+        self.remove(doc_id)
+        counts: dict[bytes, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            self._postings.setdefault(token, {})[doc_id] = count
+        self._terms[doc_id] = counts
+        self._lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: str) -> None:
+        counts = self._terms.pop(doc_id, None)
+        if counts is None:
+            return
+        for token in counts:
+            posting = self._postings[token]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[token]
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def scores(self, tokens: Iterable[bytes]) -> dict[str, float]:
+        """BM25 score of every document containing at least one of ``tokens``."""
+
+        total_docs = len(self._lengths)
+        if not total_docs:
+            return {}
+        average_length = self._total_length / total_docs or 1.0
+
+        scores: dict[str, float] = {}
+        for token in set(tokens):
+            posting = self._postings.get(token)
+            if not posting:
+                continue
+            frequency = len(posting)
+            idf = math.log(1.0 + (total_docs - frequency + 0.5) / (frequency + 0.5))
+            for doc_id, count in posting.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (self.k1 + 1.0) / (count + norm)
+        return scores
+
+
+@dataclass(slots=True)
+class MarketRetriever:
+    """The index, its documents and the DB watermarks, behind one lock."""
+
+    refresh_seconds: float = 300.0
+    _index: BM25Index = field(default_factory=BM25Index)
+    _documents: dict[str, MarketSnippet] = field(default_factory=dict)
+    _groups: dict[str, str] = field(default_factory=dict)
+    _signal_ids: dict[str, list[str]] = field(default_factory=dict)
+    _trends_by_group: dict[str, str] = field(default_factory=dict)
+    _trends_since: datetime | None = None
+    _sources_since: datetime | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _put(self, doc_id: str, kind: str, role: str, text: str) -> None:
+        # tokenising and role grouping happen before the lock is taken
+        snippet = MarketSnippet(doc_id=doc_id, kind=kind, role=role, text=_clip(text))
+        tokens = tokenize(snippet.text)
+        group = _role_group(role)
+        with self._lock:
+            self._index.upsert(doc_id, tokens)
+            self._documents[doc_id] = snippet
+            self._groups[doc_id] = group
+            if kind == "trends":
+                self._trends_by_group[group] = doc_id
+
+    def _drop(self, doc_ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in doc_ids:
+                self._index.remove(doc_id)
+                self._documents.pop(doc_id, None)
+                group = self._groups.pop(doc_id, None)
+                if group is not None and self._trends_by_group.get(group) == doc_id:
+                    del self._trends_by_group[group]
+
+    def index_role_trends(self, role: str, rows: Sequence[dict[str, Any]]) -> None:
+        """Replace the role's trend summary; no rows removes it."""
+
+        doc_id = f"trends:{normalize_role_text(role)}"
+        ranked = sorted(
+            (row for row in rows if str(row.get("skill") or "").strip()),
+            key=lambda row: (-int(row.get("frequency") or 0), str(row.get("skill"))),
+        )[:MAX_TREND_SKILLS]
+        if not ranked:
+            self._drop([doc_id])
+            return
+
+        skills = ", ".join(f"{row['skill']} {int(row.get('frequency') or 0)}" for row in ranked)
+        categories = ", ".join(dict.fromkeys(str(row.get("category") or "tooling") for row in ranked))
+        text = f"{role} market demand (skill: pages mentioning it): {skills}. Areas: {categories}."
+        self._put(doc_id, "trends", role, text)
+
+    def index_sources(self, rows: Iterable[dict[str, Any]]) -> None:
+        for row in rows:
+            role = str(row.get("role") or "").strip()
+            url = str(row.get("url") or "").strip()
+            if not role or not url:
+                continue
+            title = str(row.get("title") or "").strip() or url
+            publisher = str(row.get("source") or "").strip()
+            text = f"{role} source: {title}" + (f" ({publisher})" if publisher else "")
+            self._put(f"source:{normalize_role_text(role)}:{url}", "source", role, text)
+
+    def index_signals(self, role: str, signals: Sequence[Any]) -> None:
+        """Replace the role's parsed-signal documents with the latest refresh's."""
+
+        role_key = normalize_role_text(role)
+        with self._lock:
+            previous = self._signal_ids.pop(role_key, [])
+        self._drop(previous)
+
+        doc_ids: list[str] = []
+        for position, signal in enumerate(signals[:MAX_SIGNALS_PER_ROLE]):
+            requirements = [str(item).strip() for item in getattr(signal, "requirements", ()) if str(item).strip()]
+            title = str(getattr(signal, "title", "") or "").strip()
+            if not title and not requirements:
+                continue
+            body = "; ".join(requirements[:MAX_SIGNAL_REQUIREMENTS])
+            doc_id = f"signal:{role_key}:{position}"
+            self._put(doc_id, "signal", role, f"{role} posting: {title}" + (f" - {body}" if body else ""))
+            doc_ids.append(doc_id)
+
+        with self._lock:
+            self._signal_ids[role_key] = doc_ids
+
+    def refresh_from_db(self) -> int:
+        """Index trend and source rows written since the last pull; returns documents touched."""
+
+        from market_intelligence_service.storage import get_role_trends_since, get_sources_since
+
+        touched = 0
+        latest = self._trends_since
+        after_role: str | None = None
+        while True:
+            page = get_role_trends_since(self._trends_since, after_role=after_role, role_limit=TREND_PAGE_ROLES)
+            if page is None:
+                # keep the watermark so the roles not read yet come back on the next pull
+                latest = self._trends_since
+                break
+            by_role: dict[str, list[dict[str, Any]]] = {}
+            for row in page:
+                by_role.setdefault(str(row.get("role") or ""), []).append(row)
+            for role, rows in by_role.items():
+                if role:
+                    self.index_role_trends(role, rows)
+            touched += len(by_role)
+            latest = max(
+                (row["updated_at"] for row in page if row.get("updated_at")),
+                default=latest,
+            )
+            if len(by_role) < TREND_PAGE_ROLES:
+                break
+            # rows arrive in the database's role order, so the last one is the keyset cursor
+            after_role = page[-1]["role"]
+
+        source_rows = get_sources_since(self._sources_since)
+        self.index_sources(source_rows)
+
+        # ">=" on the next pull re-reads rows stamped at the watermark; re-indexing them is harmless
+        self._trends_since = latest
+        self._sources_since = max(
+            (row["created_at"] for row in source_rows if row.get("created_at")),
+            default=self._sources_since,
+        )
+        return touched + len(source_rows)
+
+    def retrieve(
+        self,
+        query: str,
+        *,
+        role: str | None = None,
+        k: int = 5,
+        token_budget: int = 300,
+    ) -> list[MarketSnippet]:
+        """The best ``k`` snippets for ``query`` whose combined size fits ``token_budget``."""
+
+        if k <= 0 or token_budget <= 0:
+            return []
+        tokens = [token for token in tokenize(query) if token not in QUERY_STOPWORDS]
+        group = _role_group(role) if role else None
+        if not tokens and group is None:
+            return []
+
+        with self._lock:
+            scores = self._index.scores(tokens)
+            candidates: list[tuple[MarketSnippet, float]] = []
+            if group is not None:
+                for doc_id in scores:
+                    if self._groups.get(doc_id) == group:
+                        scores[doc_id] *= ROLE_BOOST
+                # the target role's demand summary leads whether or not the question names a skill
+                pinned = self._trends_by_group.get(group)
+                if pinned is not None:
+                    candidates.append((self._documents[pinned], scores.pop(pinned, 0.0)))
+            ranked = heapq.nlargest(max(4 * k, 32), scores.items(), key=lambda item: item[1])
+            candidates.extend((self._documents[doc_id], score) for doc_id, score in ranked)
+
+        selected: list[MarketSnippet] = []
+        per_kind: dict[str, int] = {}
+        remaining = token_budget
+        for snippet, score in candidates:
+            # one extra token per snippet for the list marker and line break
+            cost = estimate_tokens(snippet.text) + 1
+            if cost > remaining or per_kind.get(snippet.kind, 0) >= MAX_PER_KIND.get(snippet.kind, k):
+                continue
+            selected.append(MarketSnippet(snippet.doc_id, snippet.kind, snippet.role, snippet.text, round(score, 4)))
+            per_kind[snippet.kind] = per_kind.get(snippet.kind, 0) + 1
+            remaining -= cost
+            if len(selected) >= k or remaining <= 1:
+                break
+        return selected
+
+    def start(self) -> None:
+        if self.refresh_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="market-retrieval-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout=5.0)
+        self._thread = None
+
+    def _watch(self) -> None:
+        # the first pull runs right away so a fresh worker can answer from stored trends
+        while True:
+            try:
+                touched = self.refresh_from_db()
+                if touched:
+                    logger.info("Market retrieval index updated (%d documents touched, %d total)", touched, len(self))
+            except Exception:
+                logger.exception("Market retrieval refresh failed")
+            if self._stop.wait(self.refresh_seconds):
+                return
+
+
+_retriever: MarketRetriever | None = None
+_retriever_lock = threading.Lock()
+
+
+def get_market_retriever() -> MarketRetriever:
+    global _retriever
+    if _retriever is None:
+        with _retriever_lock:
+            if _retriever is None:
+                _retriever = MarketRetriever(
+                    refresh_seconds=max(0.0, env_float("AI_MARKET_RETRIEVAL_REFRESH_SECONDS", 300.0)),
+                )
+    return _retriever
+
+
+def index_market_refresh(
+    role: str,
+    trend_rows: Sequence[dict[str, Any]],
+    *,
+    sources: Iterable[Any] = (),
+    signals: Sequence[Any] = (),
+) -> None:
+    """Fold one finished market refresh into this worker's index. Never raises."""
+
+    try:
+        retriever = get_market_retriever()
+        retriever.index_role_trends(role, trend_rows)
+        retriever.index_sources(
+            {"role": role, "url": item.url, "title": item.title, "source": item.source} for item in sources
+        )
+        retriever.index_signals(role, signals)
+    except Exception:
+        logger.exception("Indexing market refresh for role=%s failed", role)
+
+
+def start_market_retrieval() -> None:
+    get_market_retriever().start()
+
+
+def stop_market_retrieval() -> None:
+    if _retriever is not None:
+        _retriever.stop()
@@ -0,0 +1,252 @@
+"""Prometheus metrics for the AI service.
+
+Everything is registered on the default ``prometheus_client`` registry and
+served by ``GET /metrics``. Connection pools are not polled in the
+background: asyncpg pools and httpx clients are registered once and read at
+scrape time by ``PoolCollector``.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+from urllib.parse import urlparse
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from services.tracing import span
+
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# LLM calls run from sub-second extractions to multi-minute generations.
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "ai_http_request_duration_seconds",
+    "Time spent serving an HTTP request, by route template.",
+    ("method", "route", "status"),
+    buckets=HTTP_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "ai_http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ("method",),
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "ai_llm_request_duration_seconds",
+    "Wall time of one LLM completion request.",
+    ("task", "model", "outcome"),
+    buckets=LLM_BUCKETS,
+)
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = Histogram(
+    "ai_llm_time_to_first_token_seconds",
+    "Time until the first generated token: measured on streams, "
+    "otherwise load plus prompt-eval time reported by Ollama.",
+    ("task", "model"),
+    buckets=LLM_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "ai_db_query_duration_seconds",
+    "Time spent in one repository/storage function.",
+    ("function", "outcome"),
+    buckets=FAST_BUCKETS,
+)
+SCRAPER_FETCH_SECONDS = Histogram(
+    "ai_scraper_fetch_duration_seconds",
+    "Time to fetch one page, retries included.",
+    ("host", "outcome"),
+    buckets=HTTP_BUCKETS,
+)
+PARSER_DOCUMENT_SECONDS = Histogram(
+    "ai_parser_document_duration_seconds",
+    "Time to parse one scraped document.",
+    ("outcome",),
+    buckets=FAST_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "ai_cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+PROFILE_WRITE_FAILURES = Counter(
+    "ai_profile_write_failures_total",
+    "Failed queued AI-profile writes by outcome (retry or dropped).",
+    ("outcome",),
+)
+
+
+def _outcome(error: BaseException | None) -> str:
+    return "ok" if error is None else "error"
+
+
+@contextmanager
+def observe_seconds(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Time the block into ``histogram``, labelled with ``outcome`` ok/error."""
+
+    started = time.perf_counter()
+    error: BaseException | None = None
+    try:
+        yield
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        histogram.labels(outcome=_outcome(error), **labels).observe(time.perf_counter() - started)
+
+
+def timed_db(fn: F) -> F:
+    """Record ``DB_QUERY_SECONDS`` and a ``db.*`` span for a repository function."""
+
+    name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(f"db.{name}"), observe_seconds(DB_QUERY_SECONDS, function=name):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(f"db.{name}"), observe_seconds(DB_QUERY_SECONDS, function=name):
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_profile_write_failure(dropped: bool) -> None:
+    PROFILE_WRITE_FAILURES.labels(outcome="dropped" if dropped else "retry").inc()
+
+
+def record_llm_request(task: str, model: str, seconds: float, outcome: str) -> None:
+    LLM_REQUEST_SECONDS.labels(task=task, model=model, outcome=outcome).observe(seconds)
+
+
+def record_time_to_first_token(task: str, model: str, seconds: float) -> None:
+    LLM_TIME_TO_FIRST_TOKEN_SECONDS.labels(task=task, model=model).observe(seconds)
+
+
+def record_ollama_timings(task: str, model: str, payload: Any) -> None:
+    """Derive time-to-first-token from a non-streamed native Ollama reply.
+
+    Native replies carry ``load_duration`` and ``prompt_eval_duration`` in
+    nanoseconds; the OpenAI-compatible layer drops them, so nothing is
+    recorded in that mode.
+    """
+
+    if not isinstance(payload, dict):
+        return
+    load_ns = payload.get("load_duration")
+    prompt_ns = payload.get("prompt_eval_duration")
+    if not isinstance(load_ns, (int, float)) and not isinstance(prompt_ns, (int, float)):
+        return
+    total_ns = (load_ns or 0) + (prompt_ns or 0)
+    record_time_to_first_token(task, model, total_ns / 1e9)
+
+
+def scraper_host(url: str) -> str:
+    return (urlparse(url).hostname or "unknown").lower()
+
+
+class PoolCollector:
+    """Reports asyncpg pool and httpx connection-pool saturation at scrape time."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._asyncpg_pools: dict[str, weakref.ref[Any]] = {}
+        self._httpx_clients: dict[str, weakref.ref[Any]] = {}
+
+    def register_asyncpg_pool(self, name: str, pool: Any) -> None:
+        with self._lock:
+            self._asyncpg_pools[name] = weakref.ref(pool)
+
+    def register_httpx_client(self, name: str, client: Any) -> None:
+        with self._lock:
+            self._httpx_clients[name] = weakref.ref(client)
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        db_size = GaugeMetricFamily("ai_db_pool_connections", "asyncpg pool connections.", labels=("pool",))
+        db_idle = GaugeMetricFamily("ai_db_pool_idle_connections", "Idle asyncpg pool connections.", labels=("pool",))
+        db_max = GaugeMetricFamily("ai_db_pool_max_connections", "asyncpg pool max_size.", labels=("pool",))
+        http_open = GaugeMetricFamily(
+            "ai_http_client_pool_connections", "Open httpx pool connections.", labels=("client",)
+        )
+        http_idle = GaugeMetricFamily(
+            "ai_http_client_pool_idle_connections", "Idle httpx pool connections.", labels=("client",)
+        )
+        http_waiting = GaugeMetricFamily(
+            "ai_http_client_pool_requests", "Requests holding or waiting for an httpx connection.", labels=("client",)
+        )
+        http_max = GaugeMetricFamily(
+            "ai_http_client_pool_max_connections", "httpx max_connections limit.", labels=("client",)
+        )
+
+        with self._lock:
+            pools = list(self._asyncpg_pools.items())
+            clients = list(self._httpx_clients.items())
+
+        for name, ref in pools:
+            pool = ref()
+            if pool is None:
+                continue
+            try:
+                db_size.add_metric([name], pool.get_size())
+                db_idle.add_metric([name], pool.get_idle_size())
+                db_max.add_metric([name], pool.get_max_size())
+            except Exception:
+                logger.debug("Could not read asyncpg pool stats for %s", name, exc_info=True)
+
+        for name, ref in clients:
+            client = ref()
+            if client is None or client.is_closed:
+                continue
+            # httpx exposes no public pool stats; read the httpcore pool behind the transport.
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            if pool is None:
+                continue
+            try:
+                connections = list(pool.connections)
+                http_open.add_metric([name], len(connections))
+                http_idle.add_metric([name], sum(1 for connection in connections if connection.is_idle()))
+                http_waiting.add_metric([name], len(getattr(pool, "_requests", ())))
+                max_connections = getattr(pool, "_max_connections", None)
+                if max_connections is not None:
+                    http_max.add_metric([name], max_connections)
+            except Exception:
+                logger.debug("Could not read httpx pool stats for %s", name, exc_info=True)
+
+        yield from (db_size, db_idle, db_max, http_open, http_idle, http_waiting, http_max)
+
+
+POOL_COLLECTOR = PoolCollector()
+REGISTRY.register(POOL_COLLECTOR)
+
+
+def register_asyncpg_pool(name: str, pool: Any) -> None:
+    POOL_COLLECTOR.register_asyncpg_pool(name, pool)
+
+
+def register_httpx_client(name: str, client: Any) -> None:
+    POOL_COLLECTOR.register_httpx_client(name, client)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
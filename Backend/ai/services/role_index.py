@@ -0,0 +1,247 @@
+"""Fuzzy job-title lookup over the role taxonomy's aliases.
+
+Titles are normalised (lower-cased, punctuation collapsed to spaces) and
+split into words; seniority and filler words ("senior", "remote", "of")
+are dropped. Each word is resolved against the vocabulary of every alias,
+heuristic phrase and IT term: an exact hit scores 1.0, otherwise words of
+four letters or more are looked up in a character-trigram index and the
+closest vocabulary word of similar length within ``WORD_SIMILARITY``
+(Dice coefficient) stands in for it, so "enginer" still reads as
+"engineer" while "chain" does not turn into "blockchain".
+
+An alias scores the share of its words the title covers, nudged by how
+much of the title the alias explains:
+
+    confidence = alias_coverage * (0.85 + 0.15 * title_coverage)
+
+The best alias at or above the taxonomy's ``match_threshold`` wins; ties go
+to the longer alias. Phrases (heuristics, IT terms) match when every word
+is present, so "ai" matches the word "ai" but not "chain".
+
+Everything is built once per taxonomy snapshot and never mutated; only the
+bounded per-title result memo changes after construction.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Sequence
+
+
+WORD_SIMILARITY = 0.6
+MIN_FUZZY_WORD_LENGTH = 4
+MAX_LENGTH_DIFFERENCE = 3
+DEFAULT_MATCH_THRESHOLD = 0.7
+_MEMO_SIZE = 4096
+_MISSING = object()
+
+# words that say nothing about which role a title is
+NOISE_WORDS = frozenset(
+    {
+        "senior", "sr", "junior", "jr", "lead", "principal", "staff", "head", "chief",
+        "associate", "assistant", "intern", "internship", "trainee", "graduate", "entry",
+        "mid", "level", "i", "ii", "iii", "iv", "remote", "hybrid", "contract", "freelance",
+        "of", "the", "and", "for", "in", "at", "a", "an",
+    }
+)
+
+
+def normalize_role_text(value: object) -> str:
+    """Lower-case ``value`` and collapse every run of non-alphanumerics to one space."""
+
+    lowered = str(value or "").strip().casefold()
+    chars: list[str] = []
+    previous_space = False
+    for char in lowered:
+        if char.isalnum():
+            chars.append(char)
+            previous_space = False
+            continue
+        if not previous_space:
+            chars.append(" ")
+            previous_space = True
+    return "".join(chars).strip()
+
+
+def _trigrams(word: str) -> frozenset[str]:
+    padded = f"${word}$"
+    return frozenset(padded[index:index + 3] for index in range(len(padded) - 2))
+
+
+@dataclass(frozen=True, slots=True)
+class RoleMatch:
+    key: str
+    alias: str
+    confidence: float
+
+
+class RoleIndex:
+    """Scored nearest-alias lookup for job titles."""
+
+    __slots__ = (
+        "threshold",
+        "_aliases",
+        "_postings",
+        "_vocabulary",
+        "_gram_postings",
+        "_word_grams",
+        "_word_memo",
+        "_match_memo",
+    )
+
+    def __init__(
+        self,
+        aliases: Mapping[str, Iterable[str]],
+        *,
+        phrases: Iterable[str] = (),
+        threshold: float = DEFAULT_MATCH_THRESHOLD,
+    ) -> None:
+        """``aliases`` maps a role key to its alias texts; ``phrases`` only extend the vocabulary."""
+
+        self.threshold = threshold
+        # (role key, alias text, distinct alias words)
+        self._aliases: list[tuple[str, str, tuple[str, ...]]] = []
+        self._postings: dict[str, list[int]] = {}
+        vocabulary: set[str] = set()
+
+        for key, texts in aliases.items():
+            for text in texts:
+                words = tuple(dict.fromkeys(self.words(text)))
+                if not words:
+                    continue
+                alias_id = len(self._aliases)
+                self._aliases.append((key, text, words))
+                for word in words:
+                    self._postings.setdefault(word, []).append(alias_id)
+                vocabulary.update(words)
+
+        for phrase in phrases:
+            vocabulary.update(self.words(phrase))
+
+        self._vocabulary = frozenset(vocabulary)
+        self._gram_postings: dict[str, list[str]] = {}
+        self._word_grams: dict[str, frozenset[str]] = {}
+        for word in sorted(self._vocabulary):
+            if len(word) < MIN_FUZZY_WORD_LENGTH:
+                continue
+            grams = _trigrams(word)
+            self._word_grams[word] = grams
+            for gram in grams:
+                self._gram_postings.setdefault(gram, []).append(word)
+
+        self._word_memo: dict[str, tuple[tuple[str, float], ...]] = {}
+        self._match_memo: dict[str, RoleMatch | None] = {}
+
+    @staticmethod
+    def words(text: str) -> list[str]:
+        return [word for word in normalize_role_text(text).split() if word not in NOISE_WORDS]
+
+    def resolve_word(self, word: str) -> tuple[tuple[str, float], ...]:
+        """Vocabulary words ``word`` stands for, with similarity; empty when nothing is close."""
+
+        if word in self._vocabulary:
+            return ((word, 1.0),)
+        if len(word) < MIN_FUZZY_WORD_LENGTH:
+            return ()
+
+        cached = self._word_memo.get(word)
+        if cached is not None:
+            return cached
+
+        grams = _trigrams(word)
+        shared: Counter[str] = Counter()
+        for gram in grams:
+            candidates = self._gram_postings.get(gram)
+            if candidates:
+                shared.update(candidates)
+
+        best: list[tuple[str, float]] = []
+        best_score = WORD_SIMILARITY
+        for candidate, overlap in shared.items():
+            if abs(len(candidate) - len(word)) > MAX_LENGTH_DIFFERENCE:
+                continue
+            score = 2.0 * overlap / (len(grams) + len(self._word_grams[candidate]))
+            if score > best_score:
+                best, best_score = [(candidate, score)], score
+            elif score == best_score:
+                best.append((candidate, score))
+
+        resolved = tuple(best)
+        if len(self._word_memo) >= _MEMO_SIZE:
+            self._word_memo.clear()
+        self._word_memo[word] = resolved
+        return resolved
+
+    def _resolve_words(self, text: str) -> list[tuple[tuple[str, float], ...]]:
+        return [self.resolve_word(word) for word in self.words(text)]
+
+    def candidates(self, text: str, *, limit: int = 5) -> list[RoleMatch]:
+        """The best-scoring aliases for ``text``, one per role, highest confidence first."""
+
+        resolved = self._resolve_words(text)
+        if not resolved:
+            return []
+
+        # vocabulary word -> (best similarity, bitmask of the title words it stands for)
+        word_hits: dict[str, tuple[float, int]] = {}
+        for position, matches in enumerate(resolved):
+            for word, similarity in matches:
+                previous = word_hits.get(word)
+                if previous is None:
+                    word_hits[word] = (similarity, 1 << position)
+                else:
+                    word_hits[word] = (max(previous[0], similarity), previous[1] | 1 << position)
+
+        scores: dict[int, float] = {}
+        covered: dict[int, int] = {}
+        for word, (similarity, mask) in word_hits.items():
+            for alias_id in self._postings.get(word, ()):
+                scores[alias_id] = scores.get(alias_id, 0.0) + similarity
+                covered[alias_id] = covered.get(alias_id, 0) | mask
+
+        title_words = len(resolved)
+        best_per_role: dict[str, tuple[float, int, int]] = {}
+        for alias_id, score in scores.items():
+            key, _, alias_words = self._aliases[alias_id]
+            title_coverage = covered[alias_id].bit_count() / title_words
+            confidence = round(score / len(alias_words) * (0.85 + 0.15 * title_coverage), 4)
+            rank = (confidence, len(alias_words), alias_id)
+            current = best_per_role.get(key)
+            if current is None or rank[:2] > current[:2]:
+                best_per_role[key] = rank
+
+        ranked = sorted(best_per_role.values(), key=lambda rank: rank[:2], reverse=True)[:limit]
+        return [
+            RoleMatch(key=self._aliases[alias_id][0], alias=self._aliases[alias_id][1], confidence=confidence)
+            for confidence, _, alias_id in ranked
+        ]
+
+    def match(self, text: str) -> RoleMatch | None:
+        """The nearest alias at or above ``threshold``, or None."""
+
+        memo_key = normalize_role_text(text)
+        # one lookup: another thread may clear the memo between a check and a read
+        cached = self._match_memo.get(memo_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        found = self.candidates(memo_key, limit=1)
+        result = found[0] if found and found[0].confidence >= self.threshold else None
+        if len(self._match_memo) >= _MEMO_SIZE:
+            self._match_memo.clear()
+        self._match_memo[memo_key] = result
+        return result
+
+    def first_phrase(self, text: str, phrases: Sequence[Sequence[str]]) -> int | None:
+        """Position of the first phrase (as word lists) whose words all occur in ``text``."""
+
+        present: set[str] = set()
+        for matches in self._resolve_words(text):
+            present.update(word for word, _ in matches)
+        if not present:
+            return None
+        for position, phrase_words in enumerate(phrases):
+            if phrase_words and present.issuperset(phrase_words):
+                return position
+        return None
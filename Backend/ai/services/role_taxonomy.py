@@ -0,0 +1,391 @@
+"""Role definitions for skill-gap analysis and roadmaps, loaded from YAML.
+
+Roles, their aliases, skill requirements, roadmap tools and the fallback
+title heuristics live in ``data/role_taxonomy.yaml`` (``AI_ROLE_TAXONOMY_PATH``
+points elsewhere). The file is compiled into an immutable ``RoleTaxonomy``
+snapshot: a key index, a normalised alias lookup table and the ordered
+heuristics, all read-only.
+
+Each worker checks the file's mtime and size every
+``AI_ROLE_TAXONOMY_RELOAD_SECONDS``. When it changes, a new snapshot is
+compiled off to the side and swapped in with one reference assignment;
+requests already running keep the snapshot they started with. A file that
+fails to parse or validate is logged and the last good snapshot stays
+live. ``snapshot.version`` is ``<declared version>+<content hash>``, so
+caches keyed on it stop serving entries built from older definitions.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import yaml
+
+from services.env import env_float
+from services.role_index import DEFAULT_MATCH_THRESHOLD, RoleIndex, RoleMatch, normalize_role_text
+
+
+logger = logging.getLogger(__name__)
+
+LEVEL_RANK = {"beginner": 1, "intermediate": 2, "advanced": 3, "expert": 4}
+PRIORITY_RANK = {"high": 3, "medium": 2, "low": 1}
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "role_taxonomy.yaml"
+
+
+class RoleTaxonomyError(ValueError):
+    """The role taxonomy file is unreadable or does not describe a valid taxonomy."""
+
+
+@dataclass(frozen=True, slots=True)
+class SkillRequirement:
+    name: str
+    target_level: str
+    priority: str
+    category: str
+    why_it_matters: str
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class RoleDefinition:
+    key: str
+    display_name: str
+    aliases: tuple[str, ...]
+    requirements: tuple[SkillRequirement, ...]
+    tools: tuple[str, ...] = ()
+
+
+def _text(value: Any, where: str) -> str:
+    if not isinstance(value, (str, int, float)) or isinstance(value, bool) or not str(value).strip():
+        raise RoleTaxonomyError(f"{where} must be a non-empty string")
+    return str(value).strip()
+
+
+def _text_list(value: Any, where: str) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        raise RoleTaxonomyError(f"{where} must be a list")
+    return tuple(_text(item, f"{where}[{index}]") for index, item in enumerate(value))
+
+
+def _choice(value: Any, allowed: Mapping[str, int], where: str) -> str:
+    choice = _text(value, where).casefold()
+    if choice not in allowed:
+        raise RoleTaxonomyError(f"{where} must be one of {', '.join(allowed)}, got {value!r}")
+    return choice
+
+
+def _parse_requirement(data: Any, where: str) -> SkillRequirement:
+    if not isinstance(data, dict):
+        raise RoleTaxonomyError(f"{where} must be a mapping")
+    return SkillRequirement(
+        name=_text(data.get("name"), f"{where}.name"),
+        target_level=_choice(data.get("target_level"), LEVEL_RANK, f"{where}.target_level"),
+        priority=_choice(data.get("priority"), PRIORITY_RANK, f"{where}.priority"),
+        category=_text(data.get("category"), f"{where}.category"),
+        why_it_matters=_text(data.get("why_it_matters"), f"{where}.why_it_matters"),
+        aliases=_text_list(data.get("aliases"), f"{where}.aliases"),
+    )
+
+
+def _parse_role(data: Any, where: str) -> RoleDefinition:
+    if not isinstance(data, dict):
+        raise RoleTaxonomyError(f"{where} must be a mapping")
+    key = _text(data.get("key"), f"{where}.key")
+    requirements = data.get("requirements")
+    if not isinstance(requirements, list) or not requirements:
+        raise RoleTaxonomyError(f"{where}.requirements must be a non-empty list")
+    return RoleDefinition(
+        key=key,
+        display_name=_text(data.get("display_name"), f"{where}.display_name"),
+        aliases=_text_list(data.get("aliases"), f"{where}.aliases"),
+        requirements=tuple(
+            _parse_requirement(item, f"{where}.requirements[{index}]") for index, item in enumerate(requirements)
+        ),
+        tools=_text_list(data.get("tools"), f"{where}.tools"),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RoleTaxonomy:
+    version: str
+    roles: tuple[RoleDefinition, ...]
+    by_key: Mapping[str, RoleDefinition]
+    lookup: Mapping[str, RoleDefinition]
+    index: RoleIndex
+    # (phrase words, role) in file order; the first phrase fully present in a title wins
+    heuristics: tuple[tuple[tuple[str, ...], RoleDefinition], ...]
+    it_terms: tuple[tuple[str, ...], ...]
+    source: str = ""
+
+    @classmethod
+    def compile(cls, data: Any, *, source: str = "") -> RoleTaxonomy:
+        """Validate parsed YAML and build the read-only indexes; raises ``RoleTaxonomyError``."""
+
+        if not isinstance(data, dict):
+            raise RoleTaxonomyError("the role taxonomy must be a mapping with a 'roles' list")
+        raw_roles = data.get("roles")
+        if not isinstance(raw_roles, list) or not raw_roles:
+            raise RoleTaxonomyError("'roles' must be a non-empty list")
+
+        roles = tuple(_parse_role(item, f"roles[{index}]") for index, item in enumerate(raw_roles))
+        by_key: dict[str, RoleDefinition] = {}
+        lookup: dict[str, RoleDefinition] = {}
+        for role in roles:
+            if role.key in by_key:
+                raise RoleTaxonomyError(f"duplicate role key {role.key!r}")
+            by_key[role.key] = role
+            for alias in (role.display_name, *role.aliases):
+                alias_key = normalize_role_text(alias)
+                claimed = lookup.get(alias_key)
+                if claimed is not None and claimed.key != role.key:
+                    raise RoleTaxonomyError(f"alias {alias!r} is used by both {claimed.key!r} and {role.key!r}")
+                lookup[alias_key] = role
+
+        raw_heuristics = data.get("heuristics") or []
+        if not isinstance(raw_heuristics, list):
+            raise RoleTaxonomyError("'heuristics' must be a list")
+        heuristics: list[tuple[tuple[str, ...], RoleDefinition]] = []
+        for index, item in enumerate(raw_heuristics):
+            where = f"heuristics[{index}]"
+            if not isinstance(item, dict):
+                raise RoleTaxonomyError(f"{where} must be a mapping with 'match' and 'role'")
+            match_words = tuple(RoleIndex.words(_text(item.get("match"), f"{where}.match")))
+            if not match_words:
+                raise RoleTaxonomyError(f"{where}.match has no usable words")
+            role_key = _text(item.get("role"), f"{where}.role")
+            if role_key not in by_key:
+                raise RoleTaxonomyError(f"{where}.role refers to unknown role {role_key!r}")
+            heuristics.append((match_words, by_key[role_key]))
+
+        it_terms = tuple(
+            words
+            for term in _text_list(data.get("it_terms"), "it_terms")
+            if (words := tuple(RoleIndex.words(term)))
+        )
+
+        threshold = data.get("match_threshold", DEFAULT_MATCH_THRESHOLD)
+        if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not 0 < threshold <= 1:
+            raise RoleTaxonomyError(f"'match_threshold' must be a number in (0, 1], got {threshold!r}")
+
+        index = RoleIndex(
+            {role.key: (role.display_name, *role.aliases) for role in roles},
+            phrases=[" ".join(words) for words in (*(words for words, _ in heuristics), *it_terms)],
+            threshold=float(threshold),
+        )
+
+        canonical = json.dumps(
+            {
+                "roles": [
+                    [role.key, role.display_name, role.aliases, role.tools, _requirement_rows(role)]
+                    for role in roles
+                ],
+                "heuristics": [[words, role.key] for words, role in heuristics],
+                "it_terms": it_terms,
+                "match_threshold": float(threshold),
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+        declared = str(data.get("version") or "0").strip()
+
+        return cls(
+            version=f"{declared}+{digest}",
+            roles=roles,
+            by_key=MappingProxyType(by_key),
+            lookup=MappingProxyType(lookup),
+            index=index,
+            heuristics=tuple(heuristics),
+            it_terms=it_terms,
+            source=source,
+        )
+
+    def get(self, key: str) -> RoleDefinition | None:
+        return self.by_key.get(key)
+
+    def match(self, target_role: str) -> RoleMatch | None:
+        """Exact alias, then the nearest fuzzy alias, then the first heuristic the title contains.
+
+        Heuristic hits are reported with confidence 0, below any alias match.
+        """
+
+        normalized_target = normalize_role_text(target_role)
+        if not normalized_target:
+            return None
+
+        direct_match = self.lookup.get(normalized_target)
+        if direct_match is not None:
+            return RoleMatch(key=direct_match.key, alias=normalized_target, confidence=1.0)
+
+        nearest = self.index.match(normalized_target)
+        if nearest is not None:
+            return nearest
+
+        position = self.index.first_phrase(normalized_target, [words for words, _ in self.heuristics])
+        if position is None:
+            return None
+        words, role = self.heuristics[position]
+        return RoleMatch(key=role.key, alias=" ".join(words), confidence=0.0)
+
+    def resolve(self, target_role: str) -> RoleDefinition | None:
+        found = self.match(target_role)
+        return self.by_key[found.key] if found is not None else None
+
+    def is_it_role(self, title: str) -> bool:
+        """A known role, or a title that contains one of the ``it_terms`` as whole words."""
+
+        if self.match(title) is not None:
+            return True
+        return self.index.first_phrase(title, self.it_terms) is not None
+
+
+def _requirement_rows(role: RoleDefinition) -> list[tuple[Any, ...]]:
+    return [
+        (
+            requirement.name,
+            requirement.target_level,
+            requirement.priority,
+            requirement.category,
+            requirement.why_it_matters,
+            requirement.aliases,
+        )
+        for requirement in role.requirements
+    ]
+
+
+def load_role_taxonomy(path: Path | str) -> RoleTaxonomy:
+    path = Path(path)
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise RoleTaxonomyError(f"cannot read {path}: {exc}") from exc
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as exc:
+        raise RoleTaxonomyError(f"{path} is not valid YAML: {exc}") from exc
+    return RoleTaxonomy.compile(data, source=str(path))
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass(slots=True)
+class RoleTaxonomyStore:
+    """Holds the live snapshot and swaps it when the backing file changes."""
+
+    path: Path
+    reload_seconds: float = 5.0
+    _snapshot: RoleTaxonomy | None = None
+    _signature: tuple[int, int] | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _thread: threading.Thread | None = None
+
+    def current(self) -> RoleTaxonomy:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # first use: a missing or broken file is a deploy error, so let it raise
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    def reload(self, *, force: bool = False) -> bool:
+        """Re-read the file if it changed (or ``force``); True when a new version went live."""
+
+        with self._lock:
+            signature = _file_signature(self.path)
+            if not force and self._snapshot is not None and signature == self._signature:
+                return False
+            try:
+                snapshot = load_role_taxonomy(self.path)
+            except RoleTaxonomyError as exc:
+                if self._snapshot is None:
+                    raise
+                # remember the bad file so it is reported once, not on every poll
+                self._signature = signature
+                logger.error("Role taxonomy reload failed, keeping version %s: %s", self._snapshot.version, exc)
+                return False
+
+            self._signature = signature
+            previous = self._snapshot
+            if previous is not None and previous.version == snapshot.version:
+                return False
+            self._snapshot = snapshot
+        logger.info(
+            "Role taxonomy %s loaded from %s (%d roles, was %s)",
+            snapshot.version,
+            snapshot.source,
+            len(snapshot.roles),
+            previous.version if previous is not None else "none",
+        )
+        return True
+
+    def start_watching(self) -> None:
+        self.current()
+        if self.reload_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="role-taxonomy-watch", daemon=True)
+        self._thread.start()
+
+    def stop_watching(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout=max(1.0, self.reload_seconds))
+        self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_seconds):
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("Role taxonomy watcher failed")
+
+
+_store: RoleTaxonomyStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_role_taxonomy_store() -> RoleTaxonomyStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RoleTaxonomyStore(
+                    path=Path(os.getenv("AI_ROLE_TAXONOMY_PATH") or DEFAULT_TAXONOMY_PATH),
+                    reload_seconds=max(0.0, env_float("AI_ROLE_TAXONOMY_RELOAD_SECONDS", 5.0)),
+                )
+    return _store
+
+
+def get_role_taxonomy() -> RoleTaxonomy:
+    """The live snapshot. Read it once per request and use that object throughout."""
+
+    return get_role_taxonomy_store().current()
+
+
+def start_role_taxonomy_watcher() -> None:
+    get_role_taxonomy_store().start_watching()
+
+
+def stop_role_taxonomy_watcher() -> None:
+    if _store is not None:
+        _store.stop_watching()
@@ -0,0 +1,371 @@
+"""The one skill taxonomy every matcher in the service uses.
+
+Skills, their aliases, categories and kind (a concrete ``tool`` or a
+practice ``skill``) are declared once in ``SKILLS``. ``get_skill_taxonomy``
+compiles them on first use into:
+
+* canonical-id tables: alias -> id, id -> display name / category
+* one ``KeywordMatcher`` over every alias, which finds all skills in a text
+  with a single tokenisation pass
+
+Aliases that are also ordinary words or abbreviations ("go", "ts", "cv",
+"ai", "security", "cloud") are declared ``lookup_only``: they resolve a
+value that is exactly that alias (a profile skill "TS", a catalog entry
+"Go") but are never scanned for in free text, where "we go to market",
+"send your CV" or "security clearance" would otherwise read as skills.
+
+Text is tokenised at the byte level: lower-cased, every byte outside
+``[a-z0-9+#.]`` becomes a separator, a "." that ends a token is dropped,
+then split. Aliases go through the same tokeniser, so "go" never matches
+inside "google", "Node.js" stays one token (and does not also count as
+"js"), a sentence-final "Python." is still "python", and "c++" / "c#"
+survive.
+
+Matchers over other label sets (the ``skills`` table, a role's
+requirements) come from ``taxonomy.matcher_for(...)``, which expands each
+label with the taxonomy aliases it resolves to and caches the compiled
+result. ``taxonomy.version`` changes whenever the declared data does.
+
+The market-intelligence benchmark (``python -m benchmarks.market_pipeline``)
+exercises the matcher through the parse and normalize stages.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, Mapping, Sequence
+
+
+TAXONOMY_VERSION = "1"
+
+# Everything outside [a-z0-9+#.] is a separator (non-ASCII UTF-8 bytes too).
+_TOKEN_BYTES = frozenset(b"abcdefghijklmnopqrstuvwxyz0123456789+#.")
+_SEPARATOR_TABLE = bytes(byte if byte in _TOKEN_BYTES else 0x20 for byte in range(256))
+
+
+def tokenize(text: str) -> list[bytes]:
+    translated = text.lower().encode("utf-8", "ignore").translate(_SEPARATOR_TABLE) + b" "
+    # drop token-final dots ("python." / "python..." / "etc.)") with C-level
+    # replaces; text without runs of dots needs a single pass
+    while b". " in translated:
+        translated = translated.replace(b". ", b" ")
+    return translated.split()
+
+
+def normalize_key(text: str) -> str:
+    """Alias lookup key: the tokens of ``text`` joined by single spaces."""
+
+    return b" ".join(tokenize(str(text or ""))).decode("ascii")
+
+
+@dataclass(frozen=True, slots=True)
+class Skill:
+    id: str
+    name: str
+    category: str
+    kind: str  # "tool" (a concrete technology) or "skill" (a practice)
+    aliases: tuple[str, ...] = ()
+    # exact-value aliases (possibly the name itself) that free-text scans skip
+    lookup_only: tuple[str, ...] = ()
+
+
+def _tool(id: str, name: str, category: str, *aliases: str, lookup_only: tuple[str, ...] = ()) -> Skill:
+    return Skill(id=id, name=name, category=category, kind="tool", aliases=aliases, lookup_only=lookup_only)
+
+
+def _practice(id: str, name: str, category: str, *aliases: str, lookup_only: tuple[str, ...] = ()) -> Skill:
+    return Skill(id=id, name=name, category=category, kind="skill", aliases=aliases, lookup_only=lookup_only)
+
+
+SKILLS: tuple[Skill, ...] = (
+    # programming
+    _tool("python", "Python", "programming", "python3", "python 3", lookup_only=("py",)),
+    _tool("javascript", "JavaScript", "programming", "js", "ecmascript"),
+    _tool("typescript", "TypeScript", "programming", lookup_only=("ts",)),
+    _tool("java", "Java", "programming"),
+    _tool("go", "Go", "programming", "golang", lookup_only=("go",)),
+    _tool("rust", "Rust", "programming"),
+    _tool("csharp", "C#", "programming", "csharp"),
+    _tool("cpp", "C++", "programming", "cpp"),
+    _tool("sql", "SQL", "programming", "postgres sql", "mysql sql"),
+    # backend
+    _practice(
+        "rest-apis", "REST APIs", "backend",
+        "rest api", "restful api", "rest apis", "restful apis", "rest api design", "api design", "api development",
+    ),
+    _tool("graphql", "GraphQL", "backend"),
+    _tool("fastapi", "FastAPI", "backend"),
+    _tool("django", "Django", "backend"),
+    _tool("flask", "Flask", "backend"),
+    _tool("nodejs", "Node.js", "backend", "node", "nodejs"),
+    _tool("postgresql", "PostgreSQL", "backend", "postgres", "postgre sql"),
+    _tool("mysql", "MySQL", "backend"),
+    _tool("mongodb", "MongoDB", "backend", "mongo"),
+    _practice("microservices", "Microservices", "backend", "microservice"),
+    _practice("backend-development", "Backend Development", "backend"),
+    # frontend
+    _tool("react", "React", "frontend", "react.js", "reactjs"),
+    _practice("frontend-development", "Frontend Development", "frontend"),
+    # AI / data
+    _practice("machine-learning", "Machine Learning", "AI / data", "ml"),
+    _practice("deep-learning", "Deep Learning", "AI / data", lookup_only=("dl",)),
+    _practice("artificial-intelligence", "Artificial Intelligence", "AI / data", lookup_only=("ai",)),
+    _practice("data-analysis", "Data Analysis", "AI / data", "analytics"),
+    _practice("data-science", "Data Science", "AI / data"),
+    _practice("data-modeling", "Data Modeling", "AI / data", "data modelling"),
+    _practice("nlp", "Natural Language Processing", "AI / data", "nlp"),
+    _practice("computer-vision", "Computer Vision", "AI / data", lookup_only=("cv",)),
+    _tool("pandas", "Pandas", "AI / data"),
+    _tool("numpy", "NumPy", "AI / data"),
+    _tool("pytorch", "PyTorch", "AI / data"),
+    _tool("tensorflow", "TensorFlow", "AI / data"),
+    _tool("scikit-learn", "Scikit-learn", "AI / data", "sklearn"),
+    _tool("spark", "Spark", "AI / data", "apache spark"),
+    # cloud / devops
+    _tool("aws", "AWS", "cloud / devops", "amazon web services"),
+    _tool("azure", "Azure", "cloud / devops", "microsoft azure"),
+    _tool("gcp", "GCP", "cloud / devops", "google cloud", "google cloud platform"),
+    _tool("docker", "Docker", "cloud / devops", "containerization", "containerisation"),
+    _tool("kubernetes", "Kubernetes", "cloud / devops", "k8s"),
+    _practice("ci-cd", "CI/CD", "cloud / devops", "cicd", "continuous integration", "continuous delivery"),
+    _practice("devops", "DevOps", "cloud / devops"),
+    _practice("cloud-computing", "Cloud Computing", "cloud / devops", lookup_only=("cloud",)),
+    _tool("linux", "Linux", "cloud / devops"),
+    # tooling and practices
+    _tool("git", "Git", "tooling", "version control"),
+    _tool("github", "GitHub", "tooling"),
+    _tool("airflow", "Airflow", "tooling"),
+    _practice("system-design", "System Design", "tooling"),
+    _practice("software-engineering", "Software Engineering", "tooling"),
+    _practice("testing", "Testing", "tooling"),
+    _practice("debugging", "Debugging", "tooling"),
+    _practice("cybersecurity", "Cybersecurity", "tooling", "cyber security", lookup_only=("security",)),
+    _practice("agile-scrum", "Agile / Scrum", "tooling", "agile", "scrum", "agile scrum"),
+    _practice("communication", "Communication", "tooling", "stakeholder communication"),
+    _practice("problem-solving", "Problem Solving", "tooling"),
+    _practice("critical-thinking", "Critical Thinking", "tooling"),
+    _practice("leadership", "Leadership", "tooling"),
+)
+
+
+class KeywordMatcher:
+    """Finds labelled keywords in token lists.
+
+    Single-token aliases are looked up with C-level ``filter``/``map`` over
+    the token list; multi-token aliases are counted with ``bytes.count`` in
+    the joined tokens, only for first tokens that occur. Hits come back as
+    labels, once per occurrence, so ``Counter.update`` can count them in C.
+    """
+
+    def __init__(self, labels: Mapping[str, Iterable[str]], *, exclude: Iterable[str] = ()) -> None:
+        """``exclude`` holds alias keys (``normalize_key`` form) that are never indexed."""
+
+        excluded = frozenset(exclude)
+        self.labels = tuple(labels)
+        self.order = {label: index for index, label in enumerate(self.labels)}
+        self._single: dict[bytes, str] = {}
+        # keyed by tokens, so "Agile / Scrum" and "agile scrum" are one phrase
+        phrases: dict[tuple[bytes, ...], str] = {}
+        for label, aliases in labels.items():
+            for alias in dict.fromkeys((label, *aliases)):
+                parts = tokenize(alias)
+                if not parts or b" ".join(parts).decode("ascii") in excluded:
+                    continue
+                if len(parts) == 1:
+                    self._single.setdefault(parts[0], label)
+                else:
+                    phrases.setdefault(tuple(parts), label)
+        # multi-token aliases: (first token, " token token " needle, label)
+        self._phrases = [(parts[0], b" " + b" ".join(parts) + b" ", label) for parts, label in phrases.items()]
+        # hits() joins tokens with two spaces, so back-to-back phrases do not
+        # share a separator and bytes.count sees every one; a phrase is only
+        # counted when all of its tokens occur
+        self._phrases_by_head: dict[bytes, list[tuple[bytes, frozenset[bytes], str]]] = {}
+        for parts, label in phrases.items():
+            self._phrases_by_head.setdefault(parts[0], []).append(
+                (b" " + b"  ".join(parts) + b" ", frozenset(parts), label)
+            )
+        self._phrase_heads = frozenset(self._phrases_by_head)
+        self._phrase_tokens = frozenset(token for parts in phrases for token in parts)
+        self._is_single = self._single.__contains__
+        self._label_of = self._single.__getitem__
+
+    def hits(self, tokens: list[bytes]) -> list[str]:
+        """One label per keyword occurrence in ``tokens``."""
+
+        found = list(map(self._label_of, filter(self._is_single, tokens)))
+        present = self._phrase_tokens.intersection(tokens)
+        joined = b""
+        for head in self._phrase_heads.intersection(present):
+            for needle, parts, label in self._phrases_by_head[head]:
+                if parts <= present:
+                    joined = joined or b"  " + b"  ".join(tokens) + b"  "
+                    count = joined.count(needle)
+                    if count:
+                        found.extend([label] * count)
+        return found
+
+    def find(self, text: str) -> set[str]:
+        """Labels present in ``text``."""
+
+        return set(self.hits(tokenize(text)))
+
+    def find_in_order(self, text: str) -> list[str]:
+        """Labels present in ``text``, ordered by first occurrence."""
+
+        tokens = tokenize(text)
+        first_seen: dict[str, int] = {}
+        for index, token in enumerate(tokens):
+            label = self._single.get(token)
+            if label is not None and label not in first_seen:
+                first_seen[label] = index
+        if self._phrases:
+            joined = b" " + b" ".join(tokens) + b" "
+            for _, needle, label in self._phrases:
+                position = joined.find(needle)
+                if position == -1:
+                    continue
+                index = joined.count(b" ", 0, position)
+                if index < first_seen.get(label, math.inf):
+                    first_seen[label] = index
+        return sorted(first_seen, key=first_seen.__getitem__)
+
+    def rank(self, counts: Mapping[str, int]) -> dict[str, int]:
+        """Order by count, ties in label order."""
+
+        ordered = sorted(
+            ((label, count) for label, count in counts.items() if count > 0),
+            key=lambda item: (-item[1], self.order.get(item[0], math.inf)),
+        )
+        return dict(ordered)
+
+
+@dataclass(slots=True)
+class SkillTaxonomy:
+    skills: tuple[Skill, ...]
+    version: str = ""
+    by_id: dict[str, Skill] = field(default_factory=dict)
+    alias_to_id: dict[str, str] = field(default_factory=dict)
+    lookup_only_keys: frozenset[str] = frozenset()
+    matcher: KeywordMatcher | None = None
+    _derived: dict[tuple[object, ...], KeywordMatcher] = field(default_factory=dict)
+    _derived_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    def compile(cls, skills: Sequence[Skill], version: str = TAXONOMY_VERSION) -> SkillTaxonomy:
+        digest = hashlib.sha256(
+            json.dumps(
+                [
+                    [skill.id, skill.name, skill.category, skill.kind, skill.aliases, skill.lookup_only]
+                    for skill in skills
+                ],
+                separators=(",", ":"),
+            ).encode("utf-8")
+        ).hexdigest()[:12]
+        taxonomy = cls(skills=tuple(skills), version=f"{version}+{digest}")
+
+        for skill in skills:
+            if skill.id in taxonomy.by_id:
+                raise ValueError(f"Duplicate skill id in taxonomy: {skill.id}")
+            taxonomy.by_id[skill.id] = skill
+            for alias in (skill.name, skill.id, *skill.aliases, *skill.lookup_only):
+                key = normalize_key(alias)
+                owner = taxonomy.alias_to_id.setdefault(key, skill.id)
+                if key and owner != skill.id:
+                    raise ValueError(f"Alias '{alias}' maps to both {owner} and {skill.id}")
+
+        taxonomy.lookup_only_keys = frozenset(
+            normalize_key(alias) for skill in skills for alias in skill.lookup_only
+        )
+        taxonomy.matcher = KeywordMatcher(
+            {skill.id: (skill.name, *skill.aliases) for skill in skills},
+            exclude=taxonomy.lookup_only_keys,
+        )
+        return taxonomy
+
+    def canonical_id(self, value: str) -> str | None:
+        return self.alias_to_id.get(normalize_key(value))
+
+    def get(self, value: str) -> Skill | None:
+        skill_id = self.canonical_id(value)
+        return self.by_id.get(skill_id) if skill_id else None
+
+    def canonical_name(self, value: str) -> str | None:
+        skill = self.get(value)
+        return skill.name if skill else None
+
+    def category(self, value: str) -> str | None:
+        skill = self.get(value)
+        return skill.category if skill else None
+
+    def aliases_for(self, value: str) -> tuple[str, ...]:
+        """``value`` plus every alias of the skill it resolves to."""
+
+        skill = self.get(value)
+        if skill is None:
+            return (value,)
+        return tuple(dict.fromkeys((value, skill.name, *skill.aliases, *skill.lookup_only)))
+
+    def find_ids(self, text: str) -> set[str]:
+        return self.matcher.find(text)
+
+    def find_skills(self, text: str, *, kind: str | None = None) -> list[Skill]:
+        """Skills mentioned in ``text``, in taxonomy order."""
+
+        found = self.matcher.find(text)
+        return [
+            skill
+            for skill in self.skills
+            if skill.id in found and (kind is None or skill.kind == kind)
+        ]
+
+    def matcher_for(
+        self,
+        labels: Sequence[str],
+        *,
+        extra_aliases: Mapping[str, Iterable[str]] | None = None,
+        free_text: bool = True,
+    ) -> KeywordMatcher:
+        """A matcher whose labels are ``labels`` (e.g. names from the skills table).
+
+        Each label matches its own name and the aliases of the taxonomy skill
+        it resolves to, plus any ``extra_aliases`` (which are expanded the
+        same way). With ``free_text`` (scanning pages or chat messages) the
+        ``lookup_only`` aliases are left out; pass ``free_text=False`` when
+        the inputs are themselves skill names. Compiled matchers are cached
+        per label tuple when no extra aliases are given.
+        """
+
+        cache_key = (free_text, *labels)
+        if extra_aliases is None:
+            with self._derived_lock:
+                cached = self._derived.get(cache_key)
+            if cached is not None:
+                return cached
+
+        expanded: dict[str, tuple[str, ...]] = {}
+        for label in labels:
+            aliases = list(self.aliases_for(label))
+            for extra in (extra_aliases or {}).get(label, ()):
+                aliases.extend(self.aliases_for(extra))
+            expanded[label] = tuple(dict.fromkeys(aliases))
+        matcher = KeywordMatcher(expanded, exclude=self.lookup_only_keys if free_text else ())
+
+        if extra_aliases is None:
+            with self._derived_lock:
+                if len(self._derived) >= 64:
+                    self._derived.clear()
+                self._derived[cache_key] = matcher
+        return matcher
+
+
+@lru_cache(maxsize=1)
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """The compiled taxonomy; built once per process."""
+
+    return SkillTaxonomy.compile(SKILLS)
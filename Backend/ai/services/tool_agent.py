@@ -0,0 +1,528 @@
+"""Tool-calling agent over the functions in ``tools.py``.
+
+The model gets the tools as OpenAI-style function definitions (Ollama
+accepts the same ``tools`` field natively and on ``/v1``). Each step runs
+every tool call from one reply concurrently in a thread pool, bounded by a
+per-step deadline. Calls still running at the deadline are reported to the
+model as timed out and finish in the background, so their results still
+reach the cache.
+
+Results are memoised per (tool, arguments) with a TTL, and identical calls
+in flight at the same time share one execution. ``analyze_results`` also
+accepts a ``query`` and fetches its data through the memoised
+``web_scrape``, so the model can scrape and analyse in the same step
+instead of waiting a round trip for the scrape.
+
+Configuration:
+
+* ``AI_AGENT_MAX_STEPS``: tool rounds before a final answer is forced (default 4)
+* ``AI_AGENT_STEP_TIMEOUT_SECONDS``: deadline for one round of tool calls (default 60)
+* ``AI_AGENT_TOOL_WORKERS``: threads running tool calls (default 4)
+* ``AI_AGENT_TOOL_CACHE_TTL_SECONDS``: lifetime of a memoised result (default 900)
+* ``AI_AGENT_TOOL_CACHE_SIZE``: memoised results kept (default 256)
+* ``AI_AGENT_MAX_TOOL_RESULT_CHARS``: tool output sent back to the model (default 6000)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from services.env import env_float, env_int
+from services.llm_service import LLMTask, call_llm, call_llm_with_tools, get_ollama_config
+from services.tracing import current_span, span, traced
+
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = (
+    "You are an IT career market researcher. Use the tools to ground your answer in live job data. "
+    "Request every tool call you already know you need in the same turn; they run in parallel. "
+    "analyze_results accepts a query directly, so you do not need to wait for web_scrape before analysing. "
+    "When you have enough information, answer in concise Markdown without calling more tools."
+)
+FINAL_ANSWER_INSTRUCTION = (
+    "Tool budget reached. Answer the original question now using the tool results above. Do not call tools."
+)
+
+
+def _canonical_arguments(arguments: dict[str, Any]) -> str:
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: Any
+    expires_at: float
+
+
+class ToolResultCache:
+    """TTL + LRU memo for tool results with single-flight execution."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._in_flight: dict[tuple[str, str], Future[Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        key: tuple[str, str],
+        compute: Callable[[], Any],
+        *,
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> tuple[Any, bool]:
+        """Return ``(value, from_cache)``; joining a call in flight counts as cached."""
+
+        if self.ttl_seconds <= 0:
+            return compute(), False
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value, True
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if cacheable(value):
+                self._entries[key] = _CacheEntry(value, time.monotonic() + self.ttl_seconds)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value, False
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@dataclass(frozen=True, slots=True)
+class ToolDefinition:
+    name: str
+    description: str
+    parameters: dict[str, Any]
+    handler: Callable[["ToolAgent", dict[str, Any]], Any]
+    memoize: bool = True
+    # canonical arguments, so equivalent calls share one memo entry
+    normalize: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+
+    def schema(self) -> dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters,
+            },
+        }
+
+
+def _succeeded(result: Any) -> bool:
+    return not (isinstance(result, dict) and result.get("success") is False)
+
+
+def _normalize_scrape_arguments(arguments: dict[str, Any]) -> dict[str, Any]:
+    try:
+        per_source_limit = int(arguments.get("per_source_limit") or 5)
+    except (TypeError, ValueError):
+        per_source_limit = 5
+    return {
+        "query": " ".join(str(arguments.get("query") or "").split()).lower(),
+        "per_source_limit": min(10, max(1, per_source_limit)),
+    }
+
+
+def _web_scrape(agent: ToolAgent, arguments: dict[str, Any]) -> Any:
+    from tools import tool_web_scrape
+
+    if not arguments["query"]:
+        return {"success": False, "error": "Argument 'query' is required.", "results": []}
+    return tool_web_scrape(arguments["query"], arguments["per_source_limit"])
+
+
+def _analyze_results(agent: ToolAgent, arguments: dict[str, Any]) -> Any:
+    from tools import tool_analyze_results
+
+    data = arguments.get("data")
+    if not data and arguments.get("query"):
+        scraped, _ = agent.call_tool(
+            "web_scrape",
+            {"query": arguments["query"], "per_source_limit": arguments.get("per_source_limit")},
+        )
+        data = scraped.get("results") if isinstance(scraped, dict) else None
+    if not isinstance(data, list) or not data:
+        return {"success": False, "error": "Provide 'data' rows or a 'query' to scrape them."}
+    return tool_analyze_results(data, str(arguments.get("analysis_type") or "frequency"))
+
+
+def _generate_report(agent: ToolAgent, arguments: dict[str, Any]) -> Any:
+    from tools import tool_generate_report
+
+    sections = arguments.get("sections")
+    if not isinstance(sections, list):
+        return {"success": False, "error": "Argument 'sections' must be a list."}
+    return tool_generate_report(
+        str(arguments.get("title") or "Report"),
+        [section for section in sections if isinstance(section, dict)],
+        user_name=str(arguments.get("user_name") or "User"),
+        target_role=str(arguments.get("target_role") or ""),
+    )
+
+
+def _generate_chart(agent: ToolAgent, arguments: dict[str, Any]) -> Any:
+    from tools import tool_generate_chart
+
+    return tool_generate_chart(
+        str(arguments.get("chart_type") or ""),
+        list(arguments.get("labels") or []),
+        list(arguments.get("values") or []),
+        title=str(arguments.get("title") or "Chart"),
+        x_label=str(arguments.get("x_label") or ""),
+        y_label=str(arguments.get("y_label") or ""),
+    )
+
+
+TOOL_DEFINITIONS: tuple[ToolDefinition, ...] = (
+    ToolDefinition(
+        name="web_scrape",
+        description="Fetch live IT job market results (postings, salaries, outlook) for a search query.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Role or skill to search for."},
+                "per_source_limit": {"type": "integer", "minimum": 1, "maximum": 10},
+            },
+            "required": ["query"],
+        },
+        handler=_web_scrape,
+        normalize=_normalize_scrape_arguments,
+    ),
+    ToolDefinition(
+        name="analyze_results",
+        description=(
+            "Find patterns in job data: keyword frequency, top skill gaps or market trends. "
+            "Pass 'query' to analyse fresh web_scrape results for it, or 'data' rows directly."
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "analysis_type": {"type": "string", "enum": ["frequency", "gap", "trend"]},
+                "query": {"type": "string", "description": "Scrape this query and analyse the results."},
+                "data": {"type": "array", "items": {"type": "object"}},
+            },
+            "required": ["analysis_type"],
+        },
+        handler=_analyze_results,
+    ),
+    ToolDefinition(
+        name="generate_report",
+        description="Format findings as a Markdown report with a title and sections.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "sections": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"heading": {"type": "string"}, "content": {"type": "string"}},
+                        "required": ["heading", "content"],
+                    },
+                },
+                "user_name": {"type": "string"},
+                "target_role": {"type": "string"},
+            },
+            "required": ["title", "sections"],
+        },
+        handler=_generate_report,
+        memoize=False,
+    ),
+    ToolDefinition(
+        name="generate_chart",
+        description="Render a bar, horizontal_bar, pie or line chart and return its URL.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "chart_type": {"type": "string", "enum": ["bar", "horizontal_bar", "pie", "line"]},
+                "labels": {"type": "array", "items": {"type": "string"}},
+                "values": {"type": "array", "items": {"type": "number"}},
+                "title": {"type": "string"},
+                "x_label": {"type": "string"},
+                "y_label": {"type": "string"},
+            },
+            "required": ["chart_type", "labels", "values"],
+        },
+        handler=_generate_chart,
+        # the chart renderer already caches by content hash
+        memoize=False,
+    ),
+)
+
+
+@dataclass(slots=True)
+class ToolCall:
+    call_id: str
+    name: str
+    arguments: dict[str, Any]
+
+
+def parse_tool_calls(message: dict[str, Any], step: int) -> list[ToolCall]:
+    """Normalise ``tool_calls`` from native (dict arguments) or OpenAI (JSON string) replies."""
+
+    calls: list[ToolCall] = []
+    raw_calls = message.get("tool_calls")
+    if not isinstance(raw_calls, list):
+        return calls
+
+    for index, raw_call in enumerate(raw_calls):
+        if not isinstance(raw_call, dict):
+            continue
+        function = raw_call.get("function") or {}
+        name = str(function.get("name") or "").strip()
+        if not name:
+            continue
+        arguments = function.get("arguments")
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments) if arguments.strip() else {}
+            except json.JSONDecodeError:
+                arguments = {"_invalid_json": arguments}
+        if not isinstance(arguments, dict):
+            arguments = {}
+        calls.append(
+            ToolCall(
+                call_id=str(raw_call.get("id") or f"call_{step}_{index}"),
+                name=name,
+                arguments=arguments,
+            )
+        )
+    return calls
+
+
+@dataclass(slots=True)
+class ToolAgent:
+    tools: dict[str, ToolDefinition]
+    cache: ToolResultCache
+    max_steps: int = 4
+    step_timeout_seconds: float = 60.0
+    max_tool_result_chars: int = 6000
+    tool_workers: int = 4
+    task: LLMTask = "generate"
+    _executor: ThreadPoolExecutor | None = field(default=None, init=False)
+    _executor_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @classmethod
+    def from_env(cls) -> ToolAgent:
+        return cls(
+            tools={tool.name: tool for tool in TOOL_DEFINITIONS},
+            cache=ToolResultCache(
+                max_entries=env_int("AI_AGENT_TOOL_CACHE_SIZE", 256),
+                ttl_seconds=env_float("AI_AGENT_TOOL_CACHE_TTL_SECONDS", 900.0),
+            ),
+            max_steps=max(1, env_int("AI_AGENT_MAX_STEPS", 4)),
+            step_timeout_seconds=max(1.0, env_float("AI_AGENT_STEP_TIMEOUT_SECONDS", 60.0)),
+            max_tool_result_chars=max(500, env_int("AI_AGENT_MAX_TOOL_RESULT_CHARS", 6000)),
+            tool_workers=max(1, env_int("AI_AGENT_TOOL_WORKERS", 4)),
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.tool_workers,
+                    thread_name_prefix="ai-agent-tool",
+                )
+            return self._executor
+
+    def tool_schemas(self) -> list[dict[str, Any]]:
+        return [tool.schema() for tool in self.tools.values()]
+
+    def call_tool(self, name: str, arguments: dict[str, Any]) -> tuple[Any, bool]:
+        """Run one tool through the memo; returns ``(result, from_cache)``."""
+
+        tool = self.tools.get(name)
+        if tool is None:
+            return {"success": False, "error": f"Unknown tool '{name}'."}, False
+        if "_invalid_json" in arguments:
+            return {"success": False, "error": "Tool arguments were not valid JSON."}, False
+        if tool.normalize is not None:
+            arguments = tool.normalize(arguments)
+
+        def compute() -> Any:
+            with span("agent.tool", **{"agent.tool": name}):
+                try:
+                    return tool.handler(self, arguments)
+                except Exception as exc:
+                    logger.exception("Tool %s failed", name)
+                    return {"success": False, "error": f"{type(exc).__name__}: {exc}"}
+
+        if not tool.memoize:
+            return compute(), False
+        return self.cache.get_or_compute(
+            (name, _canonical_arguments(arguments)),
+            compute,
+            cacheable=_succeeded,
+        )
+
+    def _timed_call(self, call: ToolCall) -> dict[str, Any]:
+        started = time.perf_counter()
+        result, cached = self.call_tool(call.name, call.arguments)
+        return {
+            "call": call,
+            "result": result,
+            "cached": cached,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def _run_step(self, calls: list[ToolCall]) -> list[dict[str, Any]]:
+        executor = self._get_executor()
+        # copy_context keeps the tool spans under the agent's trace
+        futures = [executor.submit(contextvars.copy_context().run, self._timed_call, call) for call in calls]
+        wait(futures, timeout=self.step_timeout_seconds)
+
+        outcomes: list[dict[str, Any]] = []
+        for call, future in zip(calls, futures):
+            if future.done():
+                outcomes.append(future.result())
+                continue
+            # The call keeps running and lands in the cache for a later step.
+            outcomes.append(
+                {
+                    "call": call,
+                    "result": {
+                        "success": False,
+                        "error": f"Tool timed out after {self.step_timeout_seconds:g}s.",
+                    },
+                    "cached": False,
+                    "seconds": self.step_timeout_seconds,
+                }
+            )
+        return outcomes
+
+    def _tool_message(self, call: ToolCall, result: Any, api_mode: str) -> dict[str, Any]:
+        content = json.dumps(result, default=str, ensure_ascii=False)
+        if len(content) > self.max_tool_result_chars:
+            content = content[: self.max_tool_result_chars] + "... [truncated]"
+        message: dict[str, Any] = {"role": "tool", "tool_call_id": call.call_id, "content": content}
+        if api_mode == "native":
+            message["tool_name"] = call.name
+        return message
+
+    @traced("agent.run")
+    def run(self, question: str, *, max_steps: int | None = None) -> dict[str, Any]:
+        steps_allowed = max(1, min(max_steps or self.max_steps, self.max_steps))
+        api_mode = get_ollama_config()["api_mode"]
+        schemas = self.tool_schemas()
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": question},
+        ]
+        trace: list[dict[str, Any]] = []
+        round_trips = 0
+        answer: str | None = None
+
+        for step in range(steps_allowed):
+            message = call_llm_with_tools(self.task, messages, schemas)
+            round_trips += 1
+            if message is None:
+                break
+
+            calls = parse_tool_calls(message, step)
+            if not calls:
+                answer = str(message.get("content") or "").strip() or None
+                break
+
+            messages.append(message)
+            outcomes = self._run_step(calls)
+            trace.append(
+                {
+                    "step": step + 1,
+                    "tool_calls": [
+                        {
+                            "tool": outcome["call"].name,
+                            "arguments": outcome["call"].arguments,
+                            "success": _succeeded(outcome["result"]),
+                            "cached": outcome["cached"],
+                            "seconds": outcome["seconds"],
+                        }
+                        for outcome in outcomes
+                    ],
+                }
+            )
+            for outcome in outcomes:
+                messages.append(self._tool_message(outcome["call"], outcome["result"], api_mode))
+        else:
+            messages.append({"role": "user", "content": FINAL_ANSWER_INSTRUCTION})
+            final = call_llm(self.task, messages)
+            round_trips += 1
+            answer = final.strip() if isinstance(final, str) and final.strip() else None
+
+        current_span().set_attribute("agent.round_trips", round_trips)
+        current_span().set_attribute("agent.tool_calls", sum(len(step["tool_calls"]) for step in trace))
+        return {
+            "success": answer is not None,
+            "answer": answer,
+            "steps": trace,
+            "llm_round_trips": round_trips,
+            "tool_cache": self.cache.stats(),
+        }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_agent: ToolAgent | None = None
+_agent_lock = threading.Lock()
+
+
+def get_tool_agent() -> ToolAgent:
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = ToolAgent.from_env()
+    return _agent
+
+
+def shutdown_tool_agent() -> None:
+    global _agent
+    with _agent_lock:
+        agent, _agent = _agent, None
+    if agent is not None:
+        agent.shutdown()
@@ -0,0 +1,394 @@
+"""Lightweight span tracing for the AI service.
+
+Spans follow the OpenTelemetry data model (trace id, span id, parent,
+attributes, status) and propagate through ``contextvars``, so a span opened
+in a request handler becomes the parent of spans opened in awaited
+coroutines and in ``run_in_threadpool`` calls. Finished spans are exported
+in batches from a background thread to a JSONL file or an OTLP/HTTP
+collector.
+
+Sampling is decided once per trace, at the root span. Unsampled traces and
+a disabled exporter cost one context-variable lookup per span.
+
+Configuration:
+
+* ``AI_TRACE_EXPORTER``: ``none`` (default), ``file`` or ``otlp``
+* ``AI_TRACE_FILE``: JSONL output for ``file`` (default ``traces.jsonl``)
+* ``AI_TRACE_OTLP_ENDPOINT``: OTLP/HTTP traces URL
+  (default ``http://localhost:4318/v1/traces``)
+* ``AI_TRACE_SAMPLE_RATE``: share of root spans recorded (default 0.05)
+* ``AI_TRACE_QUEUE_SIZE``: finished spans buffered before new ones are dropped
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Protocol, TypeVar
+
+import httpx
+
+from services.env import env_float, env_int
+
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    sampled: bool
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+        }
+
+
+# Stands in for every span of an unsampled trace, so children skip all work.
+NON_RECORDING_SPAN = Span(name="", trace_id="0" * 32, span_id="0" * 16, parent_id=None, sampled=False)
+
+_current_span: ContextVar[Span | None] = ContextVar("ai_trace_span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class SpanSink(Protocol):
+    def write(self, spans: list[Span]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class FileSink:
+    def __init__(self, path: str) -> None:
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def write(self, spans: list[Span]) -> None:
+        for span in spans:
+            self._handle.write(json.dumps(span.to_dict(), default=str) + "\n")
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpHttpSink:
+    """Posts spans to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(self, endpoint: str, service_name: str) -> None:
+        self._endpoint = endpoint
+        self._resource = {
+            "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}],
+        }
+        self._client = httpx.Client(timeout=httpx.Timeout(5.0))
+
+    def write(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "nexapath.ai"},
+                            "spans": [self._encode(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        response = self._client.post(self._endpoint, json=payload)
+        response.raise_for_status()
+
+    @staticmethod
+    def _encode(span: Span) -> dict[str, Any]:
+        encoded: dict[str, Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class BatchExporter:
+    """Hands finished spans to a sink from one daemon thread.
+
+    The request path only does a non-blocking ``put``; when the queue is full
+    the span is dropped and counted instead of slowing the caller down.
+    """
+
+    def __init__(
+        self,
+        sink: SpanSink,
+        *,
+        queue_size: int = 2048,
+        batch_size: int = 256,
+        interval_seconds: float = 2.0,
+    ) -> None:
+        self._sink = sink
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=max(1, queue_size))
+        self._batch_size = max(1, batch_size)
+        self._interval_seconds = max(0.05, interval_seconds)
+        self.dropped = 0
+        self.exported = 0
+        self._thread = threading.Thread(target=self._run, name="ai-trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: list[Span] = []
+            deadline = time.monotonic() + self._interval_seconds
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if batch:
+                try:
+                    self._sink.write(batch)
+                    self.exported += len(batch)
+                except Exception:
+                    logger.warning("Dropping %s spans after export failure", len(batch), exc_info=True)
+
+        # Drain whatever arrived before shutdown.
+        remaining: list[Span] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                remaining.append(item)
+        if remaining:
+            try:
+                self._sink.write(remaining)
+                self.exported += len(remaining)
+            except Exception:
+                logger.warning("Dropping %s spans at shutdown", len(remaining), exc_info=True)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._sink.close()
+
+
+class Tracer:
+    def __init__(self, exporter: BatchExporter | None = None, sample_rate: float = 0.0) -> None:
+        self.exporter = exporter
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0.0
+
+    @classmethod
+    def from_env(cls) -> Tracer:
+        exporter_name = (os.getenv("AI_TRACE_EXPORTER") or "none").strip().lower()
+        sample_rate = env_float("AI_TRACE_SAMPLE_RATE", 0.05)
+        if exporter_name == "file":
+            sink: SpanSink = FileSink(os.getenv("AI_TRACE_FILE") or "traces.jsonl")
+        elif exporter_name == "otlp":
+            sink = OtlpHttpSink(
+                os.getenv("AI_TRACE_OTLP_ENDPOINT") or "http://localhost:4318/v1/traces",
+                os.getenv("AI_TRACE_SERVICE_NAME") or "nexapath-ai",
+            )
+        else:
+            return cls(None, 0.0)
+
+        exporter = BatchExporter(
+            sink,
+            queue_size=env_int("AI_TRACE_QUEUE_SIZE", 2048),
+        )
+        logger.info("Tracing enabled exporter=%s sample_rate=%s", exporter_name, sample_rate)
+        return cls(exporter, sample_rate)
+
+    def shutdown(self) -> None:
+        if self.exporter is not None:
+            self.exporter.shutdown()
+            self.exporter = None
+
+
+_tracer: Tracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer.from_env()
+    return _tracer
+
+
+def shutdown_tracing() -> None:
+    global _tracer
+    with _tracer_lock:
+        tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.shutdown()
+
+
+def current_span() -> Span:
+    return _current_span.get() or NON_RECORDING_SPAN
+
+
+def parse_traceparent(header: str | None) -> Span | None:
+    """Turn a W3C ``traceparent`` header into a remote parent span."""
+
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return Span(name="remote", trace_id=parts[1], span_id=parts[2], parent_id=None, sampled=sampled)
+
+
+def format_traceparent(span: Span) -> str | None:
+    if not span.sampled:
+        return None
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+
+@contextmanager
+def span(name: str, *, remote_parent: Span | None = None, **attributes: Any) -> Iterator[Span]:
+    """Open a child of the current span, or a new root if there is none."""
+
+    parent = remote_parent or _current_span.get()
+    if parent is NON_RECORDING_SPAN:
+        yield NON_RECORDING_SPAN
+        return
+
+    tracer = get_tracer()
+    if parent is None or parent is remote_parent:
+        # Local root: decide once for the whole trace, honouring a remote caller's choice.
+        if remote_parent is not None:
+            sampled = tracer.enabled and remote_parent.sampled
+        else:
+            sampled = tracer.enabled and random.random() < tracer.sample_rate
+        if not sampled:
+            token = _current_span.set(NON_RECORDING_SPAN)
+            try:
+                yield NON_RECORDING_SPAN
+            finally:
+                _current_span.reset(token)
+            return
+
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else _new_id(128),
+        span_id=_new_id(64),
+        parent_id=parent.span_id if parent is not None else None,
+        sampled=True,
+        start_ns=time.time_ns(),
+        attributes=dict(attributes),
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"[:500]
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        exporter = tracer.exporter
+        if exporter is not None:
+            exporter.export(current)
+
+
+def traced(name: str | None = None, **attributes: Any) -> Callable[[F], F]:
+    """Run the decorated sync or async function inside a span."""
+
+    def decorate(fn: F) -> F:
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name, **attributes):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name, **attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -0,0 +1,159 @@
+"""Startup pre-warming and the import-time report.
+
+Heavy dependencies (BeautifulSoup, requests, psycopg2) are imported lazily,
+and matplotlib only loads inside the chart worker processes, so a worker
+that only serves ``/ai/chat`` never loads BeautifulSoup or requests. It
+does load psycopg2 for the market-retrieval pull, which
+``AI_MARKET_RETRIEVAL_REFRESH_SECONDS=0`` turns off. Workers that do serve
+the market and job-description endpoints can load them (and start the
+chart workers) at startup instead of inside the first request:
+
+* ``AI_WORKER_ROLE``: comma-separated roles (``chat``, ``market``,
+  ``jobs``, ``charts``) or ``all`` (default) choosing what to pre-warm.
+  ``all`` leaves out ``charts``: starting the matplotlib worker processes
+  must be asked for by name, so a default deployment starts them on the
+  first chart request instead
+* ``AI_PREWARM_MODULES``: extra ``module`` or ``module:function`` entries
+* ``AI_PREWARM``: set to ``false`` to skip pre-warming entirely
+
+The startup report records how long ``backend`` took to import, what each
+pre-warm step cost, and which heavy dependencies are loaded or deferred.
+For a per-module breakdown run ``python -X importtime -c "import backend"``.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from services.env import env_bool
+
+
+logger = logging.getLogger(__name__)
+
+# "module:function" entries call the function after importing the module.
+WARMUP_PROFILES: dict[str, tuple[str, ...]] = {
+    "chat": (),
+    "market": (
+        "market_intelligence_service.scheduler",
+        "market_intelligence_service.storage",
+    ),
+    "jobs": (
+        "market_intelligence_service.storage",
+        "scraper",
+    ),
+    "charts": ("services.chart_renderer:prewarm_chart_workers",),
+}
+# profiles that ``all`` does not include
+OPT_IN_PROFILES = frozenset({"charts"})
+
+HEAVY_DEPENDENCIES = ("bs4", "requests", "psycopg2", "matplotlib", "pandas")
+
+
+def _split_csv(raw: str | None) -> list[str]:
+    return [item.strip() for item in (raw or "").split(",") if item.strip()]
+
+
+def resolve_worker_roles(raw: str | None = None) -> list[str]:
+    roles = [role.lower() for role in _split_csv(raw if raw is not None else os.getenv("AI_WORKER_ROLE", "all"))]
+    if not roles or "all" in roles:
+        return [role for role in WARMUP_PROFILES if role not in OPT_IN_PROFILES or role in roles]
+
+    unknown = [role for role in roles if role not in WARMUP_PROFILES]
+    if unknown:
+        logger.warning("Ignoring unknown AI_WORKER_ROLE entries: %s", ", ".join(unknown))
+    return [role for role in roles if role in WARMUP_PROFILES]
+
+
+def resolve_warmup_targets(roles: list[str]) -> list[str]:
+    targets: list[str] = []
+    for role in roles:
+        targets.extend(WARMUP_PROFILES[role])
+    targets.extend(_split_csv(os.getenv("AI_PREWARM_MODULES")))
+    return list(dict.fromkeys(targets))
+
+
+@dataclass(slots=True)
+class WarmupStep:
+    target: str
+    seconds: float
+    already_loaded: bool
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class StartupReport:
+    worker_roles: list[str]
+    backend_import_seconds: float | None
+    prewarm_seconds: float = 0.0
+    steps: list[WarmupStep] = field(default_factory=list)
+    heavy_dependencies: dict[str, str] = field(default_factory=dict)
+    modules_loaded: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _warm(target: str) -> WarmupStep:
+    module_name, _, function_name = target.partition(":")
+    already_loaded = module_name in sys.modules and not function_name
+    started = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+        if function_name:
+            getattr(module, function_name)()
+    except Exception as exc:
+        return WarmupStep(
+            target=target,
+            seconds=round(time.perf_counter() - started, 4),
+            already_loaded=already_loaded,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return WarmupStep(
+        target=target,
+        seconds=round(time.perf_counter() - started, 4),
+        already_loaded=already_loaded,
+    )
+
+
+def run_startup_warmup(backend_import_seconds: float | None = None) -> StartupReport:
+    """Pre-warm the configured targets (blocking) and build the startup report."""
+
+    roles = resolve_worker_roles()
+    report = StartupReport(
+        worker_roles=roles,
+        backend_import_seconds=(
+            round(backend_import_seconds, 4) if backend_import_seconds is not None else None
+        ),
+    )
+
+    if env_bool("AI_PREWARM", True):
+        started = time.perf_counter()
+        report.steps = [_warm(target) for target in resolve_warmup_targets(roles)]
+        report.prewarm_seconds = round(time.perf_counter() - started, 4)
+
+    report.heavy_dependencies = {
+        name: "loaded" if name in sys.modules else "deferred" for name in HEAVY_DEPENDENCIES
+    }
+    report.modules_loaded = len(sys.modules)
+    return report
+
+
+def format_startup_report(report: StartupReport) -> str:
+    lines = [
+        f"Startup report roles={','.join(report.worker_roles) or '-'} "
+        f"backend_import={report.backend_import_seconds}s prewarm={report.prewarm_seconds}s "
+        f"modules={report.modules_loaded}",
+    ]
+    for step in report.steps:
+        state = "error: " + step.error if step.error else ("cached" if step.already_loaded else "ok")
+        lines.append(f"  prewarm {step.target:<40} {step.seconds * 1000:>8.1f} ms  {state}")
+    lines.append(
+        "  heavy deps: " + ", ".join(f"{name}={state}" for name, state in report.heavy_dependencies.items())
+    )
+    return "\n".join(lines)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the service imports its modules top-level ("services.x"), as backend.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
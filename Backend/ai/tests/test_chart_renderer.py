@@ -0,0 +1,25 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from services.chart_renderer import ChartCache, ChartRenderer, build_chart_spec
+
+
+@pytest.fixture
+def renderer():
+    renderer = ChartRenderer(cache=ChartCache(max_entries=8, max_bytes=1 << 22), max_workers=1)
+    yield renderer
+    renderer.shutdown()
+
+
+def test_render_recovers_after_a_worker_dies(renderer):
+    # kill the only worker, as an OOM kill would; the pool is then broken for good
+    with pytest.raises(BrokenProcessPool):
+        renderer._get_executor().submit(os._exit, 1).result(timeout=60)
+
+    spec = build_chart_spec("bar", ["Python", "Go"], [3, 1], image_format="svg")
+    image = renderer.render(spec)
+    assert image.content.startswith(b"<?xml")
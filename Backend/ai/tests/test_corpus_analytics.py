@@ -0,0 +1,32 @@
+import pytest
+
+from services.corpus_analytics import analyze_corpus
+
+
+# keywords the original frequency analysis reported, as whole tokens
+KEYWORD_COUNTS = [
+    ("Maintain AI systems.", "Artificial Intelligence", 1),
+    ("Cloud-first team; cloud cost reviews.", "Cloud Computing", 2),
+    ("Owns application security.", "Cybersecurity", 1),
+    ("Python and Golang services.", "Go", 1),
+    ("Designs REST APIs.", "REST APIs", 1),
+    ("Machine learning, machine learning ops.", "Machine Learning", 2),
+    ("Ships fast... python... and more.", "Python", 1),
+]
+
+NOT_COUNTED = [
+    ("We maintain our tools.", "Artificial Intelligence"),
+    ("We go to market fast; we use Google.", "Go"),
+    ("Send your CV.", "Computer Vision"),
+]
+
+
+@pytest.mark.parametrize(("body", "keyword", "count"), KEYWORD_COUNTS)
+def test_keyword_counted(body, keyword, count):
+    stats = analyze_corpus([{"body": body}])
+    assert stats.term_frequency.get(keyword) == count
+
+
+@pytest.mark.parametrize(("body", "keyword"), NOT_COUNTED)
+def test_keyword_not_counted(body, keyword):
+    assert keyword not in analyze_corpus([{"body": body}]).term_frequency
@@ -0,0 +1,55 @@
+import pytest
+
+embeddings = pytest.importorskip("services.embeddings")
+
+
+LABELS = ["Python", "Deep Learning", "Kubernetes", "Docker", "PostgreSQL", "React", "TensorFlow", "PyTorch"]
+
+# versioned or suffixed names that no alias covers but the hashed trigrams do
+SEMANTIC_MATCHES = [
+    ("PostgreSQL16", "PostgreSQL"),
+    ("TensorFlow2", "TensorFlow"),
+    ("deep learning models", "Deep Learning"),
+    ("kubernetes cluster", "Kubernetes"),
+]
+
+# ordinary chat words that must never become skill mentions
+GENERIC_WORDS = ["career", "learn more", "roadmap", "next steps"]
+
+
+@pytest.fixture
+def hashing_service(monkeypatch):
+    service = embeddings.EmbeddingService(embedder=embeddings.HashingEmbedder())
+    monkeypatch.setattr(embeddings, "_service", service)
+    monkeypatch.setattr(embeddings, "_service_built", True)
+    return service
+
+
+@pytest.mark.parametrize(("query", "label"), SEMANTIC_MATCHES)
+def test_nearest_label_for_close_names(hashing_service, query, label):
+    [match] = hashing_service.nearest([query], LABELS)
+    assert match is not None and match.label == label
+
+
+def test_generic_words_stay_below_threshold(hashing_service):
+    assert hashing_service.nearest(GENERIC_WORDS, LABELS) == [None] * len(GENERIC_WORDS)
+
+
+def test_backend_is_opt_in(monkeypatch):
+    monkeypatch.delenv("AI_EMBEDDING_BACKEND", raising=False)
+    monkeypatch.setattr(embeddings, "_service", None)
+    monkeypatch.setattr(embeddings, "_service_built", False)
+    assert embeddings.get_embedding_service() is None
+    assert embeddings.nearest_labels(["TensorFlow2"], LABELS) == [None]
+
+
+def test_chat_embeds_only_skill_like_phrases(hashing_service):
+    chat = pytest.importorskip("ai_chat_service")
+
+    vocabulary = chat._mention_vocabulary(tuple(LABELS))
+    phrases = chat._mention_phrases("What career should I pick to learn more about k8s and TensorFlow2?", vocabulary)
+    assert "career" not in phrases and "learn more" not in phrases
+    assert {"k8s", "TensorFlow2"} <= set(phrases)
+
+    assert chat._find_skill_mentions("Which career path helps me learn more?", LABELS) == []
+    assert chat._find_skill_mentions("I trained models in TensorFlow2.", LABELS) == ["TensorFlow"]
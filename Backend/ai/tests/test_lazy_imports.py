@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+AI_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _loaded_after(code):
+    result = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sorted(sys.modules)))"],
+        cwd=AI_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_market_retrieval_pull_does_not_load_the_scraping_stack():
+    pytest.importorskip("psycopg2")
+    loaded = _loaded_after(
+        "import os\n"
+        "os.environ['DATABASE_URL'] = 'postgresql://nobody@127.0.0.1:1/none'\n"
+        "from services.market_retrieval import MarketRetriever\n"
+        "MarketRetriever().refresh_from_db()"
+    )
+    assert "market_intelligence_service.storage" in loaded
+    assert not loaded & {"bs4", "requests", "market_intelligence_service.normalizer", "market_intelligence_service.parser"}
@@ -0,0 +1,83 @@
+import itertools
+
+import pytest
+
+from services.role_taxonomy import get_role_taxonomy, normalize_role_text
+
+
+# the substring heuristics ``_resolve_role_definition`` used before the role index
+BASELINE_HEURISTICS = (
+    ("frontend", "frontend_engineer"),
+    ("backend", "backend_engineer"),
+    ("full stack", "full_stack_engineer"),
+    ("fullstack", "full_stack_engineer"),
+    ("mobile", "mobile_engineer"),
+    ("devops", "devops_engineer"),
+    ("cloud", "cloud_engineer"),
+    ("platform", "platform_engineer"),
+    ("data analyst", "data_analyst"),
+    ("data engineer", "data_engineer"),
+    ("data scientist", "data_scientist"),
+    ("machine learning", "machine_learning_engineer"),
+    ("mlops", "mlops_engineer"),
+    (" ai ", "ai_engineer"),
+    ("llm", "ai_engineer"),
+    ("security", "cybersecurity_analyst"),
+    ("cyber", "cybersecurity_analyst"),
+    ("qa", "qa_automation_engineer"),
+    ("product manager", "product_manager"),
+    ("project manager", "technical_project_manager"),
+)
+
+PREFIXES = ("", "Senior ", "Junior ", "Lead ", "Principal ", "Remote ", "Staff ")
+CORES = (
+    "Frontend", "Backend", "Full Stack", "Fullstack", "Mobile", "DevOps", "Cloud", "Platform",
+    "Data", "Machine Learning", "MLOps", "AI", "LLM", "Security", "Cybersecurity", "Cyber", "QA",
+    "Product", "Project", "Software", "Site Reliability", "Network", "Web", "iOS", "Android",
+    "React", "Python", "Java", "Infrastructure", "Application Security",
+)
+SUFFIXES = (
+    "Engineer", "Developer", "Analyst", "Scientist", "Manager", "Specialist", "Architect",
+    "Consultant", "Lead", "Tester",
+)
+TITLES = [f"{prefix}{core} {suffix}" for prefix, core, suffix in itertools.product(PREFIXES, CORES, SUFFIXES)]
+
+
+def _baseline_resolve(taxonomy, title):
+    lookup = {
+        normalize_role_text(alias): role.key
+        for role in taxonomy.roles
+        for alias in (role.display_name, *role.aliases)
+    }
+    normalized = normalize_role_text(title)
+    if not normalized:
+        return None
+    if normalized in lookup:
+        return lookup[normalized]
+    padded = f" {normalized} "
+    for token, key in BASELINE_HEURISTICS:
+        if token in padded:
+            return key
+    return None
+
+
+def test_titles_resolved_at_baseline_still_resolve_to_the_same_role():
+    taxonomy = get_role_taxonomy()
+    changed = []
+    for title in TITLES:
+        expected = _baseline_resolve(taxonomy, title)
+        if expected is None:
+            continue
+        role = taxonomy.resolve(title)
+        if role is None or role.key != expected:
+            changed.append((title, expected, role.key if role else None))
+    assert changed == []
+
+
+@pytest.mark.parametrize(
+    "title",
+    ["Cybersecurity Engineer", "Cybersecurity Specialist", "Senior Cybersecurity Manager"],
+)
+def test_cybersecurity_titles_resolve(title):
+    role = get_role_taxonomy().resolve(title)
+    assert role is not None and role.key == "cybersecurity_analyst"
@@ -0,0 +1,51 @@
+import pytest
+
+from services.skill_taxonomy import get_skill_taxonomy
+
+
+# ordinary words and abbreviations that must not read as skills in page or chat text
+FALSE_POSITIVES = [
+    ("Please send your CV to jobs@example.com.", "Computer Vision"),
+    ("We go to market fast.", "Go"),
+    ("Active security clearance required.", "Cybersecurity"),
+    ("Join a cloud-first team.", "Cloud Computing"),
+    ("TS/SCI clearance preferred.", "TypeScript"),
+    ("Our AI team is hiring.", "Artificial Intelligence"),
+    ("Upload the report.py file and the DL form.", "Python"),
+    ("Upload the DL form.", "Deep Learning"),
+]
+
+TRUE_POSITIVES = [
+    ("Backend in Golang and Python.", {"Go", "Python"}),
+    ("TypeScript and React on the frontend.", {"TypeScript", "React"}),
+    ("Computer vision and deep learning research.", {"Computer Vision", "Deep Learning"}),
+    ("Cloud computing and cyber security basics.", {"Cloud Computing", "Cybersecurity"}),
+    ("Node.js services on AWS.", {"Node.js", "AWS"}),
+]
+
+
+@pytest.mark.parametrize(("text", "skill"), FALSE_POSITIVES)
+def test_ambiguous_aliases_are_not_scanned(text, skill):
+    found = {match.name for match in get_skill_taxonomy().find_skills(text)}
+    assert skill not in found
+
+
+@pytest.mark.parametrize(("text", "expected"), TRUE_POSITIVES)
+def test_unambiguous_mentions_are_found(text, expected):
+    found = {match.name for match in get_skill_taxonomy().find_skills(text)}
+    assert expected <= found
+
+
+@pytest.mark.parametrize(
+    ("value", "name"),
+    [("go", "Go"), ("TS", "TypeScript"), ("cv", "Computer Vision"), ("security", "Cybersecurity"), ("py", "Python")],
+)
+def test_lookup_only_aliases_still_resolve_exact_values(value, name):
+    assert get_skill_taxonomy().canonical_name(value) == name
+
+
+def test_free_text_matcher_skips_lookup_only_aliases():
+    taxonomy = get_skill_taxonomy()
+
+    assert taxonomy.matcher_for(["Go", "TypeScript"]).find("we go fast, ts/sci") == set()
+    assert taxonomy.matcher_for(["Go", "TypeScript"], free_text=False).find("ts") == {"TypeScript"}
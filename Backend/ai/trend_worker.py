@@ -17,6 +17,7 @@ import psycopg2.extras
 from dotenv import load_dotenv
 
 from scraper import scrape_it_jobs_data
+from services.skill_taxonomy import KeywordMatcher, get_skill_taxonomy
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -32,29 +33,6 @@ DEFAULT_QUERIES = [
     "cybersecurity analyst",
 ]
 
-DEFAULT_SKILL_ALIASES = {
-    "Python": ["python"],
-    "JavaScript": ["javascript", "js"],
-    "TypeScript": ["typescript", "ts"],
-    "React": ["react", "reactjs", "react.js"],
-    "Node.js": ["node.js", "nodejs", "node js"],
-    "PostgreSQL": ["postgresql", "postgres", "postgre sql"],
-    "Docker": ["docker", "containerization", "containerisation"],
-    "Machine Learning": ["machine learning", "ml"],
-    "Deep Learning": ["deep learning"],
-    "Data Analysis": ["data analysis", "analytics"],
-    "SQL": ["sql"],
-    "Git": ["git", "version control"],
-    "REST API Design": ["rest api design", "rest api", "api design"],
-    "GraphQL": ["graphql"],
-    "Kubernetes": ["kubernetes", "k8s"],
-    "AWS": ["aws", "amazon web services"],
-    "Azure": ["azure", "microsoft azure"],
-    "Cybersecurity": ["cybersecurity", "cyber security", "security"],
-    "Agile / Scrum": ["agile", "scrum", "agile scrum"],
-    "Communication": ["communication", "stakeholder communication"],
-}
-
 POSITIVE_TREND_KEYWORDS = [
     "rise",
     "rising",
@@ -220,21 +198,10 @@ def normalize_text(text: str) -> str:
     return re.sub(r"[^a-z0-9#+.\-/ ]+", " ", lowered)
 
 
-def make_aliases_for_skill(skill: str) -> list[str]:
-    aliases = set(DEFAULT_SKILL_ALIASES.get(skill, []))
-    aliases.add(skill.lower())
-    aliases.add(skill.lower().replace("/", " "))
-    aliases.add(skill.lower().replace(".", " "))
-    aliases.add(skill.lower().replace("-", " "))
-    aliases = {alias.strip() for alias in aliases if alias.strip()}
-    return sorted(aliases)
-
+def build_skill_matcher(skills: list[str]) -> KeywordMatcher:
+    """Matcher labelled with catalog names; aliases come from the shared skill taxonomy."""
 
-def build_skill_alias_map(skills: list[str]) -> dict[str, list[str]]:
-    alias_map: dict[str, list[str]] = {}
-    for skill in skills:
-        alias_map[skill] = make_aliases_for_skill(skill)
-    return alias_map
+    return get_skill_taxonomy().matcher_for(skills)
 
 
 def dedupe_scraped_documents(documents: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -286,7 +253,7 @@ def normalize_skill_trends(
     documents: list[dict[str, Any]],
     skills: list[str],
 ) -> list[dict[str, Any]]:
-    alias_map = build_skill_alias_map(skills)
+    skill_matcher = build_skill_matcher(skills)
     stats: dict[str, dict[str, Any]] = defaultdict(
         lambda: {
             "mentions": 0,
@@ -303,13 +270,7 @@ def normalize_skill_trends(
         searchable_text = normalize_text(f"{title} {body}")
         trend_score = classify_document_trend(searchable_text)
 
-        matched_skills: set[str] = set()
-        for skill, aliases in alias_map.items():
-            for alias in aliases:
-                pattern = rf"(?<![a-z0-9]){re.escape(alias)}(?![a-z0-9])"
-                if re.search(pattern, searchable_text):
-                    matched_skills.add(skill)
-                    break
+        matched_skills = skill_matcher.find(searchable_text)
 
         for skill in matched_skills:
             skill_stats = stats[skill]
@@ -0,0 +1,18 @@
+-- Background jobs for /generate-job-description/jobs
+CREATE TABLE IF NOT EXISTS job_description_jobs (
+    id                UUID PRIMARY KEY,
+    role              VARCHAR(255) NOT NULL,
+    role_key          VARCHAR(255) NOT NULL,
+    per_source_limit  INTEGER NOT NULL,
+    status            VARCHAR(20) NOT NULL,
+    progress          JSONB NOT NULL DEFAULT '{}'::jsonb,
+    result            JSONB,
+    error             TEXT,
+    version           INTEGER NOT NULL DEFAULT 0,
+    created_at        TIMESTAMP DEFAULT NOW(),
+    updated_at        TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_description_jobs_inflight
+    ON job_description_jobs (role_key, per_source_limit, updated_at DESC)
+    WHERE status IN ('queued', 'running');